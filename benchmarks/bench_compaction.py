@@ -0,0 +1,138 @@
+"""tick CSV 압축(shared_code.compaction) 효과 측정.
+
+수집 타이머가 쓰는 것과 같은 tick CSV(서울 data/all_jobs/seoul_jobs_*.csv, 경기 ggjobs_*.csv)를 합성 코퍼스로
+--days 일치(1분에 하나) 가짜 Blob 저장소(load_harness.BlobStore)에 만들어 두고 compaction.run 으로 합친 뒤 다음을 출력합니다.
+- 압축 전 / 후 Blob 수, 바이트, 행 수 (manifest 의 행 수 합 = 원본 행 수인지 확인)
+- 압축 소요 시간
+- 일괄 읽기 비용: 같은 기간을 pandas 로 전부 읽을 때 Blob 나열 + 열기 횟수와 시간 (tick CSV vs 압축 파일)
+- 압축이 쓴 Blob 중 Blob 트리거(blob_to_eventhub / blob_to_asa) 경로에 걸리는 것의 수 (0 이어야 함)
+
+사용 예 (두 Function App 의 requirements 가 설치된 환경에서, 저장소 루트 기준):
+    python benchmarks/bench_compaction.py
+    python benchmarks/bench_compaction.py --days 3 --grain day --format both
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, "seoul-job-cnt", "azure-func-connect")
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+import corpus  # noqa: E402
+from load_harness import BlobStore, FakeBlobServiceClient, SEOUL_CONTAINER, SEOUL_TRIGGER_PREFIX, GG_CONTAINER  # noqa: E402
+from shared_code import compaction, record_path, resource_pool  # noqa: E402
+
+STORAGE_CONN_STR = "bench-compaction"
+TICK_ROWS = {"seoul": 100, "gg": 200}   # tick 하나에서 쓰는 건수 (서울 CHUNK_SIZE / 경기 size_per_req)
+START = datetime(2026, 1, 1, tzinfo=compaction.KST)
+VARIANTS = 60                           # 서로 다른 내용의 tick CSV 수 (나머지 tick 은 이것을 돌려 씀)
+
+
+def _tick_csv(source: str, variant: int, seed: int) -> bytes:
+    """수집 타이머가 Blob 에 쓰는 것과 같은 tick CSV (UTF-8-SIG, 헤더 포함)."""
+    if source == "seoul":
+        frame, header = record_path.seoul_frame(corpus.seoul_rows(TICK_ROWS[source], seed + variant)), True
+    else:
+        frame, header = record_path.gg_frame(corpus.gg_rows(TICK_ROWS[source], seed + variant))
+    return frame.to_csv(index=False, header=header, encoding="utf-8-sig").encode("utf-8-sig")
+
+
+def build_ticks(store: BlobStore, source: str, days: int, seed: int) -> list:
+    """1분에 하나씩 tick CSV 를 Blob 트리거 경로에 넣고 수정 시각을 그 tick 시각으로 맞춥니다. 반환: [(컨테이너, 이름)]"""
+    variants = [_tick_csv(source, v, seed) for v in range(VARIANTS)]
+    keys = []
+    for minute in range(days * 24 * 60):
+        when = START + timedelta(minutes=minute)
+        stamp = when.strftime('%Y%m%d_%H%M%S')
+        if source == "seoul":
+            key = (SEOUL_CONTAINER, f"{SEOUL_TRIGGER_PREFIX}seoul_jobs_{minute * TICK_ROWS[source] + 1}_{stamp}.csv")
+        else:
+            key = (GG_CONTAINER, f"ggjobs_{stamp}.csv")
+        store.put(*key, variants[minute % VARIANTS], overwrite=True)
+        store.modified[key] = when.astimezone(timezone.utc)
+        keys.append(key)
+    store.take_new_blobs()
+    return keys
+
+
+def read_all(store: BlobStore, keys: list) -> tuple:
+    """Power BI 새로 고침처럼 keys 를 전부 pandas 로 읽습니다. 반환: (행 수, 초)"""
+    started = time.perf_counter()
+    rows = 0
+    for container, name in keys:
+        data, _ = store.get(container, name)
+        if name.endswith(".parquet"):
+            rows += len(pd.read_parquet(io.BytesIO(data)))
+        else:
+            rows += len(pd.read_csv(io.BytesIO(data), dtype=str, encoding="utf-8-sig"))
+    return rows, time.perf_counter() - started
+
+
+def run(sources: list, days: int, grain: str, fmt: str, seed: int) -> dict:
+    store = BlobStore()
+    resource_pool.POOL.clear()
+    resource_pool._blob_factory = lambda conn_str: (lambda: FakeBlobServiceClient(store))
+
+    results = {}
+    for source in sources:
+        ticks = build_ticks(store, source, days, seed)
+        tick_bytes = sum(len(store.blobs[k]) for k in ticks)
+        tick_rows, tick_read_sec = read_all(store, ticks)
+
+        now = START + timedelta(days=days, seconds=compaction.COMPACT_GRACE_SEC + 1)
+        windows = days * (24 if grain == "hour" else 1)
+        stats = compaction.run(STORAGE_CONN_STR, source, grain, fmt, now=now, max_windows=windows)
+
+        written = store.take_new_blobs()
+        triggered = [k for k in written
+                     if (k[0] == SEOUL_CONTAINER and k[1].startswith(SEOUL_TRIGGER_PREFIX)) or k[0] == GG_CONTAINER]
+        ext = ".parquet" if fmt == "parquet" else ".csv"
+        outputs = [(compaction.COMPACT_CONTAINER, n) for n in store.names(compaction.COMPACT_CONTAINER, f"{source}/{grain}/")
+                   if n.endswith(ext)]
+        out_rows, out_read_sec = read_all(store, outputs)
+
+        results[source] = {
+            'ticks': len(ticks), 'tick_bytes': tick_bytes, 'tick_rows': tick_rows, 'tick_read_sec': round(tick_read_sec, 3),
+            'windows': stats['windows'], 'manifest_rows': stats['rows'], 'output_files': len(outputs),
+            'output_bytes': sum(len(store.blobs[k]) for k in outputs), 'output_rows': out_rows,
+            'output_read_sec': round(out_read_sec, 3), 'compact_sec': stats['seconds'], 'triggered_blobs': len(triggered),
+        }
+        r = results[source]
+        ok = r['tick_rows'] == r['manifest_rows'] == r['output_rows']
+        print(f"{source:<6} {days}일 | tick CSV {r['ticks']:,}개 / {r['tick_bytes'] / 1e6:,.1f} MB / {r['tick_rows']:,}행 → "
+              f"{grain} {fmt} {r['output_files']:,}개 / {r['output_bytes'] / 1e6:,.1f} MB / {r['output_rows']:,}행 "
+              f"({'행 수 일치' if ok else '❌ 행 수 불일치'})")
+        print(f"{'':<6} 압축 {r['compact_sec']:,.1f}s | 일괄 읽기 {r['ticks']:,}회 {r['tick_read_sec']:,.2f}s → "
+              f"{r['output_files']:,}회 {r['output_read_sec']:,.2f}s | Blob 트리거 경로에 쓴 Blob {r['triggered_blobs']}개")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=1, help="만들 tick CSV 기간(일)")
+    parser.add_argument("--sources", default="seoul,gg")
+    parser.add_argument("--grain", choices=["hour", "day"], default="hour")
+    parser.add_argument("--format", choices=["csv", "parquet", "both"], default="csv")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="결과를 이 경로에 JSON 으로 저장")
+    args = parser.parse_args(argv)
+
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+    results = run(sources, args.days, args.grain, args.format, args.seed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    bad = [s for s, r in results.items() if r['triggered_blobs'] or not r['tick_rows'] == r['manifest_rows'] == r['output_rows']]
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
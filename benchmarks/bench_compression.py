@@ -0,0 +1,138 @@
+"""Event Hub 이벤트 본문 압축 벤치마크.
+
+합성 코퍼스(benchmarks/corpus.py)를 실제 수집 경로처럼 정제한 CSV 로 만들고,
+shared_code.eventhub_sink.send_csv 를 압축 방식(none / gzip / zstd)과 이벤트 최대 크기별로 돌려
+이벤트 수, 이벤트당 행 수, 전송 바이트, 압축률, 처리 속도를 출력합니다.
+보낸 이벤트는 decode_event 로 다시 풀어 헤더를 뺀 레코드가 원본 CSV 와 같은지도 확인합니다.
+
+사용 예 (두 Function App 의 requirements 가 설치된 환경에서, 저장소 루트 기준):
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --rows 50000 --max-event-bytes 262144 1000000 --levels 1 6 9
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "seoul-job-cnt", "azure-func-connect"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+import corpus  # noqa: E402
+from shared_code import eventhub_sink  # noqa: E402
+from shared_code import gg_jobs as gg  # noqa: E402
+from shared_code import seoul_jobs as seoul  # noqa: E402
+
+
+class _Producer:
+    """create_batch 는 실제 EventDataBatch(1MB 제한), send_batch 는 보낸 이벤트를 모아 둡니다."""
+
+    def __init__(self):
+        self.events = []
+
+    def create_batch(self, **kwargs):
+        from azure.eventhub import EventDataBatch
+
+        class _Batch(EventDataBatch):
+            def add(self, event_data):
+                super().add(event_data)
+                self.sent.append(event_data)
+
+        batch = _Batch(max_size_in_bytes=kwargs.get('max_size_in_bytes', 1024 * 1024))
+        batch.sent = []
+        return batch
+
+    def send_batch(self, batch, **kwargs):
+        self.events.extend(batch.sent)
+
+
+def _csv_texts(rows: int, seed: int) -> dict:
+    """수집 타이머가 Blob 에 쓰는 것과 같은 정제 CSV (서울 / 경기)."""
+    seoul_df = seoul.clean_dataframe(pd.DataFrame(corpus.seoul_rows(rows, seed)))
+    gg_df, gg_header = gg.preprocess_jobs(pd.DataFrame(corpus.gg_rows(rows, seed)))
+    return {
+        "seoul": seoul_df.to_csv(index=False),
+        "gg": gg_df.to_csv(index=False, header=gg_header),
+    }
+
+
+def _round_trip_ok(text: str, events: list) -> bool:
+    """이벤트마다 앞의 헤더 레코드를 떼고 이어 붙인 결과가 원본 CSV 와 같은지 확인합니다."""
+    records = list(eventhub_sink.iter_csv_records(text))
+    header, body = records[0].encode("utf-8"), "".join(records[1:]).encode("utf-8")
+    joined = []
+    for event in events:
+        decoded = eventhub_sink.decode_event(event)
+        if not decoded.startswith(header):
+            return False
+        joined.append(decoded[len(header):])
+    return b"".join(joined) == body
+
+
+def run(rows: int, max_event_sizes: list, levels: list, seed: int = 42) -> list:
+    encodings = ["none", "gzip"] + (["zstd"] if eventhub_sink._zstd() is not None else [])
+    if "zstd" not in encodings:
+        print("(zstandard 패키지가 없어 zstd 는 건너뜀)")
+    results = []
+    for source, text in _csv_texts(rows, seed).items():
+        n_rows = len(list(eventhub_sink.iter_csv_records(text))) - 1
+        for max_bytes in max_event_sizes:
+            for encoding in encodings:
+                for level in ([None] if encoding == "none" else levels):
+                    producer = _Producer()
+                    started = time.perf_counter()
+                    if level is None:
+                        stats = eventhub_sink.send_csv(producer, text, mode="split", max_event_bytes=max_bytes,
+                                                       encoding=encoding)
+                    else:
+                        saved = eventhub_sink.EVENTHUB_COMPRESSION_LEVEL
+                        eventhub_sink.EVENTHUB_COMPRESSION_LEVEL = str(level)
+                        try:
+                            stats = eventhub_sink.send_csv(producer, text, mode="split",
+                                                           max_event_bytes=max_bytes, encoding=encoding)
+                        finally:
+                            eventhub_sink.EVENTHUB_COMPRESSION_LEVEL = saved
+                    elapsed = time.perf_counter() - started
+                    result = {
+                        'source': source,
+                        'rows': n_rows,
+                        'max_event_bytes': max_bytes,
+                        'encoding': encoding,
+                        'level': level,
+                        'events': stats['events'],
+                        'rows_per_event': round(n_rows / stats['events'], 1) if stats['events'] else None,
+                        'raw_bytes': stats['raw_bytes'],
+                        'bytes': stats['bytes'],
+                        'ratio': round(stats['raw_bytes'] / stats['bytes'], 2) if stats['bytes'] else None,
+                        'mb_per_sec': round(stats['raw_bytes'] / 1e6 / elapsed, 1) if elapsed else None,
+                        'round_trip': _round_trip_ok(text, producer.events),
+                    }
+                    results.append(result)
+                    label = f"{source} {max_bytes // 1024}KB {encoding}" + (f"-{level}" if level else "")
+                    print(f"{label:<28} 이벤트 {result['events']:>5} | 이벤트당 {result['rows_per_event']:>8,.1f}행 | "
+                          f"{result['bytes']:>11,} bytes | {result['ratio']:>5.2f}배 | "
+                          f"{result['mb_per_sec']:>6.1f} MB/s | 복원 {'OK' if result['round_trip'] else '불일치'}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="소스별 코퍼스 행 수")
+    parser.add_argument("--max-event-bytes", type=int, nargs="+", default=[eventhub_sink.EVENT_MAX_BYTES, 1000000])
+    parser.add_argument("--levels", type=int, nargs="+", default=[6], help="압축 수준 (none 에는 적용 안 함)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="결과를 이 경로에 JSON 으로 저장")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.max_event_bytes, args.levels, args.seed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0 if all(r['round_trip'] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
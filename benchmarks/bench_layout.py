@@ -0,0 +1,102 @@
+"""평평한 Blob 이름 vs 시간 파티션 + manifest(shared_code.blob_layout) 의 시간대 조회 비용 비교.
+
+경기 tick CSV(1분에 하나)를 --days 일치 가짜 Blob 저장소(load_harness.BlobStore)에 평평한 이름으로 만든 뒤
+- flat: 컨테이너 전체를 나열해 수정 시각으로 --hours 시간 분량을 고름 (List Blobs 요청 수 = Blob 수 / 5,000)
+- partitioned: blob_layout.migrate 로 manifest 를 만든 뒤 resolve 로 같은 시간대를 찾음 (시간당 manifest GET 한 번)
+두 방식이 찾은 파일 목록이 같은지와 요청 수 / 시간을 출력합니다.
+
+사용 예 (두 Function App 의 requirements 가 설치된 환경에서, 저장소 루트 기준):
+    python benchmarks/bench_layout.py
+    python benchmarks/bench_layout.py --days 30 --hours 3
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, "seoul-job-cnt", "azure-func-connect")
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_harness import BlobStore, FakeBlobServiceClient, GG_CONTAINER  # noqa: E402
+from shared_code import blob_layout, resource_pool  # noqa: E402
+
+LIST_PAGE = 5000        # List Blobs 한 번에 돌려주는 최대 항목 수
+START = datetime(2026, 1, 1, tzinfo=blob_layout.KST)
+TICK = b"\xef\xbb\xbfcompany,job_title\na,b\n"     # 조회 비용만 보므로 내용은 작게
+
+
+def build(store: BlobStore, days: int) -> None:
+    for minute in range(days * 24 * 60):
+        when = START + timedelta(minutes=minute)
+        key = (GG_CONTAINER, f"ggjobs_{when.strftime('%Y%m%d_%H%M%S')}_p{minute + 1}.csv")
+        store.put(*key, TICK, overwrite=True)
+        store.modified[key] = when.astimezone(timezone.utc)
+
+
+def flat_lookup(store: BlobStore, since, until) -> tuple:
+    """컨테이너 전체를 나열해 [since, until) 에 수정된 CSV 를 고릅니다. 반환: (이름 목록, List 요청 수)"""
+    blobs = FakeBlobServiceClient(store).get_container_client(GG_CONTAINER).list_blobs(name_starts_with="ggjobs_")
+    names = [b.name for b in blobs if since <= b.last_modified < until and b.name.endswith(".csv")]
+    return sorted(names), max(math.ceil(len(blobs) / LIST_PAGE), 1)
+
+
+def run(days: int, hours: int) -> dict:
+    store = BlobStore()
+    resource_pool.POOL.clear()
+    resource_pool._blob_factory = lambda conn_str: (lambda: FakeBlobServiceClient(store))
+    build(store, days)
+
+    since = START + timedelta(days=days // 2, hours=9)
+    until = since + timedelta(hours=hours)
+
+    started = time.perf_counter()
+    flat_names, list_requests = flat_lookup(store, since, until)
+    flat_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    migrated = blob_layout.migrate("bench-layout", "gg", count_rows=False)
+    migrate_sec = time.perf_counter() - started
+
+    reads = store.reads
+    started = time.perf_counter()
+    files = blob_layout.resolve("bench-layout", "gg", since.strftime("%Y-%m-%dT%H"),
+                                (until - timedelta(hours=1)).strftime("%Y-%m-%dT%H"), fmt="csv")
+    resolve_sec = time.perf_counter() - started
+    manifest_gets = store.reads - reads
+
+    result = {
+        'blobs': days * 24 * 60, 'hours': hours, 'files': len(flat_names),
+        'flat_list_requests': list_requests, 'flat_ms': round(flat_sec * 1000, 2),
+        'manifest_gets': manifest_gets, 'resolve_ms': round(resolve_sec * 1000, 2),
+        'same_files': sorted(f['name'] for f in files) == flat_names,
+        'migrate_partitions': migrated['partitions'], 'migrate_sec': round(migrate_sec, 2),
+    }
+    print(f"gg {days}일 ({result['blobs']:,} Blob) 중 {hours}시간 ({result['files']}개 파일) 찾기")
+    print(f"  flat        List 요청 {list_requests:,}회 (전체 나열) | {result['flat_ms']:,.1f} ms")
+    print(f"  partitioned manifest GET {manifest_gets}회 | {result['resolve_ms']:,.1f} ms | "
+          f"{'같은 파일 목록' if result['same_files'] else '❌ 파일 목록 다름'}")
+    print(f"  migrate     파티션 {migrated['partitions']:,}개 manifest 작성 {result['migrate_sec']:,.1f}s (행 수 세지 않음)")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=14, help="만들 tick CSV 기간(일)")
+    parser.add_argument("--hours", type=int, default=3, help="찾을 시간대 길이(시간)")
+    parser.add_argument("--json", help="결과를 이 경로에 JSON 으로 저장")
+    args = parser.parse_args(argv)
+
+    result = run(args.days, args.hours)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 0 if result['same_files'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
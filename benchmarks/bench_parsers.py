@@ -0,0 +1,191 @@
+"""파싱 핫패스 벤치마크.
+
+서울(shared_code.seoul_jobs) / 경기(shared_code.gg_jobs) 전처리 함수와 전체 파이프라인을
+합성 코퍼스(benchmarks/corpus.py)로 돌려 함수별 rows/sec 와 최대 메모리(tracemalloc)를 출력합니다.
+결과를 baselines.json 에 저장해 두면 이후 실행에서 기준 대비 변화와 회귀를 표시합니다.
+
+사용 예 (두 Function App 의 requirements 가 설치된 환경에서, 저장소 루트 기준):
+    python benchmarks/bench_parsers.py --sizes 1000 100000
+    python benchmarks/bench_parsers.py --sizes 1000 100000 1000000 --max-reference-rows 100000
+    python benchmarks/bench_parsers.py --sizes 1000 --save-baseline
+    python benchmarks/bench_parsers.py --check        # 벡터화/컬럼 엔진과 행 단위 원본의 결과 비교
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "seoul-job-cnt", "azure-func-connect"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+import corpus  # noqa: E402
+from shared_code import factorize_map  # noqa: E402
+from shared_code import gg_jobs as gg  # noqa: E402
+from shared_code import seoul_jobs as seoul  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+
+# (이름, 코퍼스, 행 단위 원본 여부, 준비 함수(rows) -> 인자, 실행 함수(인자))
+def _cases():
+    return [
+        ("seoul.parse_wage", "seoul", True,
+         lambda rows: pd.DataFrame(rows)['HOPE_WAGE'].fillna(''),
+         lambda s: s.apply(seoul.parse_wage)),
+        ("seoul.parse_gui_ln", "seoul", True,
+         lambda rows: pd.DataFrame(rows)['GUI_LN'].fillna(''),
+         lambda s: s.apply(seoul.parse_gui_ln)),
+        ("seoul.clean_dataframe[reference]", "seoul", True,
+         pd.DataFrame, lambda df: seoul.clean_dataframe(df, engine="reference")),
+        ("seoul.clean_dataframe[vectorized]", "seoul", False,
+         pd.DataFrame, lambda df: seoul.clean_dataframe(df, engine="vectorized")),
+        ("seoul.clean_dataframe[factorized]", "seoul", False,
+         pd.DataFrame, lambda df: seoul.clean_dataframe(df, engine="factorized")),
+        ("seoul.pipeline", "seoul", False,
+         lambda rows: rows,
+         lambda rows: seoul.clean_dataframe(pd.DataFrame(rows)).to_csv(index=False, encoding="utf-8-sig")),
+        ("gg.parse_salary", "gg", True,
+         lambda rows: pd.DataFrame(rows)['SALARY_COND'],
+         lambda s: s.apply(gg.parse_salary)),
+        ("gg.split_region", "gg", True,
+         lambda rows: pd.DataFrame(rows)['WORK_REGION_CONT'],
+         lambda s: s.apply(gg.split_region)),
+        ("gg.add_gg_region", "gg", True,
+         lambda rows: pd.DataFrame(rows)['WORK_REGION_CONT'],
+         lambda s: s.apply(gg.add_gg_region)),
+        ("gg.career_NE", "gg", True,
+         lambda rows: pd.DataFrame(rows)['CAREER_CD_NM'],
+         lambda s: s.apply(gg.career_NE)),
+        ("gg.preprocess_jobs[reference]", "gg", True,
+         pd.DataFrame, lambda df: gg.preprocess_jobs(df, engine="reference")),
+        ("gg.preprocess_jobs[columnar]", "gg", False,
+         pd.DataFrame, lambda df: gg.preprocess_jobs(df, engine="columnar")),
+        ("gg.preprocess_jobs[factorized]", "gg", False,
+         pd.DataFrame, lambda df: gg.preprocess_jobs(df, engine="factorized")),
+        ("gg.pipeline", "gg", False,
+         lambda rows: rows,
+         lambda rows: (lambda out: out[0].to_csv(index=False, header=out[1], encoding="utf-8-sig"))(
+             gg.preprocess_jobs(pd.DataFrame(rows)))),
+    ]
+
+
+def _measure(run, arg, with_memory: bool):
+    started = time.perf_counter()
+    run(arg)
+    elapsed = time.perf_counter() - started
+    peak_mb = None
+    if with_memory:
+        tracemalloc.start()
+        run(arg)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return elapsed, peak_mb
+
+
+def run_benchmarks(sizes, max_reference_rows, with_memory, only=None, seed=42):
+    results = {}
+    for n in sizes:
+        corpora = {"seoul": corpus.seoul_rows(n, seed), "gg": corpus.gg_rows(n, seed)}
+        for name, source, row_wise, prepare, run in _cases():
+            if only and not any(o in name for o in only):
+                continue
+            key = f"{name}@{n}"
+            if row_wise and n > max_reference_rows:
+                print(f"{key:<48} skipped (행 단위 함수, --max-reference-rows={max_reference_rows})")
+                continue
+            arg = prepare(corpora[source])
+            factorize_map.CACHE.clear()     # factorized 엔진은 워커 LRU 가 빈 상태(콜드)로 측정
+            elapsed, peak_mb = _measure(run, arg, with_memory)
+            results[key] = {
+                'rows': n,
+                'seconds': round(elapsed, 4),
+                'rows_per_sec': round(n / elapsed, 1) if elapsed else None,
+                'peak_mb': round(peak_mb, 2) if peak_mb is not None else None,
+            }
+            mem = f"{peak_mb:9.1f} MB" if peak_mb is not None else "         -"
+            print(f"{key:<48} {results[key]['rows_per_sec']:>14,.0f} rows/s {mem}")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """기준 대비 rows/sec 변화율을 출력하고, tolerance 이상 느려진 항목 목록을 반환합니다."""
+    regressions = []
+    print("\n=== 기준 대비 ===")
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if not base or not base.get('rows_per_sec') or not cur.get('rows_per_sec'):
+            continue
+        change = cur['rows_per_sec'] / base['rows_per_sec'] - 1
+        flag = ""
+        if change < -tolerance:
+            flag = "  ❌ 회귀"
+            regressions.append(key)
+        print(f"{key:<48} {change:+8.1%}{flag}")
+    return regressions
+
+
+def check_equivalence(n, seed=42):
+    """벡터화/컬럼/고유값 엔진과 행 단위 원본의 결과를 행 단위로 비교합니다. 불일치 건수를 반환합니다."""
+    seoul_df = pd.DataFrame(corpus.seoul_rows(n, seed))
+    gg_df = pd.DataFrame(corpus.gg_rows(n, seed))
+    checks = [
+        ("seoul.clean_dataframe[vectorized]", seoul.compare_clean_engines(seoul_df, engine="vectorized")),
+        ("seoul.clean_dataframe[factorized]", seoul.compare_clean_engines(seoul_df, engine="factorized")),
+        ("gg.preprocess_jobs[columnar]", gg.compare_preprocess_engines(gg_df, engine="columnar")),
+        ("gg.preprocess_jobs[factorized]", gg.compare_preprocess_engines(gg_df, engine="factorized")),
+    ]
+    for label, mm in checks:
+        print(f"{label:<48} 불일치 {len(mm)}건")
+        for m in mm[:10]:
+            print(f"    {m}")
+    return sum(len(mm) for _, mm in checks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--max-reference-rows", type=int, default=100000,
+                        help="이 행 수보다 크면 행 단위(apply) 원본 함수는 건너뜀")
+    parser.add_argument("--only", nargs="*", help="이름에 이 문자열이 들어간 항목만 실행")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 최대 메모리 측정 생략")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장(기존 항목은 덮어씀)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="이 비율 이상 느려지면 회귀로 표시")
+    parser.add_argument("--check", action="store_true", help="엔진 간 결과 비교만 실행")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return 1 if check_equivalence(max(args.sizes), args.seed) else 0
+
+    results = run_benchmarks(args.sizes, args.max_reference_rows, not args.no_memory, args.only, args.seed)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline.get('results', {}), args.tolerance) if baseline else []
+
+    if args.save_baseline:
+        baseline.setdefault('results', {}).update(results)
+        baseline['meta'] = {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'saved_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값 저장: {args.baseline}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
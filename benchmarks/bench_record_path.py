@@ -0,0 +1,176 @@
+"""pandas 경로 vs 레코드 경로(shared_code.record_path) 벤치마크.
+
+작은 tick 에서 두 경로의 비용을 비교합니다.
+- 콜드 스타트 import 시간: 새 인터프리터에서 각 경로가 필요로 하는 모듈을 import 하는 데 걸린 시간
+  (python -X importtime 의 최상위 import 누적 시간 합, 인터프리터 기본 import 제외)
+- tick 당 CPU 시간: API 레코드(dict 목록) → 정제 → Blob 에 쓰는 CSV(UTF-8-SIG) 바이트까지 (time.process_time)
+  · pandas: clean_dataframe(pd.DataFrame(records)) / preprocess_jobs(raw_jobs) + to_csv
+  · records: record_path.seoul_frame / gg_frame + RecordFrame.to_csv
+--check 는 코퍼스와 결측 / 타입이 섞인 레코드로 두 경로의 CSV 가 바이트 단위로 같은지 확인합니다.
+출력의 "records 가 빠른 최대 행 수" 를 RECORD_PATH_MAX_ROWS 를 고르는 기준으로 씁니다.
+
+사용 예 (두 Function App 의 requirements 가 설치된 환경에서, 저장소 루트 기준):
+    python benchmarks/bench_record_path.py
+    python benchmarks/bench_record_path.py --sizes 50 100 300 1000 --ticks 50
+    python benchmarks/bench_record_path.py --check
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, "seoul-job-cnt", "azure-func-connect")
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+import corpus  # noqa: E402
+from shared_code import gg_jobs as gg  # noqa: E402
+from shared_code import record_path  # noqa: E402
+from shared_code import seoul_jobs as seoul  # noqa: E402
+
+# 경로별로 콜드 스타트에 필요한 import
+IMPORTS = {
+    "pandas": "import pandas, numpy",
+    "records": "from shared_code import record_path",
+}
+
+
+# =========================================================================
+# === 두 경로의 CSV ===
+# =========================================================================
+def pandas_csv(source: str, records: list) -> bytes:
+    if source == "seoul":
+        df, header = seoul.clean_dataframe(pd.DataFrame(records)), True
+    else:
+        df, header = gg.preprocess_jobs(records, gg.PREPROCESS_ENGINE)
+    return df.to_csv(index=False, header=header, encoding="utf-8-sig").encode("utf-8-sig")
+
+
+def records_csv(source: str, records: list) -> bytes:
+    if source == "seoul":
+        frame, header = record_path.seoul_frame(records), True
+    else:
+        frame, header = record_path.gg_frame(records)
+    return frame.to_csv(index=False, header=header, encoding="utf-8-sig").encode("utf-8-sig")
+
+
+def _rows(source: str, n: int, seed: int) -> list:
+    return corpus.seoul_rows(n, seed) if source == "seoul" else corpus.gg_rows(n, seed)
+
+
+def check(trials: int = 200, seed: int = 42) -> dict:
+    """두 경로의 CSV 가 바이트 단위로 같은지 확인합니다. 반환: {소스: 불일치 tick 수}"""
+    rng = random.Random(seed)
+    mismatches = {"seoul": 0, "gg": 0}
+    for trial in range(trials):
+        n = rng.choice([1, 2, 5, 20, 100, 300])
+        for source in mismatches:
+            records = _rows(source, n, seed + trial)
+            if trial % 2:
+                records = corpus.with_edges(source, records, rng)
+            if source == "gg" and trial % 7 == 0:
+                for r in records:
+                    r['SALARY_COND'] = None                                    # 전부 결측 -> object 컬럼
+            if source == "gg" and trial % 11 == 0:
+                for r in records:
+                    r['SALARY_COND'] = rng.choice(["월급 200만원", "연봉 3000만원"])  # 전부 정수 -> int64 컬럼
+            if pandas_csv(source, records) != records_csv(source, records):
+                mismatches[source] += 1
+                if mismatches[source] <= 3:
+                    print(f"❌ {source} 불일치 (trial {trial}, {n}행)")
+    for source, bad in mismatches.items():
+        print(f"{source:<6} {trials} tick 비교 | {'OK' if not bad else f'불일치 {bad}'}")
+    return mismatches
+
+
+# =========================================================================
+# === 콜드 스타트 import 시간 ===
+# =========================================================================
+def _importtime_us(code: str) -> int:
+    """새 인터프리터에서 code 를 실행할 때 최상위 import 누적 시간(µs) 합."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_DIR,
+                          capture_output=True, text=True, check=True)
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):   # 들여쓰기가 없으면 최상위 import
+            total += int(cumulative)
+    return total
+
+
+def import_times(repeat: int = 5) -> dict:
+    """경로별 콜드 스타트 import 시간 중앙값(ms). 인터프리터 기본 import(site 등)는 뺍니다."""
+    def median_us(code):
+        values = sorted(_importtime_us(code) for _ in range(repeat))
+        return values[len(values) // 2]
+
+    base = median_us("pass")
+    return {path: round((median_us(code) - base) / 1000, 1) for path, code in IMPORTS.items()}
+
+
+# =========================================================================
+# === tick 당 CPU 시간 ===
+# =========================================================================
+def tick_cpu(source: str, n: int, ticks: int, seed: int) -> dict:
+    """n 행 tick 을 ticks 번 처리한 CPU 시간(ms/tick)."""
+    records = _rows(source, n, seed)
+    out = {}
+    for path, fn in (("pandas", pandas_csv), ("records", records_csv)):
+        fn(source, records)     # 워밍업 (정규식 컴파일, 첫 호출 비용 제외)
+        started = time.process_time()
+        for _ in range(ticks):
+            fn(source, records)
+        out[path] = (time.process_time() - started) * 1000 / ticks
+    return out
+
+
+def run(sizes: list, ticks: int, seed: int = 42, repeat: int = 5) -> dict:
+    imports = import_times(repeat)
+    print(f"콜드 스타트 import: pandas {imports['pandas']} ms | records {imports['records']} ms")
+
+    results = {'imports_ms': imports, 'ticks': []}
+    for source in ("seoul", "gg"):
+        fastest = 0
+        for n in sizes:
+            cpu = tick_cpu(source, n, ticks, seed)
+            speedup = cpu['pandas'] / cpu['records'] if cpu['records'] else None
+            if speedup and speedup > 1:
+                fastest = n
+            results['ticks'].append({'source': source, 'rows': n, 'pandas_ms': round(cpu['pandas'], 3),
+                                     'records_ms': round(cpu['records'], 3), 'speedup': round(speedup, 2)})
+            print(f"{source:<6} {n:>7,}행 | pandas {cpu['pandas']:>8.2f} ms/tick | "
+                  f"records {cpu['records']:>8.2f} ms/tick | {speedup:>5.2f}배")
+        print(f"{source:<6} records 가 빠른 최대 행 수: {fastest or '-'}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 300, 1000, 3000, 10000],
+                        help="tick 당 행 수")
+    parser.add_argument("--ticks", type=int, default=20, help="크기별 반복 횟수")
+    parser.add_argument("--repeat", type=int, default=5, help="import 시간 측정 반복 횟수 (중앙값)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--check", action="store_true", help="두 경로의 CSV 가 바이트 단위로 같은지 확인")
+    parser.add_argument("--json", help="결과를 이 경로에 JSON 으로 저장")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return 0 if not any(check(seed=args.seed).values()) else 1
+    results = run(args.sizes, args.ticks, args.seed, args.repeat)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
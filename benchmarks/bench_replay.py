@@ -0,0 +1,115 @@
+"""원본 응답 보관본 replay(shared_code.raw_archive) 처리 속도 측정.
+
+RAW_ARCHIVE=1 로 쌓이는 것과 같은 형식(시간 단위 Append Blob, tick 마다 gzip 멤버 하나)의 보관본을
+합성 코퍼스(benchmarks/corpus.py)로 --days 일치 만들어 가짜 Blob 저장소(load_harness.BlobStore)에 넣고,
+raw_archive.replay 로 API 호출 없이 전처리(sink none) 또는 로컬 CSV 쓰기(--sink dir)까지 돌려 다음을 출력합니다.
+- 보관본 크기 (Blob 수 / 페이지 수 / 행 수 / gzip 바이트)
+- replay 소요 시간과 행/초
+- --sink dir 이면 쓴 CSV 파일 수 / 바이트
+- 같은 범위를 OpenAPI 에서 다시 긁을 때의 예상 시간 (tick 하나 = 1분)
+
+사용 예 (두 Function App 의 requirements 가 설치된 환경에서, 저장소 루트 기준):
+    python benchmarks/bench_replay.py
+    python benchmarks/bench_replay.py --days 1 --sources gg --workers 4
+    python benchmarks/bench_replay.py --days 3 --sink dir --out /tmp/replay
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, "seoul-job-cnt", "azure-func-connect")
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import corpus  # noqa: E402
+from load_harness import BlobStore, FakeBlobServiceClient  # noqa: E402
+from shared_code import raw_archive, resource_pool  # noqa: E402
+
+STORAGE_CONN_STR = "bench-replay"
+TICKS_PER_HOUR = 60                     # 1분 타이머
+PAGE_ROWS = {"seoul": 100, "gg": 200}   # tick 하나에서 받는 건수 (서울 CHUNK_SIZE / 경기 size_per_req)
+START = datetime(2026, 1, 1)                # 보관본 첫 시간
+VARIANTS = 6                            # 서로 다른 내용의 시간 Blob 수 (나머지 시간은 이것을 돌려 씀)
+
+
+def _body(source: str, rows: list) -> dict:
+    """가짜 API 서버(load_harness)와 같은 응답 JSON."""
+    if source == "seoul":
+        return {"GetJobInfo": {"list_total_count": 10 ** 6, "RESULT": {"CODE": "INFO-000"}, "row": rows}}
+    return {"GGJOBABARECRUSTM": [{"head": [{"list_total_count": 10 ** 6}, {"RESULT": {"CODE": "INFO-000"}}]},
+                                 {"row": rows}]}
+
+
+def _hour_blob(source: str, variant: int, seed: int) -> bytes:
+    """tick 마다 페이지 하나를 gzip 멤버 하나로 덧붙인 한 시간 분량의 보관 Blob."""
+    size = PAGE_ROWS[source]
+    rows = (corpus.seoul_rows if source == "seoul" else corpus.gg_rows)(size * TICKS_PER_HOUR, seed + variant)
+    data = b""
+    for tick in range(TICKS_PER_HOUR):
+        page = rows[tick * size:(tick + 1) * size]
+        line = json.dumps({'source': source, 'fetched_at': None, 'position': tick + 1, 'request': {},
+                           'body': _body(source, page)}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        data += raw_archive.encode_blocks([line + b"\n"])[0]
+    return data
+
+
+def build_archive(store: BlobStore, source: str, days: int, seed: int) -> dict:
+    variants = [_hour_blob(source, v, seed) for v in range(VARIANTS)]
+    hours = days * 24
+    for h in range(hours):
+        name = raw_archive.blob_name(source, START + timedelta(hours=h))
+        store.put(raw_archive.RAW_ARCHIVE_CONTAINER, name, variants[h % VARIANTS], overwrite=True)
+    return {'blobs': hours, 'pages': hours * TICKS_PER_HOUR, 'rows': hours * TICKS_PER_HOUR * PAGE_ROWS[source],
+            'gzip_bytes': sum(len(variants[h % VARIANTS]) for h in range(hours))}
+
+
+def run(sources: list, days: int, sink: str, out_dir: str, file_rows: int, workers: int, seed: int) -> dict:
+    store = BlobStore()
+    resource_pool.POOL.clear()
+    resource_pool._blob_factory = lambda conn_str: (lambda: FakeBlobServiceClient(store))
+
+    results = {}
+    for source in sources:
+        archive = build_archive(store, source, days, seed)
+        adapter = raw_archive.load_adapter(source)
+        adapter.storage_conn = None
+        stats = raw_archive.replay(adapter, STORAGE_CONN_STR, sink=sink, out_dir=out_dir,
+                                   file_rows=file_rows, workers=workers)
+        results[source] = dict(archive, replay_sec=stats['seconds'], rows_per_sec=stats['rows_per_sec'],
+                               output_files=stats['files'], output_bytes=stats['bytes'],
+                               recrawl_hours=round(archive['pages'] / TICKS_PER_HOUR, 1))
+        r = results[source]
+        print(f"{source:<6} {days}일 | Blob {r['blobs']:,}개 / 페이지 {r['pages']:,} / {r['rows']:,}행 | "
+              f"gzip {r['gzip_bytes'] / 1e6:,.1f} MB")
+        print(f"{'':<6} replay {r['replay_sec']:,.1f}s ({r['rows_per_sec']:,.0f} 행/s) | "
+              + (f"CSV {r['output_files']}개 / {r['output_bytes'] / 1e6:,.1f} MB | " if sink == "dir" else "")
+              + f"API 재수집 예상 {r['recrawl_hours']:,.1f}시간 (1분 tick)")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=14, help="만들 보관본 기간(일)")
+    parser.add_argument("--sources", default="seoul,gg")
+    parser.add_argument("--sink", choices=["none", "dir"], default="none")
+    parser.add_argument("--out", help="--sink dir 의 출력 디렉터리")
+    parser.add_argument("--file-rows", type=int, default=raw_archive.RAW_REPLAY_FILE_ROWS)
+    parser.add_argument("--workers", type=int, default=raw_archive.RAW_REPLAY_WORKERS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="결과를 이 경로에 JSON 으로 저장")
+    args = parser.parse_args(argv)
+
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+    results = run(sources, args.days, args.sink, args.out, args.file_rows, args.workers, args.seed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""경기 Function App(function_app.py) 콜드 스타트 import 시간 측정.
+
+트리거마다 새 인터프리터에서 function_app 과 그 트리거가 첫 실행 때 불러오는 모듈을 import 하고
+python -X importtime 결과를 모아
+- 트리거별 import 시간 합계 (인터프리터 기본 import 제외, 여러 번 측정한 중앙값)
+- 패키지별 import 시간(self 합계) 상위 항목
+을 출력합니다. 결과를 startup_baselines.json 에 저장해 두면 이후 실행에서 기준 대비 변화와 회귀를 표시합니다.
+
+사용 예 (경기 Function App 의 requirements 가 설치된 환경에서, 저장소 루트 기준):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 9 --top 8
+    python benchmarks/bench_startup.py --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GG_APP = os.path.join(ROOT, "ggi-job-cnt", "azure-func-connect")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baselines.json")
+
+# 트리거 → 첫 실행에서 추가로 import 되는 모듈 (function_app 의 지연 import 와 resource_pool 의 SDK 클라이언트)
+TRIGGERS = {
+    "function_app (모듈 로드만)": [],
+    "blob_to_asa": ["azure.eventhub"],
+    "trig_connect_ggjobs": ["shared_code.gg_jobs", "shared_code.dedupe_index", "shared_code.job_counts",
+                            "shared_code.factorize_map", "requests", "azure.storage.blob"],
+    "trig_ingest_all": ["shared_code.ingest_engine", "shared_code.gg_jobs", "shared_code.seoul_jobs",
+                        "shared_code.factorize_map", "requests", "azure.storage.blob"],
+}
+
+
+def _importtime(code: str) -> list:
+    """새 인터프리터에서 code 를 실행하고 -X importtime 항목 [(모듈, 깊이, self µs, cumulative µs)] 을 반환합니다."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=GG_APP,
+                          capture_output=True, text=True, check=True)
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2     # 최상위는 공백 1칸, 한 단계마다 2칸
+        entries.append((name.strip(), depth, int(self_us), int(cumulative)))
+    return entries
+
+
+def _package(module: str) -> str:
+    parts = module.split(".")
+    return ".".join(parts[:2]) if parts[0] in ("azure", "shared_code") else parts[0]
+
+
+def measure(modules: list, repeat: int, base_modules: set) -> dict:
+    """function_app + modules 를 import 하는 시간(ms, 중앙값)과 패키지별 self 시간을 측정합니다."""
+    code = "; ".join(["import function_app"] + [f"import {m}" for m in modules])
+    runs = []
+    for _ in range(repeat):
+        entries = _importtime(code)
+        total = sum(cum for name, depth, _, cum in entries if depth == 0 and name not in base_modules)
+        runs.append((total, entries))
+    runs.sort(key=lambda r: r[0])
+    total, entries = runs[len(runs) // 2]
+
+    packages = Counter()
+    for name, _, self_us, _ in entries:
+        if name not in base_modules:
+            packages[_package(name)] += self_us
+    return {
+        'ms': round(total / 1000, 1),
+        'modules': len([e for e in entries if e[0] not in base_modules]),
+        'packages_ms': {p: round(us / 1000, 1) for p, us in packages.most_common()},
+    }
+
+
+def run(repeat: int, top: int) -> dict:
+    base_modules = {name for name, *_ in _importtime("pass")}    # 인터프리터 시작 시 import 되는 모듈
+    results = {}
+    for trigger, modules in TRIGGERS.items():
+        result = measure(modules, repeat, base_modules)
+        results[trigger] = result
+        heaviest = ", ".join(f"{p} {ms}" for p, ms in list(result['packages_ms'].items())[:top])
+        print(f"{trigger:<28} {result['ms']:>8.1f} ms | 모듈 {result['modules']:>4}개 | {heaviest}")
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """기준 대비 import 시간 변화율을 출력하고, tolerance 이상 느려진 트리거 목록을 반환합니다."""
+    regressions = []
+    print("\n=== 기준 대비 ===")
+    for trigger, cur in results.items():
+        base = baseline.get(trigger)
+        if not base or not base.get('ms'):
+            continue
+        change = cur['ms'] / base['ms'] - 1
+        flag = ""
+        if change > tolerance:
+            flag = "  ❌ 회귀"
+            regressions.append(trigger)
+        print(f"{trigger:<28} {base['ms']:>8.1f} → {cur['ms']:>8.1f} ms {change:+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="트리거별 측정 횟수 (중앙값)")
+    parser.add_argument("--top", type=int, default=5, help="출력할 패키지 수")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장(기존 항목은 덮어씀)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="이 비율 이상 느려지면 회귀로 표시")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.top)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline.get('results', {}), args.tolerance) if baseline else []
+
+    if args.save_baseline:
+        baseline.setdefault('results', {}).update(results)
+        baseline['meta'] = {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'saved_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값 저장: {args.baseline}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""벤치마크용 합성 채용공고 코퍼스.
+
+서울시 GetJobInfo / 경기도 GGJOBABARECRUSTM 응답의 row 와 같은 키를 가진 dict 리스트를 만듭니다.
+급여 문자열((시급)/10,030원, 월급 250만원 이상, 3000~3500만원 …), 여러 지역이 섞인 근무지,
+쉼표로 이어진 경력 코드 등 실제 공고에서 보이는 형식을 섞고, 값마다 적당한 반복(카디널리티)을 둡니다.
+같은 seed 면 항상 같은 코퍼스가 만들어집니다.
+with_edges 는 결측 / 키 누락 / 숫자·bool 이 섞인 값(EDGE_VALUES)을 섞어 엔진 간 비교의 경계 사례를 만듭니다.
+"""
+import numpy as np
+
+SEOUL_DISTRICTS = ["강남구", "서초구", "송파구", "마포구", "영등포구", "중구", "종로구", "구로구", "금천구", "성동구",
+                   "광진구", "동대문구", "노원구", "은평구", "강서구", "관악구", "동작구", "용산구", "성북구", "강동구"]
+GG_CITIES = ["수원시 영통구", "수원시 팔달구", "성남시 분당구", "용인시 기흥구", "용인시 수지구", "화성시", "평택시", "안산시 단원구",
+             "안양시 동안구", "고양시 일산동구", "부천시", "남양주시", "파주시", "김포시", "광주시", "하남시", "시흥시", "이천시"]
+OTHER_REGIONS = ["서울 강남구", "서울 구로구", "인천 남동구", "인천 연수구", "충남 천안시", "전국", "대전 유성구"]
+COMPANY_WORDS = ["한빛", "미래", "동방", "새솔", "누리", "다온", "하늘", "그린", "스마트", "대한", "우리", "제일"]
+COMPANY_SUFFIX = ["(주)", "주식회사", "산업", "테크", "물류", "식품", "의료재단", "건설", "솔루션"]
+JOB_WORDS = ["생산직", "사무보조", "물류 상하차", "요양보호사", "조리원", "경비원", "미화원", "웹 개발자", "회계 담당",
+             "영업 관리", "CS 상담원", "품질 검사원", "지게차 운전원", "간호조무사", "데이터 분석가", "매장 관리"]
+SEOUL_CODES = ["023300", "23300", "012201", "021101", "061100", "093100", "099900", "14200", "133302", "084200"]
+GG_FIELD_CODES = ["02330001", "01220102", "06110003", "09310001", "13330201", "08420002", "14200003", None]
+GG_FIELD_NAMES = ["응용 소프트웨어 개발자", "경리 사무원", "요양보호사", "청소원", "제품 생산직", "조리사", "경비원", "기타"]
+CAREER_CODES = ["01", "02", "03", "04", "01,02", "02,03", "03,04", "01,02,03,04", None]
+ACDMCR_NAMES = ["학력무관", "고졸", "대졸(2~3년)", "대졸(4년)", "석사", None]
+
+
+def _wage_formats(rng: np.random.Generator, n: int) -> list:
+    """여러 형식의 급여 문자열 n 개를 만듭니다."""
+    out = []
+    for _ in range(n):
+        kind = rng.integers(0, 12)
+        hourly = int(rng.integers(9860, 15000) // 10 * 10)
+        monthly = int(rng.integers(200, 450))
+        yearly = int(rng.integers(2600, 6000) // 100 * 100)
+        if kind == 0:
+            out.append(f"(시급)/{hourly:,}원")
+        elif kind == 1:
+            out.append(f"시급 {hourly:,}원 이상")
+        elif kind == 2:
+            out.append(f"월급 {monthly}만원 이상")
+        elif kind == 3:
+            out.append(f"(월급) {monthly * 10000:,}원")
+        elif kind == 4:
+            out.append(f"{yearly}~{yearly + 500}만원")
+        elif kind == 5:
+            out.append(f"연봉 {yearly:,}만원")
+        elif kind == 6:
+            out.append(f"일급 {int(rng.integers(9, 20))}만원")
+        elif kind == 7:
+            out.append(f"연봉 {yearly}만원 이하")
+        elif kind == 8:
+            out.append(f"월급 {monthly}~{monthly + 30}만원")
+        elif kind == 9:
+            out.append("회사내규에 따름")
+        elif kind == 10:
+            out.append("면접 후 결정")
+        else:
+            out.append(f"{monthly * 10000:,}원")
+    return out
+
+
+def _pick(rng: np.random.Generator, pool: list, n: int) -> list:
+    idx = rng.integers(0, len(pool), size=n)
+    return [pool[i] for i in idx]
+
+
+def _region_pool(rng: np.random.Generator, n: int) -> list:
+    """'수원시 영통구, 화성시, 서울 강남구' 처럼 1~3개 지역이 섞인 문자열 n 개."""
+    out = []
+    for _ in range(n):
+        k = int(rng.integers(1, 4))
+        regions = [GG_CITIES[i] for i in rng.integers(0, len(GG_CITIES), size=k)]
+        if rng.random() < 0.2:
+            regions.append(OTHER_REGIONS[int(rng.integers(0, len(OTHER_REGIONS)))])
+        out.append(", ".join(regions))
+    return out + [None, "None"]
+
+
+def seoul_rows(n: int, seed: int = 42) -> list:
+    """서울시 GetJobInfo row 형식의 합성 레코드 n 개."""
+    rng = np.random.default_rng(seed)
+    companies = [f"{w}{s}" for w in COMPANY_WORDS for s in COMPANY_SUFFIX]
+    wages = _wage_formats(rng, 400) + [None, ""]
+    guis = [f"{t} / 서울 {d} / {c} / {a}" for t in ("정규직", "계약직", "시간제") for d in SEOUL_DISTRICTS
+            for c, a in (("경력무관", "학력무관"), ("신입", "고졸"), ("경력 2년 이상", "대졸(4년)"))] + ["서울 중구", None]
+    rows = {
+        'JO_REGIST_NO': [f"K{150000000 + i}" for i in range(n)],
+        'CMPNY_NM': _pick(rng, companies, n),
+        'JO_SJ': _pick(rng, JOB_WORDS, n),
+        'HOPE_WAGE': _pick(rng, wages, n),
+        'GUI_LN': _pick(rng, guis, n),
+        'RCRIT_JSSFC_CMMN_CODE_SE': _pick(rng, SEOUL_CODES + [None], n),
+        'JOBCODE_NM': _pick(rng, GG_FIELD_NAMES, n),
+        'CAREER_CND_CMMN_CODE_SE': _pick(rng, ["E", "N", "Z"], n),
+        'ACDMCR_CMMN_CODE_SE': _pick(rng, ["00", "03", "04", "05", "06"], n),
+    }
+    keys = list(rows)
+    return [dict(zip(keys, values)) for values in zip(*rows.values())]
+
+
+def gg_rows(n: int, seed: int = 42) -> list:
+    """경기도 GGJOBABARECRUSTM row 형식의 합성 레코드 n 개."""
+    rng = np.random.default_rng(seed)
+    companies = [f"{w}{s}" for w in COMPANY_WORDS for s in COMPANY_SUFFIX]
+    salaries = _wage_formats(rng, 400) + [None]
+    regions = _region_pool(rng, 300)
+    rows = {
+        'ENTRPRS_NM': _pick(rng, companies, n),
+        'PBANC_CONT': _pick(rng, JOB_WORDS, n),
+        'SALARY_COND': _pick(rng, salaries, n),
+        'ACDMCR_CD_NM': _pick(rng, ACDMCR_NAMES, n),
+        'CAREER_CD_NM': _pick(rng, CAREER_CODES, n),
+        'RECRUT_FIELD_CD_NM': _pick(rng, GG_FIELD_CODES, n),
+        'RECRUT_FIELD_NM': _pick(rng, GG_FIELD_NAMES, n),
+        'WORK_REGION_CONT': _pick(rng, regions, n),
+    }
+    keys = list(rows)
+    return [dict(zip(keys, values)) for values in zip(*rows.values())]
+
+
+# 결측 / 키 누락 / 숫자·bool 이 섞인 값 (API 가 가끔 보내는 형태)
+EDGE_VALUES = {
+    "seoul": {
+        'HOPE_WAGE': [None, "", 12345, "월급 .원", "(월급)/ 2,500,000", "시급 0원", "연봉 3.5만원", "100원"],
+        'GUI_LN': [None, "", 3, "a/b", "a / b / c / d / e"],
+        'RCRIT_JSSFC_CMMN_CODE_SE': [None, "", 12345, "12345", "  0213 ", "ab12", 1234567],
+        'JOBCODE_NM': [None, 1, 2.5, True],
+        'CMPNY_NM': [None, 'a,"b"', "x\ny"],
+    },
+    "gg": {
+        'SALARY_COND': [None, "시급 협의", "연봉 3000~3500만원", "월 250만원 이하", "일급 12만원", "내규", "10~11원"],
+        'WORK_REGION_CONT': [None, "None", " , ,수원시", "서울 중구", ""],
+        'ACDMCR_CD_NM': [None, 3, "x"],
+        'CAREER_CD_NM': [None, "03,04", "01", "x"],
+        'RECRUT_FIELD_CD_NM': [None, "12"],
+        'ENTRPRS_NM': [None, 1],
+    },
+}
+
+
+def with_edges(source: str, records: list, rng) -> list:
+    """records 의 값 일부를 EDGE_VALUES 로 바꾸거나 키를 빼서 돌려줍니다. (rng 는 random.Random)"""
+    for i, r in enumerate(records):
+        for key, pool in EDGE_VALUES[source].items():
+            x = rng.random()
+            if x < 0.1:
+                r[key] = rng.choice(pool)
+            elif x < 0.13 and i:        # 첫 레코드는 모든 키를 남겨 컬럼 자체는 있게 함
+                r.pop(key, None)
+    return records
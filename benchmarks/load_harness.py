@@ -0,0 +1,650 @@
+"""오프라인 종단간 부하 하네스.
+
+서울 / 경기 OpenAPI, Blob Storage, Event Hub 를 모두 로컬 가짜로 바꿔 두고
+수집 타이머(서울 trig_connect_seoul.main, 경기 trig_connect_ggjobs)와 전송 Blob 트리거
+(서울 blob_to_eventhub.main, 경기 blob_to_asa)를 빠른 주기로 돌려 다음을 출력합니다.
+
+- 종단간 처리량: Event Hub 까지 도착한 레코드 수 / 경과 시간 (records/sec)
+- tick 지연: 한 tick(수집 → 업로드 → 새 Blob 전송) 의 p50 / p99 / 최대
+- 옮긴 바이트: API 응답 / Blob 쓰기 / Event Hub 전송
+- --trace: 단계별(span) p50 / p95 (shared_code/tracing.py 의 MemoryExporter 사용)
+- 수집 → 이벤트 지연: tick(타이머) 시작부터 그 tick 의 레코드가 Event Hub 에 도착할 때까지 (배치마다, p50 / p99)
+  --delivery blob(기존, Blob 트리거 경유) | direct(DELIVERY_MODE=direct, 타이머가 바로 전송) 로 두 경로를 비교
+  (--blob-latency-ms 로 Blob 쓰기 지연을, --trigger-delay-ms 로 Blob 트리거 폴링 지연을 흉내 냄)
+- --job-counts both|only: 직무 코드별 집계 레코드(JOB_COUNTS_MODE)를 따로 받아 이벤트 / 바이트와
+  집계 건수 합계(= 원본 행 수여야 함)를 출력
+
+구성
+- 가짜 API 서버: 별도 프로세스의 ThreadingHTTPServer. GetJobInfo(/{KEY}/json/GetJobInfo/{시작}/{끝}/) 와
+  GGJOBABARECRUSTM(?pIndex=&pSize=) 응답을 합성 코퍼스(benchmarks/corpus.py)로 만들고, 지연 / 오류율을 설정할 수 있음
+  (SEOUL_API_BASE_URL / GG_API_BASE_URL 을 이 서버로 지정)
+- 가짜 Blob: BlobServiceClient 가 쓰는 메서드(get_blob_client / get_container_client / upload_blob(etag 조건) /
+  download_blob)만 구현한 메모리 저장소. --store-dir 를 주면 쓴 Blob 을 파일로도 남김
+- 가짜 Event Hub: create_batch 는 실제 EventDataBatch(크기 제한 그대로)를 쓰고 send_batch 는 건수 / 바이트만 셈
+  (EVENTHUB_COMPRESSION 으로 압축한 이벤트는 eventhub_sink.decode_event 로 풀어서 레코드를 셈)
+- Blob 트리거: tick 안에서 새로 쓴 Blob 중 function.json / blob_trigger 경로에 맞는 것을 바로 전송 함수에 넘김
+
+사용 예 (두 Function App 의 requirements 가 설치된 환경에서, 저장소 루트 기준):
+    python benchmarks/load_harness.py --ticks 200
+    python benchmarks/load_harness.py --ticks 500 --rate 20 --latency-ms 80 --jitter-ms 40 --error-rate 0.01
+    FETCH_CONCURRENCY=4 FETCH_WORKERS=4 python benchmarks/load_harness.py --ticks 100 --endless --trace
+    python benchmarks/load_harness.py --ticks 100 --blob-latency-ms 30 --delivery direct
+    RAW_ARCHIVE=1 python benchmarks/load_harness.py --ticks 50     # 원본 응답도 raw-archive 컨테이너에 보관 (Blob 쓰기에 포함)
+    SEOUL_PROBE=1 FETCH_CONCURRENCY=4 python benchmarks/load_harness.py --ticks 20 --sources seoul --seoul-rows 300
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEOUL_APP = os.path.join(ROOT, "seoul-job-cnt", "azure-func-connect")
+GG_APP = os.path.join(ROOT, "ggi-job-cnt", "azure-func-connect")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import corpus  # noqa: E402
+
+STORAGE_CONN_STR = "harness-storage"
+EVENTHUB_CONN_STR = "harness-eventhub"
+EVENTHUB_NAME = "harness-hub"
+COUNTS_EVENTHUB_NAME = "harness-job-counts"   # JOB_COUNTS_EVENTHUB_NAME
+SEOUL_CONTAINER = "seoul-job-ct"
+SEOUL_TRIGGER_PREFIX = "data/all_jobs/"     # blob_to_eventhub/function.json 의 path
+GG_CONTAINER = "ggjob-data"                 # function_app.blob_to_asa 의 path
+
+
+# =========================================================================
+# === 가짜 OpenAPI 서버 (별도 프로세스) ===
+# =========================================================================
+def _api_handler(seoul_rows, gg_rows, endless, latency, jitter, error_rate, counters, lock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                counters['requests'] += 1
+                counters['bytes'] += len(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/__stats":
+                with lock:
+                    return self._send(200, dict(counters))
+
+            delay = latency + random.uniform(0, jitter)
+            if delay > 0:
+                time.sleep(delay)
+            if error_rate and random.random() < error_rate:
+                with lock:
+                    counters['errors'] += 1
+                return self._send(503, {"RESULT": {"CODE": "ERROR-500", "MESSAGE": "서버 오류"}})
+
+            parts = [p for p in url.path.split("/") if p]
+            if len(parts) == 5 and parts[2] == "GetJobInfo":
+                start, end = int(parts[3]), int(parts[4])
+                if endless:
+                    rows = [seoul_rows[(i - 1) % len(seoul_rows)] for i in range(start, end + 1)]
+                else:
+                    rows = seoul_rows[start - 1:end]
+                with lock:
+                    counters['rows'] += len(rows)
+                if not rows:
+                    return self._send(200, {"RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}})
+                total = 10 ** 9 if endless else len(seoul_rows)
+                return self._send(200, {"GetJobInfo": {"list_total_count": total,
+                                                       "RESULT": {"CODE": "INFO-000", "MESSAGE": "정상 처리되었습니다"},
+                                                       "row": rows}})
+
+            if parts and parts[-1] == "GGJOBABARECRUSTM":
+                query = parse_qs(url.query)
+                page, size = int(query["pIndex"][0]), int(query["pSize"][0])
+                rows = gg_rows[(page - 1) * size:page * size]
+                with lock:
+                    counters['rows'] += len(rows)
+                if not rows:
+                    return self._send(200, {"RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}})
+                return self._send(200, {"GGJOBABARECRUSTM": [
+                    {"head": [{"list_total_count": len(gg_rows)}, {"RESULT": {"CODE": "INFO-000"}}]},
+                    {"row": rows},
+                ]})
+
+            return self._send(404, {"RESULT": {"CODE": "ERROR-404"}})
+    return Handler
+
+
+def _serve_api(ready, seoul_rows: int, gg_rows: int, endless: bool, latency: float, jitter: float,
+               error_rate: float, seed: int):
+    random.seed(seed)
+    counters, lock = {'requests': 0, 'rows': 0, 'bytes': 0, 'errors': 0}, threading.Lock()
+    handler = _api_handler(corpus.seoul_rows(seoul_rows, seed), corpus.gg_rows(gg_rows, seed),
+                           endless, latency, jitter, error_rate, counters, lock)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+class FakeApiServer:
+    """가짜 서울 / 경기 OpenAPI 를 별도 프로세스로 띄웁니다. (하네스와 GIL 을 나누지 않도록)"""
+
+    def __init__(self, seoul_rows=5000, gg_rows=5000, endless=False, latency_sec=0.0, jitter_sec=0.0,
+                 error_rate=0.0, seed=42):
+        self._args = (seoul_rows, gg_rows, endless, latency_sec, jitter_sec, error_rate, seed)
+        self._process = None
+        self.port = None
+
+    def __enter__(self):
+        ready = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_serve_api, args=(ready,) + self._args, daemon=True)
+        self._process.start()
+        self.port = ready.get(timeout=30)
+        return self
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join(timeout=5)
+        return False
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def stats(self) -> dict:
+        import requests
+        return requests.get(f"{self.base_url}/__stats", timeout=5).json()
+
+
+# =========================================================================
+# === 가짜 Blob Storage ===
+# =========================================================================
+class BlobStore:
+    """(컨테이너, 이름) → bytes 저장소. ETag 조건부 쓰기를 지원하고 새로 쓴 Blob 목록을 모읍니다."""
+
+    def __init__(self, store_dir: str = None, latency_sec: float = 0.0):
+        self.blobs = {}
+        self.etags = {}
+        self.modified = {}          # (컨테이너, 이름) → 마지막 수정 시각 (UTC, list_blobs 의 last_modified)
+        self.store_dir = store_dir
+        self.latency_sec = latency_sec
+        self.bytes_written = 0
+        self.writes = 0
+        self.bytes_read = 0
+        self.reads = 0
+        self.new_blobs = []         # Blob 트리거로 넘길 (컨테이너, 이름)
+        self._etag = 0
+        self._lock = threading.Lock()
+
+    def put(self, container: str, name: str, data: bytes, overwrite: bool, etag: str = None) -> str:
+        from azure.core.exceptions import ResourceExistsError, ResourceModifiedError
+
+        key = (container, name)
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+        with self._lock:
+            if not overwrite and key in self.blobs:
+                raise ResourceExistsError(f"{container}/{name} 이미 존재")
+            if etag is not None and self.etags.get(key) != etag:
+                raise ResourceModifiedError(f"{container}/{name} ETag 불일치")
+            self._etag += 1
+            self.blobs[key] = data
+            self.etags[key] = f'"0x{self._etag:x}"'
+            self.modified[key] = datetime.now(timezone.utc)
+            self.bytes_written += len(data)
+            self.writes += 1
+            self.new_blobs.append(key)
+            new_etag = self.etags[key]
+            if self.store_dir:     # 같은 Blob 을 여러 스레드가 차례로 고칠 때 파일이 섞이지 않도록 lock 안에서
+                path = os.path.join(self.store_dir, container, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data)
+        return new_etag
+
+    def append(self, container: str, name: str, data: bytes) -> str:
+        """Append Blob 에 덧붙입니다. (Blob 이 없으면 ResourceNotFoundError)"""
+        from azure.core.exceptions import ResourceNotFoundError
+
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+        with self._lock:
+            if (container, name) not in self.blobs:
+                raise ResourceNotFoundError(f"{container}/{name} 없음")
+            existing = self.blobs[(container, name)]
+        return self.put(container, name, existing + data, overwrite=True)
+
+    def delete(self, container: str, name: str) -> None:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        with self._lock:
+            if (container, name) not in self.blobs:
+                raise ResourceNotFoundError(f"{container}/{name} 없음")
+            for d in (self.blobs, self.etags, self.modified):
+                d.pop((container, name), None)
+
+    def names(self, container: str, prefix: str = "") -> list:
+        with self._lock:
+            return sorted(n for c, n in self.blobs if c == container and n.startswith(prefix))
+
+    def get(self, container: str, name: str):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        with self._lock:
+            if (container, name) not in self.blobs:
+                raise ResourceNotFoundError(f"{container}/{name} 없음")
+            self.reads += 1
+            self.bytes_read += len(self.blobs[(container, name)])
+            return self.blobs[(container, name)], self.etags[(container, name)]
+
+    def take_new_blobs(self) -> list:
+        with self._lock:
+            out, self.new_blobs = self.new_blobs, []
+        return out
+
+
+class _Properties:
+    def __init__(self, etag: str, size: int, name: str = None, last_modified: datetime = None):
+        self.etag = etag
+        self.size = size
+        self.name = name
+        self.last_modified = last_modified
+
+
+class _Downloader:
+    def __init__(self, data: bytes, etag: str):
+        self._data = data
+        self.properties = _Properties(etag, len(data))
+
+    def readall(self) -> bytes:
+        return self._data
+
+
+class FakeBlobClient:
+    def __init__(self, store: BlobStore, container: str, name: str):
+        self.store, self.container_name, self.blob_name = store, container, name
+
+    def upload_blob(self, data, overwrite: bool = False, etag: str = None, match_condition=None, **kwargs):
+        if hasattr(data, "read"):
+            data = data.read()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return {'etag': self.store.put(self.container_name, self.blob_name, data, overwrite, etag)}
+
+    def download_blob(self, **kwargs):
+        return _Downloader(*self.store.get(self.container_name, self.blob_name))
+
+    def create_append_blob(self, match_condition=None, **kwargs):
+        from azure.core import MatchConditions
+        return {'etag': self.store.put(self.container_name, self.blob_name, b"",
+                                       overwrite=match_condition != MatchConditions.IfMissing)}
+
+    def append_block(self, data, **kwargs):
+        return {'etag': self.store.append(self.container_name, self.blob_name, data)}
+
+    def delete_blob(self, **kwargs):
+        self.store.delete(self.container_name, self.blob_name)
+
+
+class FakeContainerClient:
+    def __init__(self, store: BlobStore, container: str):
+        self.store, self.container_name = store, container
+
+    def create_container(self):
+        pass
+
+    def get_blob_client(self, name: str) -> FakeBlobClient:
+        return FakeBlobClient(self.store, self.container_name, name)
+
+    def upload_blob(self, name: str, data, overwrite: bool = False, **kwargs):
+        return self.get_blob_client(name).upload_blob(data, overwrite=overwrite, **kwargs)
+
+    def list_blobs(self, name_starts_with: str = "", **kwargs):
+        out = []
+        for name in self.store.names(self.container_name, name_starts_with or ""):
+            key = (self.container_name, name)
+            out.append(_Properties(self.store.etags.get(key), len(self.store.blobs.get(key, b"")), name,
+                                   self.store.modified.get(key)))
+        return out
+
+
+class FakeBlobServiceClient:
+    def __init__(self, store: BlobStore):
+        self.store = store
+
+    def get_container_client(self, container: str) -> FakeContainerClient:
+        return FakeContainerClient(self.store, container)
+
+    def get_blob_client(self, container: str, blob: str) -> FakeBlobClient:
+        return FakeBlobClient(self.store, container, blob)
+
+    def close(self):
+        pass
+
+
+# =========================================================================
+# === 가짜 Event Hub ===
+# =========================================================================
+class EventHubSink:
+    """전송된 이벤트 / 배치 / 바이트(전송 / 압축 해제) / CSV 레코드 수를 셉니다. (CSV 레코드 = 줄 수 - 헤더 1줄)"""
+
+    def __init__(self, store_dir: str = None, latency_sec: float = 0.0, name: str = EVENTHUB_NAME,
+                 keep_bodies: bool = False):
+        self.events = self.batches = self.bytes = self.raw_bytes = self.records = 0
+        self.latency_sec = latency_sec
+        self.bodies = [] if keep_bodies else None   # 압축을 푼 본문 (집계 레코드 검증용)
+        self.tick_started = None    # 하네스가 tick 마다 기록 (수집 → 이벤트 지연 계산용)
+        self.delays = []            # 배치마다 tick 시작부터 전송까지 걸린 시간(초)
+        self.path = os.path.join(store_dir, "eventhub", f"{name}.jsonl") if store_dir else None
+        if self.path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+
+    def record(self, bodies: list) -> None:
+        """bodies: (전송 바이트 수, 압축을 푼 본문) 목록"""
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+        with self._lock:
+            self.batches += 1
+            if self.tick_started is not None:
+                self.delays.append(time.perf_counter() - self.tick_started)
+            for wire_bytes, body in bodies:
+                self.events += 1
+                self.bytes += wire_bytes
+                self.raw_bytes += len(body)
+                self.records += max(body.rstrip(b"\n").count(b"\n"), 0)
+                if self.bodies is not None:
+                    self.bodies.append(body)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for wire_bytes, body in bodies:
+                        f.write(json.dumps({'bytes': wire_bytes, 'body': body.decode("utf-8", "replace")},
+                                           ensure_ascii=False) + "\n")
+
+
+def _event_bytes(event) -> bytes:
+    return b"".join(part if isinstance(part, bytes) else str(part).encode("utf-8") for part in event.body)
+
+
+class FakeEventHubProducerClient:
+    """create_batch 는 실제 EventDataBatch(최대 크기 검사 그대로), send_batch 는 EventHubSink 에 기록만 합니다."""
+
+    def __init__(self, sink: EventHubSink):
+        self.sink = sink
+
+    def create_batch(self, **kwargs):
+        from azure.eventhub import EventDataBatch
+        from shared_code.eventhub_sink import decode_event
+
+        class _Batch(EventDataBatch):
+            def add(self, event_data):
+                super().add(event_data)
+                self.bodies.append((len(_event_bytes(event_data)), decode_event(event_data)))
+
+        batch = _Batch(max_size_in_bytes=kwargs.get('max_size_in_bytes', 1024 * 1024))
+        batch.bodies = []
+        return batch
+
+    def send_batch(self, batch, **kwargs):
+        self.sink.record(batch.bodies)
+
+    def close(self):
+        pass
+
+
+# =========================================================================
+# === Blob 트리거 입력 ===
+# =========================================================================
+class FakeInputStream:
+    """func.InputStream 대신 넘기는 읽기 전용 스트림 (name / length / uri / read)."""
+
+    def __init__(self, container: str, name: str, data: bytes):
+        self.name = f"{container}/{name}"
+        self.length = len(data)
+        self.uri = f"https://harness.blob.core.windows.net/{self.name}"
+        self._data = data
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = len(self._data) - self._pos
+        chunk = self._data[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+
+class _Timer:
+    past_due = False
+
+
+# =========================================================================
+# === 하네스 ===
+# =========================================================================
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(round(q * (len(values) - 1))), len(values) - 1)]
+
+
+def _load_apps(api_base_url: str, delivery: str = "blob", counts_mode: str = "off"):
+    """가짜 서비스 주소를 환경 변수로 지정한 뒤 두 앱의 함수를 import 합니다."""
+    os.environ.update({
+        "DELIVERY_MODE": delivery,
+        "JOB_COUNTS_MODE": counts_mode,
+        "JOB_COUNTS_EVENTHUB_NAME": COUNTS_EVENTHUB_NAME,
+        "AzureWebJobsStorage": STORAGE_CONN_STR,
+        "API_KEY": "harness-key",
+        "SEOUL_API_BASE_URL": api_base_url,
+        "GG_API_BASE_URL": f"{api_base_url}/GGJOBABARECRUSTM",
+        "EVENTHUB_CONNECTION": EVENTHUB_CONN_STR,      # 서울 blob_to_eventhub
+        "EVENTHUB_CONN_STR": EVENTHUB_CONN_STR,        # 경기 blob_to_asa
+        "EVENTHUB_NAME": EVENTHUB_NAME,
+    })
+    # 두 앱의 shared_code 는 같은 내용이므로 서울 앱의 것을 함께 씀
+    for path in (GG_APP, SEOUL_APP):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    import blob_to_eventhub
+    import function_app
+    import trig_connect_seoul
+    from shared_code import resource_pool
+    return {
+        'resource_pool': resource_pool,
+        'seoul_main': trig_connect_seoul.main,
+        'seoul_forward': blob_to_eventhub.main,
+        'gg_main': function_app.trig_connect_ggjobs,
+        'gg_forward': function_app.blob_to_asa,
+    }
+
+
+def _install_fakes(resource_pool, store: BlobStore, sink: EventHubSink, counts_sink: EventHubSink) -> None:
+    resource_pool.POOL.clear()
+    resource_pool._blob_factory = lambda conn_str: (lambda: FakeBlobServiceClient(store))
+    resource_pool._eventhub_factory = lambda conn_str, name: (
+        lambda: FakeEventHubProducerClient(counts_sink if name == COUNTS_EVENTHUB_NAME else sink))
+
+
+def _forward_new_blobs(apps: dict, store: BlobStore) -> int:
+    """새로 쓴 Blob 중 트리거 경로에 맞는 것을 전송 함수로 넘깁니다. 넘긴 Blob 수를 반환합니다."""
+    forwarded = 0
+    for container, name in store.take_new_blobs():
+        if container == SEOUL_CONTAINER and name.startswith(SEOUL_TRIGGER_PREFIX):
+            forward = apps['seoul_forward']
+        elif container == GG_CONTAINER:
+            forward = apps['gg_forward']
+        else:
+            continue
+        data, _ = store.get(container, name)
+        forward(FakeInputStream(container, name, data))
+        forwarded += 1
+    return forwarded
+
+
+def run(args) -> dict:
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+    store = BlobStore(args.store_dir, args.blob_latency_ms / 1000)
+    sink = EventHubSink(args.store_dir, args.eventhub_latency_ms / 1000)
+    counts_sink = EventHubSink(args.store_dir, args.eventhub_latency_ms / 1000, COUNTS_EVENTHUB_NAME, keep_bodies=True)
+
+    with FakeApiServer(args.seoul_rows, args.gg_rows, args.endless, args.latency_ms / 1000,
+                       args.jitter_ms / 1000, args.error_rate, args.seed) as api:
+        apps = _load_apps(api.base_url, args.delivery, args.job_counts)
+        _install_fakes(apps['resource_pool'], store, sink, counts_sink)
+
+        memory = None
+        if args.trace:
+            from shared_code import tracing
+            memory = tracing.MemoryExporter()
+            tracing.set_tracer(tracing.Tracer([memory]))
+
+        latencies, forwarded = [], 0
+        started = time.perf_counter()
+        for i in range(args.ticks):
+            if args.rate > 0:
+                wait = started + i / args.rate - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+            tick_started = time.perf_counter()
+            sink.tick_started = tick_started
+            if "seoul" in sources:
+                apps['seoul_main'](_Timer())
+            if "gg" in sources:
+                apps['gg_main'](_Timer())
+            if args.trigger_delay_ms and args.delivery == "blob":
+                time.sleep(args.trigger_delay_ms / 1000)    # Blob 트리거가 새 Blob 을 알아채기까지의 지연
+            forwarded += _forward_new_blobs(apps, store)
+            latencies.append(time.perf_counter() - tick_started)
+        elapsed = time.perf_counter() - started
+        api_stats = api.stats()
+
+    report = {
+        'ticks': args.ticks,
+        'sources': sources,
+        'delivery': args.delivery,
+        'elapsed_sec': round(elapsed, 3),
+        'ticks_per_sec': round(args.ticks / elapsed, 2) if elapsed else None,
+        'records_fetched': api_stats['rows'],
+        'records_delivered': sink.records,
+        'records_per_sec': round(sink.records / elapsed, 1) if elapsed else None,
+        'tick_p50_ms': round(_percentile(latencies, 0.50) * 1000, 2),
+        'tick_p99_ms': round(_percentile(latencies, 0.99) * 1000, 2),
+        'tick_max_ms': round(max(latencies) * 1000, 2) if latencies else 0.0,
+        'ingest_to_event_p50_ms': round(_percentile(sink.delays, 0.50) * 1000, 2),
+        'ingest_to_event_p99_ms': round(_percentile(sink.delays, 0.99) * 1000, 2),
+        'api_requests': api_stats['requests'],
+        'api_errors': api_stats['errors'],
+        'api_bytes': api_stats['bytes'],
+        'blob_writes': store.writes,
+        'blob_bytes': store.bytes_written,
+        'blob_reads': store.reads,
+        'blob_read_bytes': store.bytes_read,
+        'blobs_forwarded': forwarded,
+        'eventhub_events': sink.events,
+        'eventhub_batches': sink.batches,
+        'eventhub_bytes': sink.bytes,
+        'eventhub_raw_bytes': sink.raw_bytes,
+    }
+    if args.job_counts != "off":
+        from shared_code import job_counts
+        records = [r for body in counts_sink.bodies for r in job_counts.read_csv(body.decode("utf-8"))]
+        report['job_counts'] = {
+            'mode': args.job_counts,
+            'events': counts_sink.events,
+            'bytes': counts_sink.bytes,
+            'records': len(records),
+            'merged_records': len(job_counts.merge_records(records, by_source=False)),
+            'event_count_total': sum(r['event_count'] for r in records),
+        }
+    if memory is not None:
+        stages = {}
+        for span in memory.spans:
+            stages.setdefault(span.name, []).append(span.duration_ms)
+        report['stages'] = {name: {'count': len(v), 'p50_ms': round(_percentile(v, 0.5), 2),
+                                   'p95_ms': round(_percentile(v, 0.95), 2), 'total_ms': round(sum(v), 1)}
+                            for name, v in stages.items()}
+    return report
+
+
+def print_report(report: dict) -> None:
+    print("\n=== 부하 하네스 결과 ===")
+    print(f"tick {report['ticks']}회 ({', '.join(report['sources'])}, {report['delivery']}) | {report['elapsed_sec']}s | "
+          f"{report['ticks_per_sec']} tick/s")
+    print(f"종단간 처리량     {report['records_per_sec']:>12,.1f} records/s "
+          f"(수집 {report['records_fetched']:,}건 → Event Hub {report['records_delivered']:,}건)")
+    print(f"tick 지연         p50 {report['tick_p50_ms']} ms | p99 {report['tick_p99_ms']} ms | "
+          f"최대 {report['tick_max_ms']} ms")
+    print(f"수집 → 이벤트     p50 {report['ingest_to_event_p50_ms']} ms | p99 {report['ingest_to_event_p99_ms']} ms")
+    print(f"API               요청 {report['api_requests']:,}회 (오류 {report['api_errors']}) | "
+          f"{report['api_bytes']:,} bytes")
+    print(f"Blob              쓰기 {report['blob_writes']:,}회 | {report['blob_bytes']:,} bytes | "
+          f"읽기 {report['blob_reads']:,}회 | {report['blob_read_bytes']:,} bytes | "
+          f"트리거 전송 {report['blobs_forwarded']}개")
+    print(f"Event Hub         이벤트 {report['eventhub_events']:,}개 / 배치 {report['eventhub_batches']:,}개 | "
+          f"{report['eventhub_bytes']:,} bytes"
+          + (f" (압축 전 {report['eventhub_raw_bytes']:,} bytes, "
+             f"{report['eventhub_raw_bytes'] / report['eventhub_bytes']:.1f}배)"
+             if report['eventhub_bytes'] and report['eventhub_raw_bytes'] != report['eventhub_bytes'] else ""))
+    if 'job_counts' in report:
+        c = report['job_counts']
+        print(f"직무 코드 집계     이벤트 {c['events']:,}개 | {c['bytes']:,} bytes | 집계 레코드 {c['records']:,}건 "
+              f"(창 / 코드별로 합치면 {c['merged_records']:,}건) | event_count 합계 {c['event_count_total']:,}")
+    if 'stages' in report:
+        print(f"\n{'단계(span)':<40} {'count':>7} {'p50 ms':>10} {'p95 ms':>10} {'total ms':>12}")
+        for name, s in sorted(report['stages'].items(), key=lambda kv: -kv[1]['total_ms']):
+            print(f"{name:<40} {s['count']:>7} {s['p50_ms']:>10.2f} {s['p95_ms']:>10.2f} {s['total_ms']:>12.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=100, help="실행할 tick 수")
+    parser.add_argument("--rate", type=float, default=0.0, help="초당 tick 수 (0 이면 쉬지 않고 실행)")
+    parser.add_argument("--sources", default="seoul,gg", help="돌릴 수집 타이머 (seoul,gg)")
+    parser.add_argument("--seoul-rows", type=int, default=5000, help="가짜 GetJobInfo 전체 건수")
+    parser.add_argument("--gg-rows", type=int, default=5000, help="가짜 GGJOBABARECRUSTM 전체 건수")
+    parser.add_argument("--endless", action="store_true", help="서울 API 가 끝없이 새 레코드를 주도록 (코퍼스 반복)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="API 응답 기본 지연")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="API 응답 지연에 더할 0~N ms 임의 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="API 가 503 을 돌려줄 확률")
+    parser.add_argument("--eventhub-latency-ms", type=float, default=0.0, help="send_batch 한 번의 지연")
+    parser.add_argument("--blob-latency-ms", type=float, default=0.0, help="Blob 쓰기 한 번의 지연")
+    parser.add_argument("--delivery", choices=["blob", "direct"], default="blob",
+                        help="blob: Blob 트리거가 전송(기존) / direct: 타이머가 바로 전송하고 보관본은 백그라운드 업로드")
+    parser.add_argument("--job-counts", choices=["off", "both", "only"], default="off",
+                        help="JOB_COUNTS_MODE - 직무 코드별 집계 레코드를 따로 보냄 (only: 원본 행은 보관본만)")
+    parser.add_argument("--trigger-delay-ms", type=float, default=0.0,
+                        help="blob 경로에서 Blob 트리거가 새 Blob 을 알아채기까지의 지연 (tick 마다 한 번)")
+    parser.add_argument("--store-dir", help="쓴 Blob / 보낸 이벤트를 이 디렉터리에 파일로도 남김")
+    parser.add_argument("--trace", action="store_true", help="단계별 span 소요 시간도 출력")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="결과를 이 경로에 JSON 으로 저장")
+    parser.add_argument("--verbose", action="store_true", help="함수 로그(INFO) 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR, format="%(message)s")
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,277 +1,46 @@
+import time
+_LOAD_STARTED = time.perf_counter()     # 모듈 로드(콜드 스타트) 시간 - 파일 끝에서 로그
+
 import azure.functions as func
+import importlib
 import logging
-import requests
-import pandas as pd
-import json
 import os
 import io
-from azure.storage.blob import BlobServiceClient
-from azure.eventhub import EventHubProducerClient, EventData
 from datetime import datetime
-import time
-import numpy as np
-import re
-from pytz import timezone
+from zoneinfo import ZoneInfo
+# 모듈 로드 시에는 가벼운 공용 모듈만 import (azure.storage.blob / azure.eventhub 는 클라이언트를 처음 만들 때)
+# pandas / NumPy / requests 를 쓰는 수집·전처리 모듈은 그 모듈이 필요한 트리거가 처음 실행될 때 import:
+#   - blob_to_asa          : 추가 import 없음 (resource_pool + eventhub_sink 만)
+#   - trig_connect_ggjobs  : shared_code.gg_jobs, dedupe_index, job_counts, factorize_map
+#   - trig_ingest_all      : shared_code.ingest_engine + INGEST_SOURCES 의 어댑터 모듈
+# 트리거별 콜드 스타트 import 시간은 benchmarks/bench_startup.py 로 측정 (-X importtime)
+from shared_code import resource_pool, eventhub_sink, parquet_sink, tracing, delivery, raw_archive, compaction, blob_layout
 
 
 app = func.FunctionApp()  # ✅ 최신 구조에서 필수
 
 # 환경 변수 (local.settings.json 또는 Application Settings)
-API_KEY = os.getenv("API_KEY")
-BASE_URL = "https://openapi.gg.go.kr/GGJOBABARECRUSTM"
+# (API 호출 / 전처리 로직과 관련 설정은 shared_code/gg_jobs.py 에 있습니다)
 STORAGE_CONN_STR = os.getenv("AzureWebJobsStorage")
 EVENTHUB_CONN_STR = os.getenv("EVENTHUB_CONN_STR")
 # EVENTHUB_NAME = os.getenv("EVENTHUB_NAME", "events-job")
 EVENTHUB_NAME = os.getenv("EVENTHUB_NAME")
+KST = ZoneInfo("Asia/Seoul")    # 파일명 타임스탬프 (pytz 대신 표준 라이브러리 zoneinfo)
 
-# 요청 당 호출할 공고 수
-size_per_req = 200
-
-
-# ================================================
-# 전처리 함수
-# ================================================
-
-# 급여조건 분리
-def parse_salary(salary_text: str):
-    # 아예 비어있는 경우 공고확인
-    if pd.isna(salary_text):
-        return pd.Series([None, "공고확인"])
-
-    text = str(salary_text).strip()
-
-    # 1️⃣ 단위 인식
-    if "시급" in text:
-        unit = "시급"
-    elif "일급" in text:
-        unit = "일급"
-    elif "월급" in text:
-        unit = "월급"
-    elif "연봉" in text:
-        unit = "연봉"
-    elif "내규" in text:
-        unit = "내규"
-    else:
-        unit = "연봉"
-        # 조건 추가해야할 수도?
-
-    # 2️⃣ 숫자 추출
-    nums = re.findall(r"\d+", text)
-    nums = [int(n) for n in nums]
-
-    if not nums:
-        # 숫자가 없는 경우 (회사내규 등)
-        return pd.Series([np.nan, unit])
-
-    # 3️⃣ 금액 계산 로직
-    if "~" in text:
-        # 범위인 경우 -> 평균값(중위값)
-        value = np.mean(nums)
-    elif "이하" in text:
-        # 이하 -> 최대값
-        value = max(nums)
-    elif "이상" in text or "초과" in text:
-        # 이상/초과 -> 최소값
-        value = min(nums)
-    else:
-        # 단일 금액
-        value = nums[0]
-
-    # # 4️⃣ 단위 변환 (원 -> 만원)
-    # if "원" in text and "만원" not in text:
-    #     value = value / 10000  # 원 -> 만원
-
-    # 4️⃣ 단위 변환 (만원 -> 원)
-    if "만원" in text:
-        value = value * 10000  # 원 -> 만원
-
-    return pd.Series([round(value, 1), unit])
-
-
-# 근무지역 분리, "경기" 삽입
-def split_region(region_text):
-    # None 또는 NaN 처리
-    if pd.isna(region_text) or str(region_text).strip().lower() == "none":
-        # region1~region5 모두 None으로 반환
-        return pd.Series([None]*5, index=[f"REGION{i+1}" for i in range(5)])
-
-    # 쉼표 기준 분리 -> 공백 제거
-    regions = [r.strip() for r in str(region_text).split(',') if r.strip()]
-
-    processed = []
-    for r in regions:
-        if r.startswith(("전국", "서울", "인천", "경기", "강원", "충북", "충남", "대전", "세종"
-                         , "경북", "경남", "대구", "부산", "울산", "전북", "전남", "광주광", "제주")) or r==None:
-            processed.append(r)
-        else:
-            processed.append(f"경기 {r}")
-
-    # 최대 5개까지 맞추기 (부족하면 None)
-    while len(processed) < 5:
-        processed.append(None)
-    return pd.Series(processed[:5], index=[f"REGION{i+1}" for i in range(5)])
-
-
-
-# 근무지역 분리 x, "경기" 삽입
-def add_gg_region(region_text):
-    # None 또는 NaN이면 그대로 반환
-    if pd.isna(region_text) or str(region_text).strip().lower() == "none":
-        return None
-
-    # 쉼표 기준 분리 후 공백 제거
-    regions = [r.strip() for r in str(region_text).split(',') if r.strip()]
-
-    # 각 지역 앞에 접두어 추가
-    processed = []
-    for r in regions:
-        if r.startswith(("전국", "서울", "인천", "경기", "강원", "충북", "충남", "대전", "세종"
-                         , "경북", "경남", "대구", "부산", "울산", "전북", "전남", "광주광", "제주")) or r==None:
-            processed.append(r)               # 서울, 인천 등은 그대로
-        else:
-            processed.append(f"경기 {r}")     # 나머지는 '경기 ' 붙이기
-
-    # 다시 쉼표로 묶어 하나의 문자열로 반환
-    return ", ".join(processed)
-
-
-#  학력 none일 경우 0으로 일괄 채움
-def acdmcr_nan(acdmcr_text):
-    if acdmcr_text == None:
-        return 0
-    else: return acdmcr_text
-    
-
-# 경력구분 단순화 - 1: 무관, 2: 신입, 3: 경력, 4: 신입/경력 -> 1, 2, 4: 신입, 3: 경력
-def career_NE(career_text):
-    if pd.isna(career_text):
-        return None
-
-    s = str(career_text).strip()
-
-    # 숫자토큰 모두 추출 (예: "03,04" -> ["03","04"])
-    tokens = re.findall(r'\d+', s)
-
-    # 앞의 0 제거하여 정규화 (예: "03" -> "3")
-    codes = {str(int(t)) for t in tokens}
-
-    if '3' in codes:
-        return '경력'
-    if {'1','2','4'} & codes:
-        return '경력 무관'
-    return None
-
-
-# 직업코드 공란 처리
-def recruit_na(recruit_text):
-    if pd.isna(recruit_text):
-        return '999999'
-    else:
-        return recruit_text
-
-
-# 경력코드 4자리로 자름
-def career_4(career_text):
-    return career_text[:4]
-
-
-# 각 유형(일급 월급 연봉)별 급여값을 월급으로 환산
-def cal_wage_value_monthly(value: int, unit: str):
-    if unit == "시급":
-        return str(value * 209)
-    elif unit == "일급":
-        return str(value * 20)
-    elif unit == "월급":
-        return str(value)
-    elif unit == "연봉":
-        return str(round(value/12, 2))
-    else:
-        return None
+# 통합 수집 엔진 - INGEST_SOURCES 에 적은 소스(예: "gg,seoul")를 trig_ingest_all 한 번의 실행에서 함께 수집
+# (설정하지 않으면 trig_ingest_all 은 등록되지 않음. 소스별 기존 타이머와 커서/lease 를 공유하므로 겹쳐도 같은 범위를
+#  두 번 수집하지는 않지만, 켤 때는 기존 타이머를 꺼 두는 편이 호출 수가 적음)
+# seoul 소스는 SEOUL_API_KEY / SEOUL_STORAGE_CONN_STR 로 서울 앱의 키와 스토리지를 지정 (서울 blob_to_eventhub 가 전송)
+INGEST_SOURCES = [s.strip() for s in os.getenv("INGEST_SOURCES", "").split(",") if s.strip()]
+INGEST_ADAPTERS = {     # 소스 이름 -> (모듈, 어댑터 클래스). 모듈은 trig_ingest_all 이 처음 실행될 때 import
+    "gg": ("shared_code.gg_jobs", "GyeonggiJobsAdapter"),
+    "seoul": ("shared_code.seoul_jobs", "SeoulJobsAdapter"),
+}
 
 
-
-# ================================================
-# 전처리 진행부
-# ================================================
-def preprocess_jobs(raw_jobs):
-    df = pd.DataFrame(raw_jobs)
-
-    df[["SALARY_KRW", "SALARY_UNIT"]] = df["SALARY_COND"].apply(parse_salary)       # 급여조건 분리
-    df["ACDMCR_nonNULL"] = df["ACDMCR_CD_NM"].apply(acdmcr_nan)                     # 학력조건 공백 -> 0(학력무관)
-    df["CAREER_TYPE"] = df["CAREER_CD_NM"].apply(career_NE)                         # 경력구분 단순화 - 1: 무관, 2: 신입, 3: 경력, 4: 신입/경력 -> 1, 2, 4: 신입, 3: 경력
-    df["RECRUT_FIELD_CD_NM_nonNA"] = df["RECRUT_FIELD_CD_NM"].apply(recruit_na)     # 직업코드 공란 -> 999999
-    df["RECRUT_FIELD_CD_NM_4"] = df["RECRUT_FIELD_CD_NM_nonNA"].apply(career_4)     # 직업코드 4자리로 자름
-    df["REGION_GG"] = df["WORK_REGION_CONT"].apply(add_gg_region)                   # 근무지역 -> 분리x, 앞에 '경기'만 삽입
-    region_cols = df["WORK_REGION_CONT"].apply(split_region)                        # 근무지역 -> 분리, 앞에 '경기'만 삽입
-    df = pd.concat([df, region_cols], axis=1)
-    df["wage_value_monthly"]=df.apply(lambda row: cal_wage_value_monthly(row["SALARY_KRW"], row["SALARY_UNIT"]), axis=1)
-
-
-    df_filtered = df[['ENTRPRS_NM', 'PBANC_CONT', 'SALARY_UNIT', 'SALARY_KRW', 
-                      'REGION1', 'CAREER_TYPE', 'RECRUT_FIELD_CD_NM_4', 
-                      'RECRUT_FIELD_NM', 'CAREER_CD_NM', 'ACDMCR_nonNULL', 'wage_value_monthly']]
-
-    Index_df_filtered = ['company', 'job_title', 'wage_type', 'wage_value_krw', 
-                    'region', 'career', 'RCRIT_JSSFC_CMMN_CODE_SE', 
-                    'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE', 'wage_value_monthly']
-
-
-    return df_filtered, Index_df_filtered
-    # return df
-
-
-# ================================================
-# API 호출 함수(chunk size, )
-# ================================================
-def fetch_jobs(size: int, pageIdx: int):
-
-
-    page_idx = pageIdx
-    PAGE_SIZE = size
-
-    params = {
-        "KEY": API_KEY,
-        "Type": "json",
-        "pIndex": page_idx,
-        "pSize": PAGE_SIZE,
-    }
-    
-    response = requests.get(BASE_URL, params=params)
-    response.encoding = 'utf-8'
-
-    data = response.json()
-    ########### 수정 전
-    # rows = data["GGJOBABARECRUSTM"][1]["row"]  # 실제 데이터 위치
-
-    # df = pd.DataFrame(rows)
-    # print(f"총 수집 건수: {len(df)}")
-
-    # return df
-    ########### 수정 전
-
-    # 🚨 API가 비어 있는 페이지일 경우 방어
-    if "GGJOBABARECRUSTM" not in data or len(data["GGJOBABARECRUSTM"]) < 2:
-        logging.warning(f"[WARN] 페이지 {pageIdx}: 응답에 데이터가 없습니다. 수집 종료.")
-        return pd.DataFrame(), True   # df, is_last=True
-
-    try:
-        rows = data["GGJOBABARECRUSTM"][1].get("row", [])
-    except Exception:
-        logging.warning(f"[WARN] 페이지 {pageIdx}: row 키가 없어서 종료합니다.")
-        return pd.DataFrame(), True
-
-    if not rows:
-        logging.warning(f"[WARN] 페이지 {pageIdx}: row가 비었습니다. 종료합니다.")
-        return pd.DataFrame(), True
-
-    df = pd.DataFrame(rows)
-    logging.info(f"총 수집 건수: {len(df)}")
-
-    # 🔥 마지막 페이지: 요청한 PAGE_SIZE보다 적으면 끝
-    is_last = len(df) < PAGE_SIZE
-
-    return df, is_last
-
+def ingest_adapter(name: str):
+    module, cls = INGEST_ADAPTERS[name]
+    return getattr(importlib.import_module(module), cls)()
 
 
 # ================================================
@@ -279,90 +48,117 @@ def fetch_jobs(size: int, pageIdx: int):
 # ================================================
 def save_to_blob(df):
     # 한국 시간대로 현재 날짜와 시간 가져오기
-    now_korea = datetime.now(timezone('Asia/Seoul'))
+    now_korea = datetime.now(KST)
 
-    blob_service = BlobServiceClient.from_connection_string(STORAGE_CONN_STR)
-    container_client = blob_service.get_container_client("ggjob-data")
     filename = f"ggjobs_{now_korea.strftime('%Y%m%d_%H%M%S')}.json"
     # filename = f"jobs_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
 
     json_bytes = df.to_json(orient="records", force_ascii=False).encode('utf-8')
-    container_client.upload_blob(name=filename, data=io.BytesIO(json_bytes), overwrite=True)
+    resource_pool.with_blob_service(
+        STORAGE_CONN_STR,
+        lambda svc: svc.get_container_client("ggjob-data").upload_blob(name=filename, data=io.BytesIO(json_bytes), overwrite=True)
+    )
     return filename
 
 
-def save_to_blob_csv(df, df_header):
-    now_korea = datetime.now(timezone('Asia/Seoul'))
-
-    blob_service = BlobServiceClient.from_connection_string(STORAGE_CONN_STR)
-    container_client = blob_service.get_container_client("ggjob-data")
+@tracing.traced("gg.save_to_blob_csv", on_result=lambda name: {'blob': name})
+def save_to_blob_csv(df, df_header, suffix: str = None, cursor: int = None):
+    now_korea = datetime.now(KST)
 
-    filename = f"ggjobs_{now_korea.strftime('%Y%m%d_%H%M%S')}.csv"
-    blob_client = container_client.get_blob_client(filename)
+    # 같은 초에 여러 페이지를 저장하는 경우 suffix(예: 페이지 번호)로 파일명 충돌 방지
+    # BLOB_LAYOUT=partitioned 이면 source=gg/date=.../hour=.../ 아래에 쓰고 파티션 manifest 에 기록 (cursor = 페이지)
+    filename = blob_layout.place("", "gg", f"ggjobs_{now_korea.strftime('%Y%m%d_%H%M%S')}{'_' + suffix if suffix else ''}.csv")
     csv_bytes = df.to_csv(index=False, header=df_header, encoding="utf-8-sig").encode("utf-8-sig")
-    blob_client.upload_blob(csv_bytes, overwrite=True)
+    tracing.set_attributes(rows=len(df), **{'payload.bytes': len(csv_bytes)})
+    # 워커 단위로 재사용하는 BlobServiceClient 사용 (연결 오류 시 재생성 후 재시도)
+    resource_pool.with_blob_service(
+        STORAGE_CONN_STR,
+        lambda svc: svc.get_blob_client("ggjob-data", filename).upload_blob(csv_bytes, overwrite=True)
+    )
+    blob_layout.record(STORAGE_CONN_STR, "ggjob-data", filename, len(df), len(csv_bytes), cursor)
     logging.info(f"Blob 업로드 완료: {filename}")
 
     return filename
 
 
-# ================================================
-# Blob을 이용해 현재 페이지 상태를 관리
-# ================================================
-def get_next_page_from_blob(reset: bool = False) -> int | str:
-    """페이지 상태를 Azure Blob Storage에 저장 및 관리"""
-    connection_str = os.environ["AzureWebJobsStorage"]
-    container_name = "function-state"   # 페이지 상태 저장할 컨테이너 이름. 나중에 다른 함수와 합칠 때 조정 필요
-    blob_name = "page_state.txt"        # 페이지 상태 저장할 파일 이름.
+@tracing.traced("gg.save_to_blob_parquet", on_result=lambda name: {'blob': name})
+def save_to_blob_parquet(df, df_header, suffix: str = None, cursor: int = None):
+    now_korea = datetime.now(KST)
 
-    blob_service = BlobServiceClient.from_connection_string(connection_str)
-    container_client = blob_service.get_container_client(container_name)
-    blob_client = container_client.get_blob_client(blob_name)
-
-    # 컨테이너가 없으면 생성
-    try:
-        container_client.create_container()
-    except:
-        pass    # 이미 존재하면 무시
-
-    # === ✅ 재시작 시 초기화 처리 ===
-    if reset:
-        blob_client.upload_blob("1", overwrite=True)
-        logging.info("[RESET] page_state.txt 초기화 → 1로 설정")
-        return 1
-
-    # === 기존 페이지 상태 불러오기 ===
-    try:
-        data = blob_client.download_blob().readall().decode("utf-8").strip()
-
-        # 현재 페이지가 공고의 마지막 페이지일 경우, "END" 리턴
-        if data == "END":
-            logging.info("[INFO] END 상태 감지 → 더 이상 호출하지 않음.")
-            # return "END"
-            return 1
+    # CSV와 같은 헤더, 저카디널리티 컬럼 dictionary 인코딩, PARQUET_COMPRESSION 코덱
+    # (blob_to_asa 는 .csv 만 전송하므로 Parquet 는 Event Hub로 나가지 않음)
+    filename = blob_layout.place("parquet/", "gg",
+                                 f"ggjobs_{now_korea.strftime('%Y%m%d_%H%M%S')}{'_' + suffix if suffix else ''}.parquet")
+    data = parquet_sink.to_parquet_bytes(df, df_header)
+    tracing.set_attributes(rows=len(df), **{'payload.bytes': len(data)})
+    resource_pool.with_blob_service(
+        STORAGE_CONN_STR,
+        lambda svc: svc.get_blob_client("ggjob-data", filename).upload_blob(data, overwrite=True)
+    )
+    blob_layout.record(STORAGE_CONN_STR, "ggjob-data", filename, len(df), len(data), cursor)
+    logging.info(f"Blob 업로드 완료: {filename} ({len(data)} bytes)")
 
-        last_page = int(data)
-    except:
-        last_page = 1   # 처음 실행 시 1부터 시작
+    return filename
 
-    # === 페이지 증가 후 저장 ===
-    next_page = last_page + 1
-    blob_client.upload_blob(str(next_page), overwrite=True)
-    return next_page
 
+# DELIVERY_MODE=direct: blob_to_asa 를 거치지 않고 바로 Event Hub 로 보낸 뒤,
+# 보관본은 ARCHIVE_CONTAINER(blob_to_asa 가 감시하지 않음)에 백그라운드로 올림 -> 보관 파일명 반환
+# (target 이 None 이면 JOB_COUNTS_MODE=only - 원본 행은 보내지 않고 보관본만)
+def deliver_direct(df, df_header, target, suffix: str = None, cursor: int = None):
+    from shared_code.gg_jobs import ARCHIVE_CONTAINER
+
+    if target is not None:
+        stats = delivery.send_frame(*target, df, df_header)
+        logging.info(f"📨 Event Hub 직접 전송: {len(df)}건 | 이벤트 {stats['events']}개"
+                     f"{eventhub_sink.compression_summary(stats)}")
+
+    stamp = f"{datetime.now(KST).strftime('%Y%m%d_%H%M%S')}{'_' + suffix if suffix else ''}"
+    filename = None
+    outputs = []
+    if parquet_sink.writes_parquet():
+        outputs.append((blob_layout.place("parquet/", "gg", f"ggjobs_{stamp}.parquet"),
+                        parquet_sink.to_parquet_bytes(df, df_header)))
+    if parquet_sink.writes_csv():
+        outputs.append((blob_layout.place("", "gg", f"ggjobs_{stamp}.csv"),
+                        df.to_csv(index=False, header=df_header, encoding="utf-8-sig").encode("utf-8-sig")))
+    for filename, data in outputs:
+        delivery.ARCHIVE.submit(STORAGE_CONN_STR, ARCHIVE_CONTAINER, filename, data, create_container=True,
+                                after=lambda n=filename, size=len(data): blob_layout.record(
+                                    STORAGE_CONN_STR, ARCHIVE_CONTAINER, n, len(df), size, cursor))
+    return filename
 
 
-def save_end_state():
-    """Blob에 END 기록"""
-    connection_str = os.environ["AzureWebJobsStorage"]
-    container_name = "function-state"
-    blob_name = "page_state.txt"
+# OUTPUT_FORMAT(csv | parquet | both)에 맞춰 저장 -> CSV 파일명 반환 (CSV를 안 쓰면 Parquet 파일명)
+def save_outputs(df, df_header, suffix: str = None, cursor: int = None):
+    from shared_code import job_counts
+    from shared_code.gg_jobs import eventhub_target
+
+    target = eventhub_target() if delivery.is_direct() and job_counts.streams_raw() else None
+    if target is not None or not job_counts.streams_raw():
+        return deliver_direct(df, df_header, target, suffix, cursor)
+    if delivery.is_direct():
+        logging.warning("[WARN] DELIVERY_MODE=direct 이지만 EVENTHUB_CONN_STR / EVENTHUB_NAME 이 없어 Blob 경로로 전송합니다.")
+
+    filename = None
+    if parquet_sink.writes_parquet():
+        filename = save_to_blob_parquet(df, df_header, suffix, cursor)
+    if parquet_sink.writes_csv():
+        filename = save_to_blob_csv(df, df_header, suffix, cursor)
+    if parquet_sink.OUTPUT_FORMAT == "both":
+        logging.info(f"📦 CSV vs Parquet 비교: {parquet_sink.compare_with_csv(df, df_header)}")
+    return filename
 
-    blob_service = BlobServiceClient.from_connection_string(connection_str)
-    container_client = blob_service.get_container_client(container_name)
-    blob_client = container_client.get_blob_client(blob_name)
 
-    blob_client.upload_blob("END", overwrite=True)
+# ================================================
+# Blob을 이용해 현재 페이지 상태를 관리
+# ================================================
+# function-state/page_cursor.json 에 다음에 요청할 페이지를 저장 (ETag 조건부 쓰기 + lease, shared_code/cursor_store.py)
+#   - 실행이 겹치거나 인스턴스가 늘어나도 lease 를 잡은 실행만 수집, 나머지는 건너뜀
+#   - 새 워커가 떠도 커서를 초기화하지 않음 (처음 한 번만 page_state.txt 에서 이어받음)
+#   - 수집/저장이 끝난 뒤에만 다음 페이지를 기록 (실패하면 같은 페이지를 다시 요청)
+def get_page_cursor():
+    from shared_code.gg_jobs import get_page_cursor_store
+    return get_page_cursor_store(STORAGE_CONN_STR)
 
 
 # ================================================
@@ -370,29 +166,22 @@ def save_end_state():
 # ================================================
 def send_to_eventhub(df, page_index: int):
     """
-    매 분마다 생성된 DataFrame 전체를 CSV 문자열로 변환해
-    하나의 Event로 Event Hub에 전송한다.
+    매 분마다 생성된 DataFrame 전체를 CSV 문자열로 변환해 Event Hub에 전송한다.
+    (EVENTHUB_SEND_MODE=whole(기본)이면 하나의 Event, split 이면 행 단위로 나눈 여러 Event)
     """
-    producer = EventHubProducerClient.from_connection_string(
-        conn_str=EVENTHUB_CONN_STR,
-        eventhub_name=EVENTHUB_NAME
-    )
-
     # === 1️⃣ DataFrame → CSV 문자열 변환 ===
     csv_buffer = io.StringIO()
     df.to_csv(csv_buffer, index=False, encoding="utf-8-sig")
     csv_string = csv_buffer.getvalue()
 
-    # === 3️⃣ EventData 생성 ===
-    event = EventData(csv_string)
-
-    # === 4️⃣ Event Hub로 전송 ===
-    with producer:
-        batch = producer.create_batch()
-        batch.add(event)
-        producer.send_batch(batch)
+    # === 3️⃣ Event Hub로 전송 (Producer는 워커 단위로 재사용하므로 닫지 않음) ===
+    stats = resource_pool.with_eventhub_producer(
+        EVENTHUB_CONN_STR, EVENTHUB_NAME, lambda producer: eventhub_sink.send_csv(producer, csv_string)
+    )
 
-    logging.info(f"✅ EventHub 전송 완료 | 페이지 {page_index} | {len(df)}건 | {len(csv_string)} bytes")
+    logging.info(f"✅ EventHub 전송 완료 | 페이지 {page_index} | {len(df)}건 | {len(csv_string)} bytes"
+                 f" | 이벤트 {stats['events']}개 / 배치 {stats['batches']}개"
+                 f"{eventhub_sink.compression_summary(stats)}")
 
 
 
@@ -407,48 +196,163 @@ def send_to_eventhub(df, page_index: int):
               run_on_startup=False, 
               use_monitor=True)
 def trig_connect_ggjobs(mytimer: func.TimerRequest):
-    try:
-        # ✅ 함수 처음 시작(run_on_startup 실행 시) → reset=True로 초기화
-        # 이후 매 분 주기 실행에서는 reset=False로 동작
-        reset_flag = getattr(trig_connect_ggjobs, "_initialized", False) is False
-        trig_connect_ggjobs._initialized = True
-
-        page = get_next_page_from_blob(reset=reset_flag)
+    from shared_code import job_counts, factorize_map
+    from shared_code.gg_jobs import FETCH_WORKERS, fetch_page, get_api_session, plan_page, save_sizer
 
-        # END 상태면 함수 종료  ->  END 상태(공고 마지막 페이지에 다다른 상태)이면 첫 페이지로 이동, 재호출
-        if page == "END":
-            # logging.info("[STOP] 더 이상 수집할 페이지가 없어 함수 종료.")
-            logging.info("[INFO] go to taecho village")
-            # return
-            page = 1
+    store = get_page_cursor()
+    claim, sizer, page = None, None, None
+    try:
+        claim = store.claim()
+        if claim is None:
+            return      # 다른 실행이 수집 중
+
+        # 페이지 번호는 상태에 저장된 페이지 크기 단위 (ADAPTIVE_SIZE=1 이면 API 응답 속도에 맞춰 크기 조절)
+        page, size, sizer = plan_page(claim)
+
+        # JOB_COUNTS_MODE=both|only: 이번 실행에서 저장한 모든 페이지의 직무 코드별 건수를 합쳐 커서 저장 전에 전송
+        counts = job_counts.JobCounts() if job_counts.is_enabled() else None
+
+        if FETCH_WORKERS > 1:
+            next_page = collect_pages_parallel(page, size, sizer, counts, claim)
+            save_sizer(claim, sizer)
+            if counts is not None:
+                job_counts.send(counts)
+            store.commit(claim, next_page)
+            return
 
-        logging.info(f"API 호출 중... (페이지 {page})")
+        logging.info(f"API 호출 중... (페이지 {page}, {size}건 단위)")
 
         # API 요청
-        raw_jobs, is_last = fetch_jobs(size_per_req, page)
+        raw_jobs, is_last = fetch_page(size, page, get_api_session(), sizer=sizer, claim=claim)
+        save_sizer(claim, sizer)
 
         if raw_jobs.empty:
-            logging.info("[STOP] 빈 페이지 수신 → 데이터 수집 종료")
-            save_end_state()
+            # 마지막 페이지를 지나면 첫 페이지로 이동, 재호출
+            logging.info("[STOP] 빈 페이지 수신 → 다음 실행은 1 페이지부터")
+            store.commit(claim, 1)
             return
 
-        # 데이터 전처리
-        logging.info("데이터 전처리 중...")
-        df, header = preprocess_jobs(raw_jobs)
-
-        # Blob 저장
-        logging.info("Blob 저장 중...")
-        filename = save_to_blob_csv(df, header)
+        # 데이터 전처리 + (중복 제거) + Blob 저장
+        count, filename = process_and_save(raw_jobs, counts=counts, cursor=page)
+        if counts is not None:
+            job_counts.send(counts)
 
-        logging.info(f"성공적으로 {len(df)}건 처리 완료 | Blob 파일: {filename}")
+        logging.info(f"성공적으로 {count}건 처리 완료 | Blob 파일: {filename}")
 
-        # 마지막 페이지이면 END 기록
+        # 마지막 페이지이면 다음 실행은 1 페이지부터
         if is_last:
-            save_end_state()
-            logging.info("[STOP] 마지막 페이지 감지 → END 기록 후 종료")
+            logging.info("[STOP] 마지막 페이지 감지 → 다음 실행은 1 페이지부터")
+        store.commit(claim, 1 if is_last else page + 1)
 
     except Exception as e:
         logging.exception("에러 발생")
+    finally:
+        if claim is not None and 'sizer' not in claim.fields:
+            save_sizer(claim, sizer)    # 요청 실패도 학습값에 반영
+        store.release(claim)    # commit 하지 못했으면 lease 만 해제
+        raw_archive.flush(STORAGE_CONN_STR, "gg", page, claim)     # RAW_ARCHIVE=1: 커서가 지나간 페이지의 원본 응답만 보관
+        delivery.drain_archive()    # direct 모드의 보관본 업로드가 끝날 때까지
+
+    logging.info(f"♻️ 리소스 풀 재사용 통계: {resource_pool.stats()}")
+    factorize_map.log_stats()   # PREPROCESS_ENGINE=factorized 일 때만 출력
+
+
+# 전처리 → (DEDUPE_ENABLED 이면 새/변경 행만) → CSV 저장. 반환: (저장 건수, 파일명 또는 None)
+# counts(job_counts.JobCounts)를 주면 저장한 행을 직무 코드별로 집계해 더함, cursor(페이지)는 파티션 manifest 에 기록
+def process_and_save(raw_jobs, suffix: str = None, counts=None, cursor: int = None):
+    from shared_code import dedupe_index
+    from shared_code.gg_jobs import STATE_CONTAINER, DEDUPE_BLOB_NAME, DEDUPE_KEY_COLUMNS, preprocess_jobs
+
+    logging.info("데이터 전처리 중...")
+    df, header = preprocess_jobs(raw_jobs)
+
+    if not dedupe_index.DEDUPE_ENABLED:
+        logging.info("Blob 저장 중...")
+        filename = save_outputs(df, header, suffix, cursor)
+        if counts is not None:
+            counts.add_frame(df, "gg", header)
+        return len(df), filename
+
+    dedupe = dedupe_index.load_index(STORAGE_CONN_STR, DEDUPE_BLOB_NAME, STATE_CONTAINER)
+    df, pending = dedupe.filter_new(df, DEDUPE_KEY_COLUMNS)
+    logging.info(f"🧬 중복 제거: 새/변경 {len(df)}건 | 누적 {dedupe.stats()}")
+    if df.empty:
+        return 0, None
+
+    logging.info("Blob 저장 중...")
+    filename = save_outputs(df, header, suffix, cursor)
+    if counts is not None:
+        counts.add_frame(df, "gg", header)
+    dedupe.commit(pending)      # 업로드가 끝난 행만 인덱스에 반영
+    dedupe_index.save_index(dedupe)
+    return len(df), filename
+
+
+# 병렬 모드: 시간 예산 안에서 여러 페이지를 수집해 페이지별 CSV로 저장 -> 다음에 요청할 페이지 반환
+# 저장하다 실패하면 그 페이지를 반환 (이미 저장한 앞 페이지는 커서를 넘겨 다시 올리지 않음)
+def collect_pages_parallel(start_page: int, size: int, sizer=None, counts=None, claim=None) -> int:
+    from shared_code.gg_jobs import FETCH_WORKERS, fetch_jobs_parallel
+
+    logging.info(f"API 병렬 호출 중... (시작 페이지 {start_page}, {size}건 단위, 동시 {FETCH_WORKERS}개)")
+    pages, is_last = fetch_jobs_parallel(size, start_page, sizer=sizer, claim=claim)
+
+    for i, (p, raw_jobs) in enumerate(pages):
+        try:
+            count, filename = process_and_save(raw_jobs, suffix=f"p{p}", counts=counts, cursor=p)
+        except Exception:
+            logging.exception(f"페이지 {p} 저장 실패 → 다음 실행은 {p} 페이지부터 (저장한 {i} 페이지는 다시 올리지 않음)")
+            return p
+        logging.info(f"페이지 {p}: {count}건 처리 완료 | Blob 파일: {filename}")
+
+    logging.info(f"성공적으로 {len(pages)} 페이지 / {sum(len(d) for _, d in pages)}건 처리 완료")
+
+    if is_last:
+        logging.info("[STOP] 마지막 페이지 감지 → 다음 실행은 1 페이지부터")
+        return 1
+    # 연속으로 성공한 마지막 페이지 다음부터 (하나도 못 받았으면 start_page 를 다시 시도)
+    return pages[-1][0] + 1 if pages else start_page
+
+
+# ================================================
+# 통합 수집 (Timer Trigger) - 여러 소스를 한 번의 실행에서 동시에 수집
+# ================================================
+# 소스별 커서는 function-state/ingest/{소스}.json, 처음에는 기존 상태(page_state.txt 등)에서 이어받음
+if INGEST_SOURCES:
+    @app.schedule(schedule="0 */1 * * * *",
+                  arg_name="mytimer",
+                  run_on_startup=False,
+                  use_monitor=True)
+    def trig_ingest_all(mytimer: func.TimerRequest):
+        from shared_code import ingest_engine, factorize_map
+
+        unknown = [name for name in INGEST_SOURCES if name not in INGEST_ADAPTERS]
+        if unknown:
+            logging.warning(f"[WARN] 알 수 없는 수집 소스 무시: {unknown}")
+
+        adapters = [ingest_adapter(name) for name in INGEST_SOURCES if name in INGEST_ADAPTERS]
+        results = ingest_engine.IngestEngine(adapters, STORAGE_CONN_STR).run_once()
+
+        logging.info(f"통합 수집 완료 | {sum(r['saved'] for r in results)}건 저장 | "
+                     f"실패 소스 {[r['source'] for r in results if r['error']]}")
+        logging.info(f"♻️ 리소스 풀 재사용 통계: {resource_pool.stats()}")
+        factorize_map.log_stats()
+
+
+# ================================================
+# tick CSV 압축 (Timer Trigger, 매시 15분) - COMPACTION=1 일 때만 등록
+# ================================================
+# ggjob-data (+ GG_ARCHIVE_CONTAINER) 의 ggjobs_*.csv 를 닫힌 시간(COMPACT_GRAIN=day 면 일) 단위로 COMPACT_CONTAINER 에 합치고
+# manifest 를 남김. 결과는 blob_to_asa 가 감시하지 않는 컨테이너에만 씀 (shared_code/compaction.py)
+if compaction.COMPACTION:
+    @app.schedule(schedule="0 15 * * * *",
+                  arg_name="mytimer",
+                  run_on_startup=False,
+                  use_monitor=True)
+    def trig_compact_ggjobs(mytimer: func.TimerRequest):
+        try:
+            compaction.run(STORAGE_CONN_STR, "gg")
+        except Exception:
+            logging.exception("❌ tick CSV 압축 실패 (다음 실행에서 같은 구간부터 다시 합침)")
 
 
 # ================================================
@@ -458,8 +362,6 @@ def trig_connect_ggjobs(mytimer: func.TimerRequest):
                   path="ggjob-data/{name}",
                   connection="AzureWebJobsStorage")
 def blob_to_asa(myblob: func.InputStream):
-    from azure.eventhub import EventHubProducerClient, EventData
-
     logging.info(f"Blob Trigger 실행됨: {myblob.name} ({myblob.length} bytes)")
 
     # 🔥 JSON 등 CSV가 아니면 무시!
@@ -467,23 +369,24 @@ def blob_to_asa(myblob: func.InputStream):
         logging.info(f"⚠️ CSV 파일이 아니라 무시합니다: {myblob.name}")
         return
 
-    try:
-        blob_bytes = myblob.read()
-        blob_str = blob_bytes.decode('utf-8-sig')  # BOM 제거
+    eventhub_conn = os.getenv("EVENTHUB_CONN_STR")
+    eventhub_name = os.getenv("EVENTHUB_NAME")
 
-        logging.info("CSV 원본 읽기 완료")
-
-        producer = EventHubProducerClient.from_connection_string(
-            conn_str=os.getenv("EVENTHUB_CONN_STR"),
-            eventhub_name=os.getenv("EVENTHUB_NAME")
-        )
-
-        with producer:
-            batch = producer.create_batch()
-            batch.add(EventData(blob_str))
-            producer.send_batch(batch)
+    try:
+        # 파일 전체를 read().decode() 하지 않고 bytes 그대로 전송 (BOM 제거)
+        # 기본은 파일 전체 1건 / EVENTHUB_SEND_MODE=split 이면 스트림을 조금씩 읽어 행 경계로 자르고,
+        # 이벤트마다 헤더 반복, 배치 최대 크기까지 채워 전송 (메모리가 파일 크기가 아니라 배치 크기로 묶임)
+        # EVENTHUB_COMPRESSION=gzip 이면 압축 후 크기 기준으로 묶어 보냄 (ASA 입력의 이벤트 압축 형식도 GZip 으로)
+        producer = resource_pool.eventhub_producer(eventhub_conn, eventhub_name)
+        stats = eventhub_sink.send_csv_stream(producer, myblob, strip_bom=True)
 
-        logging.info(f"CSV 파일 {myblob.name} EventHub로 전송 완료")
+        logging.info(f"CSV 파일 {myblob.name} EventHub로 전송 완료 (이벤트 {stats['events']}개 / 배치 {stats['batches']}개)"
+                     f"{eventhub_sink.compression_summary(stats)}")
 
     except Exception as e:
         logging.exception(f"Blob 처리 중 오류 발생: {e}")
+        resource_pool.invalidate_eventhub_producer(eventhub_conn, eventhub_name)   # 다음 실행에서 Producer 재생성
+
+
+logging.info(f"🚀 function_app 로드 {(time.perf_counter() - _LOAD_STARTED) * 1000:.1f} ms "
+             f"(수집 / 전처리 모듈은 트리거 첫 실행 때 import)")
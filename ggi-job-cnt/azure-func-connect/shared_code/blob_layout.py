@@ -0,0 +1,349 @@
+"""시간 파티션 Blob 이름(source=/date=/hour=)과 파티션별 manifest 색인.
+
+지금까지 결과 파일 이름은 평평해서(경기 컨테이너 루트의 ggjobs_YYYYMMDD_HHMMSS.csv, 서울 data/all_jobs/seoul_jobs_...)
+특정 시간대의 파일을 찾으려면 컨테이너 전체를 나열해야 했습니다.
+
+BLOB_LAYOUT=partitioned 이면 (기본 flat 은 기존 이름 그대로)
+- 결과 파일(CSV / Parquet / direct 모드 보관본)을 기존 경로 아래 source={소스}/date=YYYY-MM-DD/hour=HH/ (KST, 쓴 시각)에 씁니다.
+  Blob 트리거 경로(서울 data/all_jobs/, 경기 ggjob-data) 아래이므로 blob_to_eventhub / blob_to_asa 는 그대로 전송합니다.
+- 파일을 다 쓴 뒤 BLOB_INDEX_CONTAINER/source=.../date=.../hour=.../manifest.json 에 항목을 더합니다.
+  (파일 목록 / 형식별 행 수 / 최소·최대 커서. ETag 조건부 쓰기, 웜 워커는 직전에 쓴 manifest 로 GET 생략)
+  manifest 는 Blob 트리거가 감시하지 않는 색인 컨테이너에 두므로 Event Hub 로 나가지 않습니다.
+- manifest 쓰기에 실패해도 결과 파일과 커서는 그대로 둡니다. (경고만 남기고, migrate 로 다시 만들 수 있음)
+
+읽는 쪽은 resolve(source, since, until) 로 시간대의 manifest 를 시간당 GET 한 번씩 읽어 파일 목록을 얻습니다. (나열 없음)
+기존 평평한 Blob 은 migrate 가 마지막 수정 시각(KST) 파티션의 manifest 에 색인합니다. --move 를 주면
+Blob 트리거가 감시하지 않는 곳(서울 data/archive/ · data/parquet/, 경기 보관본 컨테이너)의 파일은 파티션 이름으로 옮기고,
+감시 경로의 파일은 옮기면 다시 전송되므로 제자리에 둔 채 색인만 합니다.
+    cd ggi-job-cnt/azure-func-connect
+    python -m shared_code.blob_layout resolve --source gg --since 2026-10-01T09 --until 2026-10-01T11
+    python -m shared_code.blob_layout migrate --source gg --move
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from shared_code import resource_pool, tracing
+
+BLOB_LAYOUT = os.getenv("BLOB_LAYOUT", "flat").lower()                           # "flat"(기존) | "partitioned"
+BLOB_INDEX_CONTAINER = os.getenv("BLOB_INDEX_CONTAINER", "blob-index")          # manifest 컨테이너 (Blob 트리거 감시 밖)
+BLOB_INDEX_WORKERS = int(os.getenv("BLOB_INDEX_WORKERS", "8"))                  # resolve / migrate 동시 요청 수
+MANIFEST_NAME = "manifest.json"
+MANIFEST_RETRIES = 5            # 다른 실행과 동시에 같은 manifest 를 고칠 때 다시 시도할 횟수
+KST = ZoneInfo("Asia/Seoul")
+
+_PARTITION = re.compile(r"source=([^/]+)/date=(\d{4}-\d{2}-\d{2})/hour=(\d{2})/")
+_CURSOR = {     # 기존 파일 이름에서 커서 꺼내기 (서울 seoul_jobs_{start_index}_..., 경기 ..._p{페이지})
+    "seoul": re.compile(r"seoul_jobs_(\d+)_"),
+    "gg": re.compile(r"_p(\d+)\.\w+$"),
+}
+
+# 소스별 결과 파일 위치 (컨테이너, 경로 접두사, 파일 이름 접두사, Blob 트리거 감시 여부) - migrate 가 나열하는 곳
+# (seoul_jobs.TRIGGER_PREFIX / ARCHIVE_PREFIX, gg_jobs.OUTPUT_CONTAINER / ARCHIVE_CONTAINER 와 같은 값)
+SEOUL_CONTAINER = os.getenv("SEOUL_BLOB_CONTAINER_NAME") or os.getenv("BLOB_CONTAINER_NAME", "seoul-job-ct")
+GG_ARCHIVE_CONTAINER = os.getenv("GG_ARCHIVE_CONTAINER", "ggjob-archive")
+LOCATIONS = {
+    "seoul": [
+        (SEOUL_CONTAINER, "data/all_jobs/", "seoul_jobs_", True),
+        (SEOUL_CONTAINER, "data/archive/", "seoul_jobs_", False),
+        (SEOUL_CONTAINER, "data/parquet/", "seoul_jobs_", False),
+    ],
+    "gg": [
+        ("ggjob-data", "", "ggjobs_", True),
+        ("ggjob-data", "parquet/", "ggjobs_", True),     # blob_to_asa 는 .csv 만 보내지만 옮기면 트리거는 실행됨
+        (GG_ARCHIVE_CONTAINER, "", "ggjobs_", False),
+        (GG_ARCHIVE_CONTAINER, "parquet/", "ggjobs_", False),
+    ],
+}
+
+# 워커 프로세스가 마지막으로 쓴 (manifest, ETag) - 다음 기록에서 GET 을 생략하는 데 사용
+_LAST_WRITTEN = {}
+_LOCK = threading.Lock()
+
+
+def is_partitioned() -> bool:
+    return BLOB_LAYOUT == "partitioned"
+
+
+# =========================================================================
+# === 이름 ===
+# =========================================================================
+def partition(source: str, when: datetime = None) -> str:
+    """"source={소스}/date=YYYY-MM-DD/hour=HH/" (KST)"""
+    when = (when or datetime.now(KST)).astimezone(KST)
+    return f"source={source}/date={when.strftime('%Y-%m-%d')}/hour={when.strftime('%H')}/"
+
+
+def place(prefix: str, source: str, filename: str, when: datetime = None) -> str:
+    """결과 파일의 Blob 이름. partitioned 면 prefix 와 파일 이름 사이에 파티션 경로를 넣습니다."""
+    return f"{prefix}{partition(source, when) if is_partitioned() else ''}{filename}"
+
+
+def parse_partition(name: str):
+    """Blob 이름의 (소스, 날짜, 시) 또는 None(평평한 이름)."""
+    m = _PARTITION.search(name)
+    return (m.group(1), m.group(2), int(m.group(3))) if m else None
+
+
+def manifest_name(source: str, date: str, hour: int) -> str:
+    return f"source={source}/date={date}/hour={hour:02d}/{MANIFEST_NAME}"
+
+
+def _format(name: str) -> str:
+    return name.rsplit(".", 1)[-1].lower()
+
+
+# =========================================================================
+# === manifest 쓰기 ===
+# =========================================================================
+def _empty(source: str, date: str, hour: int) -> dict:
+    return {'source': source, 'date': date, 'hour': hour, 'files': [], 'rows': {}, 'min_cursor': None,
+            'max_cursor': None}
+
+
+def _add_files(manifest: dict, entries: list) -> dict:
+    """entries 를 manifest 에 더하고(같은 컨테이너/이름이면 바꿈) 형식별 행 수와 커서 범위를 다시 계산합니다."""
+    files = {(f['container'], f['name']): f for f in manifest['files']}
+    for entry in entries:
+        files[(entry['container'], entry['name'])] = entry
+    manifest['files'] = sorted(files.values(), key=lambda f: (f['name'], f['container']))
+    rows = {}
+    for f in manifest['files']:
+        if f.get('rows') is not None:
+            rows[f['format']] = rows.get(f['format'], 0) + f['rows']
+    cursors = [f['cursor'] for f in manifest['files'] if isinstance(f.get('cursor'), int)]
+    manifest['rows'] = rows
+    manifest['min_cursor'] = min(cursors) if cursors else None
+    manifest['max_cursor'] = max(cursors) if cursors else None
+    manifest['updated_at'] = datetime.now(KST).isoformat(timespec="seconds")
+    return manifest
+
+
+def _read(conn_str: str, name: str):
+    """(manifest 또는 None, ETag 또는 None)"""
+    from azure.core.exceptions import ResourceNotFoundError
+
+    try:
+        downloader = resource_pool.with_blob_service(
+            conn_str, lambda svc: svc.get_blob_client(BLOB_INDEX_CONTAINER, name).download_blob())
+    except ResourceNotFoundError:
+        return None, None
+    return json.loads(downloader.readall()), downloader.properties.etag
+
+
+def _write(conn_str: str, name: str, manifest: dict, etag: str) -> str:
+    """etag 가 그대로일 때만(없으면 아직 없을 때만) 씁니다. 다른 실행이 먼저 썼으면 ResourceModifiedError / ResourceExistsError"""
+    from azure.core import MatchConditions
+    from azure.core.exceptions import ResourceNotFoundError
+
+    data = json.dumps(manifest, ensure_ascii=False)
+    kwargs = ({'overwrite': True, 'etag': etag, 'match_condition': MatchConditions.IfNotModified} if etag
+              else {'overwrite': False})
+    run = lambda: resource_pool.with_blob_service(
+        conn_str, lambda svc: svc.get_blob_client(BLOB_INDEX_CONTAINER, name).upload_blob(data, **kwargs))
+    try:
+        return run()['etag']
+    except ResourceNotFoundError:
+        resource_pool.container_client(conn_str, BLOB_INDEX_CONTAINER, create=True)    # 컨테이너가 없을 때만 만들고 다시 씀
+        return run()['etag']
+
+
+def update_manifest(conn_str: str, source: str, date: str, hour: int, entries: list) -> dict:
+    """파티션 manifest 에 entries 를 더합니다. (ETag 조건부 쓰기, 경합하면 다시 읽어 MANIFEST_RETRIES 번까지)"""
+    from azure.core.exceptions import ResourceExistsError, ResourceModifiedError
+
+    name = manifest_name(source, date, hour)
+    key = (conn_str, name)
+    with tracing.span("layout.manifest", blob=name, files=len(entries)):
+        for attempt in range(MANIFEST_RETRIES):
+            with _LOCK:
+                cached = _LAST_WRITTEN.get(key) if attempt == 0 else None
+            manifest, etag = cached if cached is not None else _read(conn_str, name)
+            manifest = _add_files(json.loads(json.dumps(manifest)) if manifest else _empty(source, date, hour), entries)
+            try:
+                new_etag = _write(conn_str, name, manifest, etag)
+            except (ResourceModifiedError, ResourceExistsError):
+                tracing.increment_attribute('retries')
+                continue
+            with _LOCK:
+                _LAST_WRITTEN[key] = (manifest, new_etag)
+            return manifest
+    raise RuntimeError(f"manifest 경합으로 {MANIFEST_RETRIES}번 모두 쓰지 못했습니다: {name}")
+
+
+def record(conn_str: str, container: str, name: str, rows: int, nbytes: int, cursor=None) -> bool:
+    """결과 파일 하나를 다 쓴 뒤 호출합니다. 파티션 이름이면 manifest 에 더하고 True, 평평한 이름이면 아무것도 하지 않음."""
+    part = parse_partition(name)
+    if part is None:
+        return False
+    entry = {'container': container, 'name': name, 'format': _format(name), 'rows': rows, 'bytes': nbytes,
+             'cursor': cursor, 'written_at': datetime.now(KST).isoformat(timespec="seconds")}
+    try:
+        update_manifest(conn_str, *part, [entry])
+    except Exception as e:
+        logging.warning(f"⚠️ 파티션 manifest 기록 실패 (파일은 그대로, migrate 로 다시 색인 가능): {name} | {e}")
+        return False
+    return True
+
+
+# =========================================================================
+# === 읽기 ===
+# =========================================================================
+def _hour(value: str, end: bool = False) -> datetime:
+    """"2026-10-01" / "2026-10-01T09" → KST 시각 (시간이 없으면 그날 00시 또는 23시)"""
+    day, _, hour = value.strip().replace("T", " ").partition(" ")
+    hour = int(hour[:2]) if hour else (23 if end else 0)
+    return datetime.strptime(day, "%Y-%m-%d").replace(hour=hour, tzinfo=KST)
+
+
+def hours(since: str, until: str) -> list:
+    """since ~ until(포함) 의 (날짜, 시) 목록. 형식은 "YYYY-MM-DD[THH]" (KST)"""
+    cur, last = _hour(since), _hour(until, end=True)
+    out = []
+    while cur <= last:
+        out.append((cur.strftime("%Y-%m-%d"), cur.hour))
+        cur += timedelta(hours=1)
+    return out
+
+
+def read_manifest(conn_str: str, source: str, date: str, hour: int):
+    return _read(conn_str, manifest_name(source, date, hour))[0]
+
+
+def resolve(conn_str: str, source: str, since: str, until: str, fmt: str = None,
+            workers: int = BLOB_INDEX_WORKERS) -> list:
+    """시간대의 결과 파일 목록. 컨테이너를 나열하지 않고 시간당 manifest GET 한 번 (없는 시간은 건너뜀).
+    fmt("csv" | "parquet")를 주면 그 형식만. 반환: manifest 의 files 항목(시간 순서)"""
+    wanted = hours(since, until)
+    with tracing.span("layout.resolve", source=source, hours=len(wanted)):
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="layout") as pool:
+            manifests = list(pool.map(lambda h: read_manifest(conn_str, source, *h), wanted))
+        files = [f for m in manifests if m for f in m['files'] if fmt is None or f['format'] == fmt]
+        tracing.set_attributes(files=len(files))
+    return files
+
+
+# =========================================================================
+# === 기존 Blob 이전 (migrate) ===
+# =========================================================================
+def _count_rows(name: str, data: bytes):
+    if name.endswith(".csv"):
+        text = data.decode("utf-8-sig")
+        return max(sum(1 for _ in csv.reader(io.StringIO(text))) - 1, 0)
+    if name.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(io.BytesIO(data)).metadata.num_rows
+    return None
+
+
+def _cursor(source: str, name: str):
+    m = _CURSOR[source].search(name.rsplit("/", 1)[-1])
+    return int(m.group(1)) if m else None
+
+
+def _migrate_blob(conn_str: str, source: str, location: tuple, blob, move: bool, count_rows: bool) -> dict:
+    """평평한 Blob 하나를 (옮기고) manifest 항목으로 만듭니다."""
+    container, prefix, _, watched = location
+    name = blob.name
+    when = blob.last_modified.astimezone(KST)
+    data = None
+    if count_rows or (move and not watched):
+        data = resource_pool.with_blob_service(
+            conn_str, lambda svc: svc.get_blob_client(container, name).download_blob().readall())
+    target = name
+    if move and not watched:
+        target = f"{prefix}{partition(source, when)}{name[len(prefix):]}"
+        resource_pool.with_blob_service(
+            conn_str, lambda svc: svc.get_blob_client(container, target).upload_blob(data, overwrite=True))
+        resource_pool.with_blob_service(conn_str, lambda svc: svc.get_blob_client(container, name).delete_blob())
+    return {'container': container, 'name': target, 'format': _format(name),
+            'rows': _count_rows(name, data) if count_rows else None, 'bytes': blob.size,
+            'cursor': _cursor(source, name), 'written_at': when.isoformat(timespec="seconds"),
+            'migrated_from': name if target != name else None}
+
+
+def migrate(conn_str: str, source: str, move: bool = False, count_rows: bool = True, dry_run: bool = False,
+            workers: int = BLOB_INDEX_WORKERS) -> dict:
+    """기존 평평한 결과 파일을 수정 시각(KST) 파티션의 manifest 에 색인합니다. 이미 파티션 이름인 파일도 다시 색인합니다.
+
+    move=True 면 Blob 트리거가 감시하지 않는 위치의 파일은 파티션 이름으로 옮깁니다. (감시 경로는 다시 전송되므로 색인만)
+    반환: {'source', 'blobs', 'moved', 'partitions', 'rows', 'skipped_move'}
+    """
+    from azure.core.exceptions import ResourceNotFoundError
+
+    stats = {'source': source, 'blobs': 0, 'moved': 0, 'partitions': 0, 'rows': 0, 'skipped_move': 0}
+    partitions = {}
+    for location in LOCATIONS[source]:
+        container, prefix, file_prefix, watched = location
+        try:
+            blobs = list(resource_pool.container_client(conn_str, container).list_blobs(name_starts_with=prefix))
+        except ResourceNotFoundError:
+            continue
+        rest_ok = lambda rest: rest.startswith(file_prefix) or _PARTITION.match(rest)
+        blobs = [b for b in blobs if rest_ok(b.name[len(prefix):])
+                 and b.name.rsplit("/", 1)[-1].startswith(file_prefix) and _format(b.name) in ("csv", "parquet")]
+        if dry_run:
+            stats['blobs'] += len(blobs)
+            continue
+        moving = move and not watched
+        if move and watched:
+            stats['skipped_move'] += sum(1 for b in blobs if parse_partition(b.name) is None)
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="migrate") as pool:
+            entries = list(pool.map(
+                lambda b: _migrate_blob(conn_str, source, location, b,
+                                        moving and parse_partition(b.name) is None, count_rows), blobs))
+        for blob, entry in zip(blobs, entries):
+            part = parse_partition(entry['name'])
+            if part is None:
+                when = blob.last_modified.astimezone(KST)
+                part = (source, when.strftime("%Y-%m-%d"), when.hour)
+            partitions.setdefault(part, []).append({k: v for k, v in entry.items() if v is not None or k == 'rows'})
+            stats['blobs'] += 1
+            stats['moved'] += entry['migrated_from'] is not None
+            stats['rows'] += entry['rows'] or 0
+
+    for part, entries in sorted(partitions.items()):
+        update_manifest(conn_str, *part, entries)
+    stats['partitions'] = len(partitions)
+    if stats['skipped_move']:
+        logging.info(f"🗂️ [{source}] Blob 트리거 감시 경로의 {stats['skipped_move']}개는 다시 전송되지 않도록 옮기지 않고 색인만 했습니다.")
+    logging.info(f"🗂️ [{source}] 파티션 색인 완료: {stats}")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conn", default=os.getenv("AzureWebJobsStorage"), help="결과 파일이 있는 스토리지 연결 문자열")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("resolve", help="시간대의 파일 목록 (manifest 만 읽음)")
+    p.add_argument("--source", choices=sorted(LOCATIONS), required=True)
+    p.add_argument("--since", required=True, help="YYYY-MM-DD 또는 YYYY-MM-DDTHH (KST)")
+    p.add_argument("--until", required=True, help="이 시간까지 포함")
+    p.add_argument("--format", choices=["csv", "parquet"])
+    p = sub.add_parser("migrate", help="기존 Blob 을 파티션 manifest 에 색인 (--move 면 감시 밖 파일은 옮김)")
+    p.add_argument("--source", choices=sorted(LOCATIONS), required=True)
+    p.add_argument("--move", action="store_true")
+    p.add_argument("--no-rows", action="store_true", help="행 수를 세지 않음 (파일을 내려받지 않음)")
+    p.add_argument("--dry-run", action="store_true", help="대상 Blob 수만 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "resolve":
+        for f in resolve(args.conn, args.source, args.since, args.until, args.format):
+            print(json.dumps(f, ensure_ascii=False))
+        return 0
+    print(json.dumps(migrate(args.conn, args.source, args.move, not args.no_rows, args.dry_run), ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+"""tick 마다 쌓이는 작은 CSV Blob 을 닫힌 시간 / 일 단위 큰 파일 하나로 합치는 압축(compaction) 작업.
+
+서울 수집은 tick 마다 data/all_jobs/seoul_jobs_{idx}_{ts}.csv 를, 경기 수집은 매분 ggjobs_{ts}.csv 를 하나씩 쓰므로
+Power BI 새로 고침 / 백필 같은 일괄 읽기는 수천 개의 작은 Blob 을 나열하고 열어야 합니다.
+
+COMPACTION=1 이면 (기본은 끔) 압축 타이머(서울 trig_compact_seoul / 경기 trig_compact_ggjobs)가
+- 소스의 tick CSV(Blob 트리거 경로 + DELIVERY_MODE=direct 보관본 경로)를 마지막 수정 시각(KST) 기준 시간 / 일 구간으로 묶고,
+  (BLOB_LAYOUT=partitioned 로 쓴 파일은 이름의 파티션 시간 기준, 합칠 차례인 시간의 파티션만 나열 - shared_code/blob_layout.py)
+- 끝난 지 COMPACT_GRACE_SEC 가 지난 구간만 COMPACT_CONTAINER/{소스}/{hour|day}/YYYY/MM/DD[/HH].csv (또는 .parquet) 하나로 합쳐
+- 같은 이름의 .manifest.json 에 행 수 / 바이트 / 원본 Blob 목록을 남깁니다. (manifest 는 결과 파일을 다 쓴 뒤 마지막에 씀)
+- 어디까지 합쳤는지는 COMPACT_STATE_CONTAINER/compaction/{소스}_{단위}.json 커서(cursor_store, lease)로 기억하므로
+  실행이 겹쳐도 같은 구간을 두 번 합치지 않고, 실패하면 다음 실행에서 그 구간부터 다시 합칩니다.
+
+결과는 Blob 트리거가 감시하지 않는 컨테이너(COMPACT_CONTAINER)에만 쓰므로 blob_to_eventhub / blob_to_asa 를 다시 실행시키지 않습니다.
+(감시 경로와 겹치게 설정하면 ValueError)
+CSV 는 헤더를 한 번만 두고 본문 bytes 를 그대로 이어 붙이므로 pandas 없이 합치고, 원본 파일과 같은 행이 나옵니다.
+COMPACT_DELETE_SOURCES=1 이면 커서를 저장한 뒤 합친 원본 Blob 을 지웁니다. (삭제는 Blob 트리거를 실행시키지 않음)
+구간이 닫힌 뒤 COMPACT_GRACE_SEC 보다 늦게 올라온 Blob 은 합치지 않고 원래 자리에 남습니다.
+
+    cd seoul-job-cnt/azure-func-connect
+    python -m shared_code.compaction --source seoul --grain day --format parquet
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from shared_code import resource_pool, cursor_store, parquet_sink, tracing, blob_layout
+
+COMPACTION = os.getenv("COMPACTION", "0") == "1"                                   # 1 이면 압축 타이머 동작
+COMPACT_GRAIN = os.getenv("COMPACT_GRAIN", "hour")                                  # "hour" | "day"
+COMPACT_FORMAT = os.getenv("COMPACT_FORMAT", "csv")                                 # "csv" | "parquet" | "both"
+COMPACT_CONTAINER = os.getenv("COMPACT_CONTAINER", "compacted")                     # Blob 트리거가 감시하지 않는 컨테이너
+COMPACT_STATE_CONTAINER = os.getenv("COMPACT_STATE_CONTAINER", "function-state")    # 압축 커서를 저장할 컨테이너
+COMPACT_GRACE_SEC = float(os.getenv("COMPACT_GRACE_SEC", "600"))      # 구간이 끝나고 이 시간이 지나야 합침 (늦게 끝난 tick 대기)
+COMPACT_MAX_WINDOWS = int(os.getenv("COMPACT_MAX_WINDOWS", "24"))     # 한 번의 실행에서 합칠 최대 구간 수 (밀린 구간은 다음 실행에서)
+COMPACT_WORKERS = int(os.getenv("COMPACT_WORKERS", "8"))              # 원본 Blob 을 동시에 내려받을 스레드 수
+COMPACT_DELETE_SOURCES = os.getenv("COMPACT_DELETE_SOURCES", "0") == "1"   # 1 이면 합친 원본 Blob 삭제
+COMPACT_LEASE_SEC = float(os.getenv("COMPACT_LEASE_SEC", "600"))      # 압축 커서 lease (한 번의 실행 시간보다 넉넉하게)
+STATE_PREFIX = "compaction/"
+MANIFEST_SUFFIX = ".manifest.json"
+KST = ZoneInfo("Asia/Seoul")
+BOM = b"\xef\xbb\xbf"
+
+# 두 파이프라인(서울/경기)의 출력 헤더 기준 숫자 컬럼 - Parquet 로 쓸 때만 숫자로 읽고 나머지는 문자열 (코드의 앞자리 0 유지)
+NUMERIC_COLUMNS = ['wage_value_krw', 'wage_value_monthly']
+
+# 소스별 합칠 tick CSV (컨테이너, 경로 접두사, 파일 이름 접두사) 와 Blob 트리거가 감시하는 (컨테이너, 경로 접두사)
+# (seoul_jobs.TRIGGER_PREFIX / ARCHIVE_PREFIX, gg_jobs.OUTPUT_CONTAINER / ARCHIVE_CONTAINER 와 같은 값 - pandas 를 불러오지 않으려고 따로 둠)
+SEOUL_CONTAINER = os.getenv("SEOUL_BLOB_CONTAINER_NAME") or os.getenv("BLOB_CONTAINER_NAME", "seoul-job-ct")
+GG_CONTAINER = "ggjob-data"
+GG_ARCHIVE_CONTAINER = os.getenv("GG_ARCHIVE_CONTAINER", "ggjob-archive")
+SOURCES = {
+    "seoul": {
+        'inputs': [(SEOUL_CONTAINER, "data/all_jobs/", "seoul_jobs_"), (SEOUL_CONTAINER, "data/archive/", "seoul_jobs_")],
+        'watched': [(SEOUL_CONTAINER, "data/all_jobs/")],
+    },
+    "gg": {
+        'inputs': [(GG_CONTAINER, "", "ggjobs_"), (GG_ARCHIVE_CONTAINER, "", "ggjobs_")],
+        'watched': [(GG_CONTAINER, "")],
+    },
+}
+
+
+# =========================================================================
+# === 구간 ===
+# =========================================================================
+def window_key(when: datetime, grain: str = COMPACT_GRAIN) -> str:
+    """Blob 수정 시각 → 구간 키 "YYYY/MM/DD/HH"(hour) 또는 "YYYY/MM/DD"(day), KST. 문자열 순서 = 시간 순서"""
+    return when.astimezone(KST).strftime("%Y/%m/%d/%H" if grain == "hour" else "%Y/%m/%d")
+
+
+def window_start(key: str, grain: str = COMPACT_GRAIN) -> datetime:
+    return datetime.strptime(key, "%Y/%m/%d/%H" if grain == "hour" else "%Y/%m/%d").replace(tzinfo=KST)
+
+
+def window_end(key: str, grain: str = COMPACT_GRAIN) -> datetime:
+    return window_start(key, grain) + (timedelta(hours=1) if grain == "hour" else timedelta(days=1))
+
+
+def output_name(source: str, key: str, grain: str, ext: str) -> str:
+    return f"{source}/{grain}/{key}.{ext}"
+
+
+def check_output(container: str = COMPACT_CONTAINER) -> None:
+    """결과 경로({소스}/...)가 어느 Blob 트리거 감시 경로와도 겹치지 않는지 확인합니다. (겹치면 ValueError)"""
+    for spec in SOURCES.values():
+        for watched, prefix in spec['watched']:
+            for source in SOURCES:
+                if container == watched and (f"{source}/".startswith(prefix) or prefix.startswith(f"{source}/")):
+                    raise ValueError(f"COMPACT_CONTAINER={container} 의 {source}/ 가 Blob 트리거 감시 경로({watched}/{prefix})와 겹칩니다.")
+
+
+def _list_prefixes(source: str, prefix: str, file_prefix: str, grain: str, after: str, until: datetime) -> list:
+    """나열할 이름 접두사. 평평한 이름 + (BLOB_LAYOUT=partitioned 면) after 다음부터 until 전까지 시간의 파티션만
+    (after 가 없으면 소스 파티션 전체). 파티션 이름은 컨테이너 전체를 나열하지 않고 시간마다 좁게 나열합니다."""
+    prefixes = [prefix + file_prefix]
+    if not blob_layout.is_partitioned():
+        return prefixes
+    if not after:
+        return prefixes + [f"{prefix}source={source}/"]
+    hour = window_end(after, grain)
+    while hour < until:
+        prefixes.append(prefix + blob_layout.partition(source, hour))
+        hour += timedelta(hours=1)
+    return prefixes
+
+
+def _blob_window(name: str, last_modified: datetime, grain: str) -> str:
+    """파티션 이름이면 그 파티션(쓴 시각)의 구간, 평평한 이름이면 마지막 수정 시각의 구간"""
+    part = blob_layout.parse_partition(name)
+    if part is None:
+        return window_key(last_modified, grain)
+    return window_key(datetime.strptime(part[1], "%Y-%m-%d").replace(hour=part[2], tzinfo=KST), grain)
+
+
+def list_inputs(conn_str: str, source: str, grain: str = COMPACT_GRAIN, after: str = None,
+                until: datetime = None) -> dict:
+    """소스의 tick CSV 를 구간별로 묶습니다. 반환: {구간 키: [{'container', 'name', 'bytes', 'last_modified'}]}
+    after(이미 합친 마지막 구간) / until 은 파티션 이름을 나열할 시간 범위를 좁히는 데만 씁니다."""
+    from azure.core.exceptions import ResourceNotFoundError
+
+    windows = {}
+    for container, prefix, file_prefix in SOURCES[source]['inputs']:
+        for list_prefix in _list_prefixes(source, prefix, file_prefix, grain, after, until or datetime.now(KST)):
+            try:
+                blobs = list(resource_pool.container_client(conn_str, container).list_blobs(name_starts_with=list_prefix))
+            except ResourceNotFoundError:
+                break   # 보관본 컨테이너는 direct 모드를 쓴 적이 없으면 없음
+            for blob in blobs:
+                if not blob.name.endswith(".csv") or not blob.name.rsplit("/", 1)[-1].startswith(file_prefix):
+                    continue
+                windows.setdefault(_blob_window(blob.name, blob.last_modified, grain), []).append({
+                    'container': container, 'name': blob.name, 'bytes': blob.size,
+                    'last_modified': blob.last_modified.isoformat(),
+                })
+    for blobs in windows.values():
+        blobs.sort(key=lambda b: (b['last_modified'], b['name']))
+    return windows
+
+
+# =========================================================================
+# === 합치기 ===
+# =========================================================================
+def _split_header(data: bytes) -> tuple:
+    """tick CSV(UTF-8-SIG) → (헤더 줄, 본문 bytes). 헤더에는 줄바꿈이 들어가지 않으므로 첫 줄바꿈에서 자름"""
+    if data.startswith(BOM):
+        data = data[len(BOM):]
+    end = data.find(b"\n")
+    if end < 0:
+        return data + b"\n", b""
+    body = data[end + 1:]
+    if body and not body.endswith(b"\n"):
+        body += b"\n"
+    return data[:end + 1], body
+
+
+def _count_rows(body: bytes) -> int:
+    """본문 행 수. 따옴표 안의 줄바꿈이 있을 수 있으므로 csv 로 셈"""
+    return sum(1 for _ in csv.reader(io.StringIO(body.decode("utf-8")))) if body else 0
+
+
+def merge_csv(blobs: list) -> tuple:
+    """tick CSV bytes 목록을 헤더 하나짜리 CSV(UTF-8-SIG) 로 합칩니다. 반환: (CSV bytes, 파일별 행 수)
+
+    헤더가 모두 같으면 본문 bytes 를 그대로 이어 붙이고, 중간에 컬럼이 바뀌었으면 pandas 로 컬럼을 맞춰 합칩니다.
+    """
+    parts = [_split_header(data) for data in blobs]
+    rows = [_count_rows(body) for _, body in parts]
+    headers = {header.rstrip(b"\r\n") for header, _ in parts}
+    if len(headers) <= 1:
+        return BOM + parts[0][0] + b"".join(body for _, body in parts), rows
+
+    import pandas as pd
+
+    logging.warning(f"⚠️ 구간 안에서 CSV 헤더가 {len(headers)}가지 → 컬럼을 맞춰 합칩니다.")
+    frames = [pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False, encoding="utf-8-sig") for data in blobs]
+    merged = pd.concat(frames, ignore_index=True).fillna("")
+    return merged.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig"), rows
+
+
+def csv_to_parquet(data: bytes) -> bytes:
+    """합친 CSV 를 Parquet 로 변환합니다. NUMERIC_COLUMNS 만 숫자, 나머지는 문자열(빈 칸은 결측)."""
+    import pandas as pd
+
+    df = pd.read_csv(io.BytesIO(data), dtype=str, encoding="utf-8-sig")
+    for c in NUMERIC_COLUMNS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    return parquet_sink.to_parquet_bytes(df)
+
+
+def _download(conn_str: str, blob: dict) -> bytes:
+    return resource_pool.with_blob_service(
+        conn_str, lambda svc: svc.get_blob_client(blob['container'], blob['name']).download_blob().readall())
+
+
+def _upload(conn_str: str, name: str, data: bytes) -> None:
+    from azure.core.exceptions import ResourceNotFoundError
+
+    run = lambda: resource_pool.with_blob_service(
+        conn_str, lambda svc: svc.get_blob_client(COMPACT_CONTAINER, name).upload_blob(data, overwrite=True))
+    try:
+        run()
+    except ResourceNotFoundError:
+        resource_pool.container_client(conn_str, COMPACT_CONTAINER, create=True)     # 컨테이너가 없을 때만 만들고 다시 씀
+        run()
+
+
+def compact_window(conn_str: str, source: str, key: str, blobs: list, grain: str = COMPACT_GRAIN,
+                   fmt: str = COMPACT_FORMAT, workers: int = COMPACT_WORKERS) -> dict:
+    """구간 하나의 tick CSV 를 합쳐 COMPACT_CONTAINER 에 쓰고 manifest 를 남깁니다. 반환: manifest dict"""
+    with tracing.span("compaction.window", source=source, window=key, inputs=len(blobs)):
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="compact") as pool:
+            datas = list(pool.map(lambda b: _download(conn_str, b), blobs))
+        merged, rows = merge_csv(datas)
+
+        outputs = []
+        if parquet_sink.writes_parquet(fmt):
+            outputs.append((output_name(source, key, grain, "parquet"), "parquet", csv_to_parquet(merged)))
+        if parquet_sink.writes_csv(fmt):
+            outputs.append((output_name(source, key, grain, "csv"), "csv", merged))
+        for name, _, data in outputs:
+            _upload(conn_str, name, data)
+
+        manifest = {
+            'source': source, 'grain': grain, 'window': key,
+            'start': window_start(key, grain).isoformat(),
+            'end': window_end(key, grain).isoformat(),
+            'rows': sum(rows),
+            'outputs': [{'name': name, 'format': f, 'bytes': len(data)} for name, f, data in outputs],
+            'inputs': [dict(blob, rows=n) for blob, n in zip(blobs, rows)],
+            'input_bytes': sum(len(d) for d in datas),
+            'created_at': datetime.now(KST).isoformat(timespec="seconds"),
+        }
+        _upload(conn_str, output_name(source, key, grain, MANIFEST_SUFFIX[1:]),
+                json.dumps(manifest, ensure_ascii=False, indent=1).encode("utf-8"))
+        tracing.set_attributes(rows=manifest['rows'], **{'payload.bytes': manifest['input_bytes']})
+    return manifest
+
+
+def _delete(conn_str: str, blobs: list) -> int:
+    deleted = 0
+    for blob in blobs:
+        try:
+            resource_pool.with_blob_service(
+                conn_str, lambda svc: svc.get_blob_client(blob['container'], blob['name']).delete_blob())
+            deleted += 1
+        except Exception as e:
+            logging.warning(f"⚠️ 원본 Blob 삭제 실패 (합친 결과는 그대로): {blob['container']}/{blob['name']} | {e}")
+    return deleted
+
+
+# =========================================================================
+# === 실행 ===
+# =========================================================================
+def get_state_store(conn_str: str, source: str, grain: str = COMPACT_GRAIN) -> cursor_store.CursorStore:
+    return cursor_store.CursorStore(conn_str, COMPACT_STATE_CONTAINER, f"{STATE_PREFIX}{source}_{grain}.json",
+                                    cursor_field="done_until", default="", lease_sec=COMPACT_LEASE_SEC)
+
+
+def run(conn_str: str, source: str, grain: str = COMPACT_GRAIN, fmt: str = COMPACT_FORMAT, now: datetime = None,
+        max_windows: int = COMPACT_MAX_WINDOWS, delete_sources: bool = COMPACT_DELETE_SOURCES) -> dict:
+    """닫힌 구간 중 아직 합치지 않은 것을 오래된 순서로 max_windows 개까지 합칩니다.
+
+    반환: {'source', 'windows', 'inputs', 'rows', 'input_bytes', 'output_bytes', 'deleted', 'done_until', 'seconds'}
+    다른 실행이 압축 커서를 잡고 있으면 None.
+    """
+    if grain not in ("hour", "day"):
+        raise ValueError(f"알 수 없는 압축 단위: {grain}")
+    check_output()
+    store = get_state_store(conn_str, source, grain)
+    claim = store.claim()
+    if claim is None:
+        return None
+
+    started = time.perf_counter()
+    cutoff = (now or datetime.now(KST)) - timedelta(seconds=COMPACT_GRACE_SEC)
+    stats = {'source': source, 'windows': 0, 'inputs': 0, 'rows': 0, 'input_bytes': 0, 'output_bytes': 0, 'deleted': 0}
+    done, merged = claim.cursor, []
+    try:
+        step = timedelta(hours=1) if grain == "hour" else timedelta(days=1)
+        until = min(cutoff, window_end(done, grain) + step * max_windows) if done else cutoff
+        windows = list_inputs(conn_str, source, grain, done, until)
+        closed = [k for k in sorted(windows) if k > done and window_end(k, grain) <= until]
+        if len(closed) > max_windows:
+            logging.info(f"🗜️ [{source}] 합칠 구간 {len(closed)}개 중 {max_windows}개만 이번 실행에서 합칩니다.")
+        for key in closed[:max_windows]:
+            manifest = compact_window(conn_str, source, key, windows[key], grain, fmt)
+            done = key
+            merged += windows[key]
+            stats['windows'] += 1
+            stats['inputs'] += len(windows[key])
+            stats['rows'] += manifest['rows']
+            stats['input_bytes'] += manifest['input_bytes']
+            stats['output_bytes'] += sum(o['bytes'] for o in manifest['outputs'])
+            logging.info(f"🗜️ [{source}] {key}: tick CSV {len(windows[key])}개 / {manifest['rows']}건 → "
+                         f"{', '.join(o['name'] for o in manifest['outputs'])}")
+    finally:
+        if done != claim.cursor:
+            store.commit(claim, done)   # 합친 구간까지 (중간에 실패했으면 다음 실행이 그 구간부터)
+        else:
+            store.release(claim)
+
+    if delete_sources and merged:
+        stats['deleted'] = _delete(conn_str, merged)     # 커서를 저장한 뒤에만 지움 (지우고 다시 합치는 일 없음)
+    stats['done_until'] = done
+    stats['seconds'] = round(time.perf_counter() - started, 3)
+    logging.info(f"🗜️ [{source}] 압축 완료: {stats}")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=sorted(SOURCES), required=True)
+    parser.add_argument("--grain", choices=["hour", "day"], default=COMPACT_GRAIN)
+    parser.add_argument("--format", choices=["csv", "parquet", "both"], default=COMPACT_FORMAT)
+    parser.add_argument("--max-windows", type=int, default=COMPACT_MAX_WINDOWS)
+    parser.add_argument("--delete-sources", action="store_true", default=COMPACT_DELETE_SOURCES)
+    parser.add_argument("--conn", default=os.getenv("AzureWebJobsStorage"), help="tick CSV 가 있는 스토리지 연결 문자열")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    stats = run(args.conn, args.source, args.grain, args.format, max_windows=args.max_windows,
+                delete_sources=args.delete_sources)
+    print(json.dumps(stats, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
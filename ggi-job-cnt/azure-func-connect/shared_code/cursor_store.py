@@ -0,0 +1,182 @@
+"""ETag 조건부 쓰기 + 짧은 lease 로 보호하는 수집 커서 저장소.
+
+타이머 실행이 겹치거나 인스턴스가 늘어나도 한 번에 한 실행만 같은 커서(범위)를 가져가도록,
+상태 Blob(JSON) 에 lease {"owner", "until"} 를 ETag 조건부 쓰기로 기록한 실행만 수집합니다.
+다른 실행이 lease 를 잡고 있으면 이번 실행은 건너뜁니다.
+
+- claim(): lease 기록 (웜 워커는 직전에 쓴 상태/ETag 를 기억해 두었다가 GET 없이 조건부 쓰기 한 번)
+- commit(claim, cursor): 다음 커서 저장 + lease 해제 (claim 이후 다른 쓰기가 있었으면 CursorConflict)
+- release(claim): 커서를 옮기지 않고 lease 만 해제 (실패 / 새 데이터 없음)
+
+컨테이너는 미리 만들지 않고, 쓰기에서 컨테이너가 없다고 할 때만 한 번 만듭니다.
+lease 만료 판단은 인스턴스 시계 기준이므로 CURSOR_LEASE_SEC 는 한 번의 실행 시간보다 넉넉하게 둡니다.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from shared_code import resource_pool, tracing
+
+CURSOR_LEASE_SEC = float(os.getenv("CURSOR_LEASE_SEC", "90"))   # lease 유지 시간(초). 실행이 죽어도 이 시간 뒤에는 다른 실행이 이어받음
+
+
+class CursorConflict(Exception):
+    """claim 이후 다른 실행이 상태를 바꿔 커서를 저장하지 못한 경우."""
+
+
+class CursorClaim:
+    """claim() 으로 얻은 커서와 lease. commit / release 하면 done 이 됩니다.
+
+    fields 에 넣은 값은 commit / release 때 커서와 함께 상태에 저장됩니다. (예: 학습한 요청 크기)
+    release 로 끝났으면 released 가 True 입니다. (커서를 옮기지 않음)
+    """
+
+    def __init__(self, cursor, state: dict, etag: str, owner: str):
+        self.cursor = cursor
+        self.state = state
+        self.etag = etag
+        self.owner = owner
+        self.fields = {}
+        self.done = False
+        self.released = False
+
+
+# 워커 프로세스가 마지막으로 쓴 (상태, ETag) - 다음 claim 에서 GET 을 생략하는 데 사용
+_LAST_WRITTEN = {}
+_LOCK = threading.Lock()
+
+
+def _owner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class CursorStore:
+    """Blob 하나에 저장하는 커서. cursor_field 이름으로 커서 값을 저장하고, 다른 필드는 그대로 보존합니다."""
+
+    def __init__(self, conn_str: str, container_name: str, blob_name: str, cursor_field: str = "cursor",
+                 default=1, legacy=None, lease_sec: float = None):
+        self.conn_str = conn_str
+        self.container_name = container_name
+        self.blob_name = blob_name
+        self.cursor_field = cursor_field
+        self.default = default
+        self.legacy = legacy          # 상태 Blob 이 없을 때 커서를 이어받을 함수 (없거나 None 을 반환하면 default)
+        self.lease_sec = CURSOR_LEASE_SEC if lease_sec is None else lease_sec
+        self._key = (conn_str, container_name, blob_name)
+
+    # === Blob 입출력 (연결 오류 시 클라이언트 재생성 후 재시도) ===
+    def _run(self, fn):
+        return resource_pool.with_blob_service(
+            self.conn_str, lambda svc: fn(svc.get_blob_client(self.container_name, self.blob_name))
+        )
+
+    def _read(self):
+        """(상태 dict 또는 None, ETag 또는 None) 을 반환합니다."""
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            downloader = self._run(lambda blob: blob.download_blob())
+        except ResourceNotFoundError:
+            return None, None
+        return json.loads(downloader.readall()), downloader.properties.etag
+
+    def _write(self, state: dict, etag: str) -> str:
+        """etag 가 그대로일 때만(없으면 Blob 이 아직 없을 때만) 씁니다. 새 ETag 를 반환합니다."""
+        from azure.core import MatchConditions
+        from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+
+        data = json.dumps(state, ensure_ascii=False)
+        if etag:
+            kwargs = {'overwrite': True, 'etag': etag, 'match_condition': MatchConditions.IfNotModified}
+        else:
+            kwargs = {'overwrite': False}
+        try:
+            try:
+                result = self._run(lambda blob: blob.upload_blob(data, **kwargs))
+            except ResourceNotFoundError:
+                # 컨테이너가 없을 때만 만들고 다시 씀
+                resource_pool.container_client(self.conn_str, self.container_name, create=True)
+                result = self._run(lambda blob: blob.upload_blob(data, **kwargs))
+        except (ResourceModifiedError, ResourceExistsError) as e:
+            raise CursorConflict(f"{self.blob_name}: {e}") from e
+        with _LOCK:
+            _LAST_WRITTEN[self._key] = (state, result['etag'])
+        return result['etag']
+
+    def _forget(self) -> None:
+        with _LOCK:
+            _LAST_WRITTEN.pop(self._key, None)
+
+    # === claim / commit / release ===
+    @tracing.traced("cursor.claim", on_result=lambda c: {'claimed': c is not None})
+    def claim(self):
+        """lease 를 잡고 CursorClaim 을 반환합니다. 다른 실행이 lease 를 잡고 있으면 None 을 반환합니다."""
+        with _LOCK:
+            cached = _LAST_WRITTEN.get(self._key)
+        tracing.set_attributes(blob=self.blob_name, warm=cached is not None)
+
+        for _ in range(2):
+            state, etag = cached if cached is not None else self._read()
+            if state is None:
+                legacy = self.legacy() if self.legacy else None
+                state = {self.cursor_field: self.default if legacy is None else legacy}
+                if legacy is not None:
+                    logging.info(f"💾 기존 상태에서 커서 이어받음: {self.blob_name} = {legacy}")
+
+            lease = state.get('lease')
+            now = time.time()
+            if lease and lease.get('until', 0) > now:
+                if cached is not None:
+                    cached = None       # 이 워커의 기억이 오래됐을 수 있으므로 다시 읽어 확인
+                    continue
+                logging.info(f"🔒 다른 실행이 커서를 사용 중 ({lease.get('owner')}, "
+                             f"{lease['until'] - now:.0f}s 남음) → 이번 실행은 건너뜁니다.")
+                return None
+
+            owner = _owner_id()
+            claimed = dict(state, lease={'owner': owner, 'until': round(now + self.lease_sec, 3)})
+            try:
+                new_etag = self._write(claimed, etag)
+            except CursorConflict:
+                # 이 워커가 기억한 ETag 가 오래됐거나 다른 실행이 먼저 씀 → 한 번만 다시 읽어 시도
+                tracing.increment_attribute('retries')
+                self._forget()
+                cached = None
+                continue
+            return CursorClaim(state.get(self.cursor_field, self.default), claimed, new_etag, owner)
+
+        logging.info(f"🔒 커서 경합으로 lease 를 잡지 못했습니다: {self.blob_name} → 이번 실행은 건너뜁니다.")
+        return None
+
+    @tracing.traced("cursor.commit")
+    def commit(self, claim: CursorClaim, cursor, **fields) -> None:
+        """다음 커서(와 추가 필드)를 저장하고 lease 를 해제합니다."""
+        tracing.set_attributes(blob=self.blob_name, cursor=cursor)
+        state = {k: v for k, v in claim.state.items() if k != 'lease'}
+        state.update(claim.fields)
+        state.update(fields)
+        state[self.cursor_field] = cursor
+        state['last_updated'] = datetime.now().isoformat()
+        try:
+            claim.etag = self._write(state, claim.etag)
+        except CursorConflict:
+            self._forget()
+            raise
+        claim.state, claim.cursor, claim.done = state, cursor, True
+        logging.info(f"💾 커서 저장: {self.blob_name} = {cursor}")
+
+    def release(self, claim: CursorClaim, **fields) -> None:
+        """커서를 옮기지 않고 lease 만 해제합니다. 이미 commit / release 했으면 아무것도 하지 않습니다."""
+        if claim is None or claim.done:
+            return
+        claim.released = True
+        try:
+            self.commit(claim, claim.cursor, **fields)
+        except Exception as e:
+            # 해제에 실패해도 lease 는 CURSOR_LEASE_SEC 뒤에 만료됨
+            logging.warning(f"⚠️ lease 해제 실패 ({self.blob_name}): {e}")
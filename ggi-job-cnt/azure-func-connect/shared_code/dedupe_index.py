@@ -0,0 +1,205 @@
+"""콘텐츠 해시 기반 중복 제거 인덱스.
+
+수집기가 마지막 페이지 이후 처음부터 다시 돌면 같은 공고가 또 업로드/전송되므로,
+정규화한 공고 필드의 해시(fingerprint)를 Blob 에 저장해 두고
+새로 들어왔거나 내용이 바뀐 행만 내보냅니다.
+
+인덱스는 content 해시(전체 컬럼) -> key 해시(공고 식별 컬럼) 의 8바이트 쌍으로 저장되며,
+워커 프로세스당 한 번만 Blob 에서 읽어 옵니다. content 가 처음 보는 값이면 내보내고,
+그중 key 를 이미 본 적이 있으면 '변경(changed)', 아니면 '신규(new)' 로 집계합니다.
+
+저장은 읽어 온 ETag 조건부로 씁니다. 다른 인스턴스가 먼저 저장했으면 다시 읽어 합친 뒤 다시 씁니다. (DEDUPE_SAVE_RETRIES 번까지)
+Blob 이 없을 때만 빈 인덱스로 시작하고, 그 밖의 읽기 실패는 예외를 올립니다. (빈 인덱스로 저장된 인덱스를 덮어쓰지 않도록)
+"""
+import logging
+import os
+import sys
+import threading
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from shared_code import resource_pool
+
+DEDUPE_ENABLED = os.getenv("DEDUPE_ENABLED", "0") == "1"                  # 1 이면 새/변경 행만 내보냄
+DEDUPE_CONTAINER = os.getenv("DEDUPE_CONTAINER", "function-state")       # 인덱스를 저장할 컨테이너
+DEDUPE_MAX_ENTRIES = int(os.getenv("DEDUPE_MAX_ENTRIES", "500000"))      # 최대 보관 공고 수 (오래 안 보인 것부터 제거)
+DEDUPE_SAVE_RETRIES = int(os.getenv("DEDUPE_SAVE_RETRIES", "5"))         # 저장 경합 시 다시 읽어 합친 뒤 쓰는 횟수
+_MAGIC = b'DDX1'
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """해시 전에 값 표현을 맞춥니다. (결측 -> '', 앞뒤 공백 제거, 값 전체가 숫자일 때만 2500000.0 -> 2500000)
+    "버전 1.0" 같은 자유 텍스트는 그대로 둡니다. ("버전 1" 로 바뀌면 변경으로 잡히도록)"""
+    out = {}
+    for c in df.columns:
+        col = df[c]
+        txt = col.astype(object).where(col.notna(), '').astype(str).str.strip()
+        out[c] = txt.str.replace(r'^(-?\d+)\.0$', r'\1', regex=True)
+    return pd.DataFrame(out, index=df.index)
+
+
+def fingerprints(df: pd.DataFrame, key_cols: list = None):
+    """행별 (key 해시, content 해시) uint64 배열을 반환합니다. key_cols 가 없으면 전체 컬럼이 key 입니다."""
+    norm = _normalize(df)
+    contents = pd.util.hash_pandas_object(norm, index=False).to_numpy()
+    if not key_cols:
+        return contents, contents
+    keys = pd.util.hash_pandas_object(norm[key_cols], index=False).to_numpy()
+    return keys, contents
+
+
+class DedupeIndex:
+    """content 해시 -> key 해시 사전. 삽입 순서를 최근 사용 순서로 유지해 오래된 항목부터 제거합니다."""
+
+    def __init__(self, entries: dict = None, max_entries: int = DEDUPE_MAX_ENTRIES):
+        self._entries = entries or {}
+        self._keys = set(self._entries.values())
+        self.max_entries = max_entries
+        self.dirty = False
+        self.location = None   # (conn_str, container, blob_name)
+        self.etag = None       # 마지막으로 읽거나 쓴 Blob 의 ETag (없으면 Blob 이 아직 없음)
+        self._stats = {'rows': 0, 'hits': 0, 'new': 0, 'changed': 0, 'evicted': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    # --- 직렬화 ---
+    def to_bytes(self) -> bytes:
+        flat = array('Q')
+        for k, v in self._entries.items():
+            flat.append(k)
+            flat.append(v)
+        if sys.byteorder != 'little':
+            flat.byteswap()
+        return _MAGIC + flat.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_entries: int = DEDUPE_MAX_ENTRIES) -> 'DedupeIndex':
+        if not data.startswith(_MAGIC):
+            raise ValueError("dedupe 인덱스 형식이 아닙니다.")
+        flat = array('Q')
+        flat.frombytes(data[len(_MAGIC):])
+        if sys.byteorder != 'little':
+            flat.byteswap()
+        return cls(dict(zip(flat[0::2], flat[1::2])), max_entries)
+
+    # --- 조회 / 반영 ---
+    def filter_new(self, df: pd.DataFrame, key_cols: list = None):
+        """새로 들어왔거나 내용이 바뀐 행만 남긴 DataFrame 과, 전송 성공 후 commit() 에 넘길 pending 을 반환합니다."""
+        if df.empty:
+            return df, []
+        keys, contents = fingerprints(df, key_cols)
+        keep = np.zeros(len(df), dtype=bool)
+        pending = {}
+        for i, (k, c) in enumerate(zip(keys.tolist(), contents.tolist())):
+            if c in self._entries or c in pending:
+                self._stats['hits'] += 1
+                continue
+            self._stats['changed' if k in self._keys else 'new'] += 1
+            keep[i] = True
+            pending[c] = k
+        self._stats['rows'] += len(df)
+        # 다시 본 공고는 최근 사용으로 표시 (제거 순서에서 뒤로)
+        for c in contents[~keep].tolist():
+            if c in self._entries:
+                self._entries[c] = self._entries.pop(c)
+        return df[keep], list(pending.items())
+
+    def commit(self, pending: list) -> None:
+        """업로드/전송이 끝난 행의 fingerprint 를 인덱스에 반영합니다."""
+        for c, k in pending:
+            self._entries[c] = k
+            self._keys.add(k)
+        if pending:
+            self.dirty = True
+        self._evict()
+
+    def merge(self, other: 'DedupeIndex') -> None:
+        """다른 인스턴스가 저장한 인덱스를 합칩니다. 이쪽에 없는 항목은 오래된 쪽(제거 순서 앞)에 둡니다."""
+        entries = {c: k for c, k in other._entries.items() if c not in self._entries}
+        entries.update(self._entries)
+        self._entries = entries
+        self._keys = set(entries.values())
+        self._evict()
+
+    def _evict(self) -> None:
+        over = len(self._entries) - self.max_entries
+        if over > 0:
+            for c in list(self._entries)[:over]:
+                del self._entries[c]
+            self._stats['evicted'] += over
+
+    def stats(self) -> dict:
+        """누적 행 수, hit(중복 스킵) / new / changed 건수와 hit_rate, 인덱스 크기를 반환합니다."""
+        s = dict(self._stats)
+        s['hit_rate'] = round(s['hits'] / s['rows'], 4) if s['rows'] else 0.0
+        s['entries'] = len(self._entries)
+        return s
+
+
+# 워커 프로세스당 한 번만 Blob 에서 읽어 오도록 캐시
+_INDEXES = {}
+_LOCK = threading.Lock()
+
+
+def _read(conn_str: str, container_name: str, blob_name: str) -> tuple:
+    """(인덱스, ETag) 를 반환합니다. Blob 이 없을 때만 (빈 인덱스, None), 그 밖의 실패는 예외를 그대로 올립니다."""
+    from azure.core.exceptions import ResourceNotFoundError
+
+    try:
+        downloader = resource_pool.with_blob_service(
+            conn_str, lambda svc: svc.get_blob_client(container_name, blob_name).download_blob())
+    except ResourceNotFoundError:
+        return DedupeIndex(), None
+    return DedupeIndex.from_bytes(downloader.readall()), downloader.properties.etag
+
+
+def load_index(conn_str: str, blob_name: str, container_name: str = DEDUPE_CONTAINER) -> DedupeIndex:
+    """Blob 에 저장된 인덱스를 반환합니다. 같은 워커에서는 처음 한 번만 다운로드합니다."""
+    key = (conn_str, container_name, blob_name)
+    with _LOCK:
+        index = _INDEXES.get(key)
+        if index is not None:
+            return index
+        resource_pool.container_client(conn_str, container_name, create=True)
+        index, etag = _read(conn_str, container_name, blob_name)
+        if etag is None:
+            logging.warning(f"⚠️ dedupe 인덱스 없음: {blob_name}. 빈 인덱스로 시작합니다.")
+        else:
+            logging.info(f"🧬 dedupe 인덱스 로드: {blob_name} ({len(index)}건)")
+        index.location = key
+        index.etag = etag
+        _INDEXES[key] = index
+        return index
+
+
+def save_index(index: DedupeIndex) -> None:
+    """변경된 경우에만 인덱스를 Blob 에 저장합니다. 읽은 뒤 다른 인스턴스가 저장했으면 다시 읽어 합친 뒤 씁니다."""
+    from azure.core import MatchConditions
+    from azure.core.exceptions import ResourceExistsError, ResourceModifiedError
+
+    if not index.dirty or index.location is None:
+        return
+    conn_str, container_name, blob_name = index.location
+    for attempt in range(DEDUPE_SAVE_RETRIES):
+        data = index.to_bytes()
+        if index.etag:
+            kwargs = {'overwrite': True, 'etag': index.etag, 'match_condition': MatchConditions.IfNotModified}
+        else:
+            kwargs = {'overwrite': False}
+        try:
+            result = resource_pool.with_blob_service(
+                conn_str, lambda svc: svc.get_blob_client(container_name, blob_name).upload_blob(data, **kwargs))
+        except (ResourceModifiedError, ResourceExistsError):
+            remote, index.etag = _read(conn_str, container_name, blob_name)
+            index.merge(remote)
+            logging.info(f"🧬 dedupe 인덱스 저장 경합 → 다시 읽어 합침 ({attempt + 1}/{DEDUPE_SAVE_RETRIES}, "
+                         f"다른 인스턴스 {len(remote)}건)")
+            continue
+        index.etag = result['etag']
+        index.dirty = False
+        logging.info(f"🧬 dedupe 인덱스 저장: {blob_name} ({len(index)}건, {len(data)} bytes)")
+        return
+    raise RuntimeError(f"dedupe 인덱스 경합으로 {DEDUPE_SAVE_RETRIES}번 모두 저장하지 못했습니다: {blob_name}")
@@ -0,0 +1,129 @@
+"""Blob 을 거치지 않고 정제 결과를 Event Hub 로 바로 보내는 직접 전송 경로.
+
+기본(DELIVERY_MODE=blob)은 기존대로 타이머가 CSV 를 Blob 에 쓰고, Blob 트리거(서울 blob_to_eventhub /
+경기 blob_to_asa)가 그 파일을 다시 읽어 전송합니다. 저장소 I/O 가 두 번이고, 수집과 이벤트 사이에
+Blob 트리거 폴링 지연(보통 수십 초)이 끼어듭니다.
+
+DELIVERY_MODE=direct 이면
+- 타이머가 정제한 DataFrame 을 바로 Event Hub 로 보냅니다. (eventhub_sink.send_csv - 분할 / 압축 설정 그대로)
+- Blob 보관본(CSV / Parquet)은 전송이 끝난 뒤 워커 단위 백그라운드 스레드에 맡기고,
+  실행이 끝나기 직전에 drain 으로 기다립니다. (Functions 호스트는 끝난 실행의 스레드를 멈출 수 있어 실행 밖으로 넘기지 않음)
+- 보관본은 Blob 트리거가 감시하지 않는 곳(서울 data/archive/, 경기 GG_ARCHIVE_CONTAINER)에 써서 다시 전송되지 않습니다.
+- 보관 업로드가 실패해도 이미 보낸 이벤트와 커서는 되돌리지 않고, 실패 건은 워커에 남겨 다음 drain 에서 다시 올립니다.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from shared_code import resource_pool, eventhub_sink, tracing
+
+DELIVERY_MODE = os.getenv("DELIVERY_MODE", "blob").lower()      # "blob"(기존, Blob 트리거가 전송) | "direct"
+ARCHIVE_WORKERS = int(os.getenv("ARCHIVE_WORKERS", "2"))         # 보관본 업로드 스레드 수
+ARCHIVE_WAIT_SEC = float(os.getenv("ARCHIVE_WAIT_SEC", "120"))   # drain 에서 보관 업로드를 기다릴 최대 시간(초)
+ARCHIVE_RETRY_LIMIT = 100                                        # 워커에 남겨 둘 실패 보관본 최대 개수
+
+
+def is_direct() -> bool:
+    return DELIVERY_MODE == "direct"
+
+
+def _send_attributes(stats: dict) -> dict:
+    return {'events': stats['events'], 'payload.bytes': stats['bytes']}
+
+
+@tracing.traced("delivery.send_frame", on_result=_send_attributes)
+def send_frame(conn_str: str, eventhub_name: str, df, header=None) -> dict:
+    """정제된 DataFrame 을 CSV(BOM 없음)로 만들어 Event Hub 로 바로 보냅니다. 반환: eventhub_sink 전송 통계"""
+    text = df.to_csv(index=False, header=header if header is not None else True)
+    tracing.set_attributes(rows=len(df))
+    return resource_pool.with_eventhub_producer(
+        conn_str, eventhub_name, lambda producer: eventhub_sink.send_csv(producer, text)
+    )
+
+
+class ArchiveQueue:
+    """Blob 보관본 업로드를 백그라운드 스레드로 돌리고, drain 에서 끝날 때까지 기다립니다. (워커 단위로 재사용)"""
+
+    def __init__(self, workers: int = ARCHIVE_WORKERS):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = []      # (job, future)
+        self._failed = []       # 다음 drain 에서 다시 올릴 job
+        self.totals = {'uploaded': 0, 'failed': 0, 'retried': 0, 'bytes': 0}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="archive")
+            return self._executor
+
+    def submit(self, conn_str: str, container: str, name: str, data: bytes, create_container: bool = False,
+               after=None) -> None:
+        """보관본 업로드를 맡깁니다. create_container=True 면 컨테이너 생성을 워커당 한 번만 시도합니다.
+        after 를 주면 업로드가 끝난 뒤 호출합니다. (예: 파티션 manifest 기록)"""
+        job = (conn_str, container, name, data, create_container, after)
+        future = self._pool().submit(tracing.bind(self._upload), job)
+        with self._lock:
+            self._pending.append((job, future))
+
+    @staticmethod
+    def _upload(job) -> None:
+        conn_str, container, name, data, create_container, after = job
+        with tracing.span("blob.archive", container=container, blob=name, **{'payload.bytes': len(data)}):
+            if create_container:
+                resource_pool.container_client(conn_str, container, create=True)
+            resource_pool.with_blob_service(
+                conn_str, lambda svc: svc.get_blob_client(container, name).upload_blob(data, overwrite=True)
+            )
+        if after is not None:
+            after()
+
+    def drain(self, timeout: float = ARCHIVE_WAIT_SEC) -> dict:
+        """맡긴 업로드가 끝날 때까지 기다립니다. 이전 실행에서 실패한 보관본도 다시 올립니다.
+
+        반환: {'uploaded', 'failed', 'waiting'} (waiting = timeout 안에 끝나지 않아 다음 drain 으로 넘긴 수)
+        """
+        with self._lock:
+            retry, self._failed = self._failed, []
+        for job in retry:
+            self.totals['retried'] += 1
+            self.submit(*job)
+
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return {'uploaded': 0, 'failed': 0, 'waiting': 0}
+
+        _, not_done = wait([f for _, f in pending], timeout=timeout)
+        result = {'uploaded': 0, 'failed': 0, 'waiting': 0}
+        for job, future in pending:
+            if future in not_done:
+                result['waiting'] += 1
+                with self._lock:
+                    self._pending.append((job, future))
+                continue
+            error = future.exception()
+            if error is None:
+                result['uploaded'] += 1
+                self.totals['uploaded'] += 1
+                self.totals['bytes'] += len(job[3])
+                continue
+            result['failed'] += 1
+            self.totals['failed'] += 1
+            logging.error(f"❌ 보관본 업로드 실패 (다음 실행에서 다시 시도): {job[1]}/{job[2]} | {error}")
+            with self._lock:
+                if len(self._failed) < ARCHIVE_RETRY_LIMIT:
+                    self._failed.append(job)
+        logging.info(f"🗄️ 보관본 업로드: {result} | 누적 {self.totals}")
+        return result
+
+
+# 워커 프로세스당 하나의 보관 큐
+ARCHIVE = ArchiveQueue()
+
+
+def drain_archive() -> dict:
+    """ARCHIVE.drain() 바로가기. 맡긴 보관본이 없으면 바로 반환합니다. (JOB_COUNTS_MODE=only 도 이 큐를 씀)"""
+    return ARCHIVE.drain()
@@ -0,0 +1,371 @@
+"""CSV 를 Event Hub 로 보내는 공용 로직.
+
+기본(EVENTHUB_SEND_MODE=whole)은 기존처럼 CSV 전체를 EventData 하나로 보냅니다.
+파일이 약 1MB 이벤트 제한을 넘으면 EVENTHUB_SEND_MODE=split 으로 행 경계에서 잘라 여러 이벤트로 나누고
+(각 이벤트에 헤더 반복) EventDataBatch 를 최대 크기까지 채운 뒤 전송합니다.
+어느 모드든 배치에 들어가지 않는 이벤트는 건너뛰지 않고 EventTooLarge 로 실패합니다.
+Blob 트리거에서는 send_csv_stream 으로 입력을 bytes 그대로 보냅니다. 스트림을 조금씩 읽어 메모리가 배치 크기로
+묶이는 것은 split 모드뿐이고, whole 모드는 파일 전체를 이벤트 하나로 만들기 위해 한 번에 읽습니다.
+
+EVENTHUB_COMPRESSION=gzip|zstd 이면 이벤트 본문을 압축해 보냅니다.
+- 행 묶기는 압축 후 크기 기준이라 이벤트 하나에 더 많은 행이 들어갑니다.
+- 압축한 이벤트에는 content_type(application/gzip | application/zstd) 과
+  애플리케이션 속성(content-encoding, content-type, uncompressed-bytes)을 붙입니다.
+- 소비자는 decode_event(event) 로 원래 CSV bytes 를 얻습니다. (속성이 없는 기존 이벤트는 그대로 반환)
+- Stream Analytics 입력은 gzip 만 풀 수 있으므로 입력의 "이벤트 압축 형식"을 GZip 으로 바꾼 뒤 켭니다.
+  zstd 는 decode_event 를 쓰는 소비자 전용이며, zstandard 패키지가 없으면 gzip 으로 보냅니다.
+"""
+import gzip
+import logging
+import os
+
+from shared_code import tracing
+
+EVENTHUB_SEND_MODE = os.getenv("EVENTHUB_SEND_MODE", "whole")        # "whole"(기본, 파일 전체를 이벤트 하나로) | "split"(행 단위 분할)
+EVENT_MAX_BYTES = int(os.getenv("EVENT_MAX_BYTES", str(256 * 1024)))  # 이벤트 하나의 최대 본문 크기(바이트)
+STREAM_READ_BYTES = 64 * 1024                                          # 스트림에서 한 번에 읽을 크기(바이트)
+UTF8_BOM = b'\xef\xbb\xbf'
+
+# 이벤트 본문 압축 - "none"(기본, 기존 동작) | "gzip" | "zstd"
+EVENTHUB_COMPRESSION = os.getenv("EVENTHUB_COMPRESSION", "none").lower()
+EVENTHUB_COMPRESSION_LEVEL = os.getenv("EVENTHUB_COMPRESSION_LEVEL")   # 비우면 코덱 기본값 (gzip 6, zstd 3)
+COMPRESS_FILL = 0.95        # 압축 후 크기 목표 (max_event_bytes 대비). 넘치면 행을 덜어 다시 압축
+CSV_CONTENT_TYPE = "text/csv; charset=utf-8"
+CONTENT_TYPES = {'gzip': "application/gzip", 'zstd': "application/zstd"}
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+class EventTooLarge(ValueError):
+    """빈 배치에도 들어가지 않는 이벤트 (파일 전체 또는 한 행이 배치 최대 크기 초과). 행을 버리지 않도록 실행을 실패시킵니다."""
+
+
+def iter_csv_records(text: str):
+    """CSV 문자열을 레코드(줄바꿈 포함) 단위로 나눕니다. 따옴표 안의 줄바꿈은 레코드를 끊지 않습니다."""
+    record = []
+    quotes = 0
+    lines = text.split('\n')
+    last = lines.pop()
+    for line in lines:
+        line += '\n'
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield ''.join(record)
+            record = []
+            quotes = 0
+    if last:
+        record.append(last)
+    if record:
+        yield ''.join(record)
+
+
+def iter_csv_records_from_stream(stream, read_size: int = STREAM_READ_BYTES, strip_bom: bool = False):
+    """입력 스트림을 read_size 씩 읽으며 CSV 레코드를 bytes 로 내보냅니다. (디코딩 없음)"""
+    pending = b''
+    record = []
+    quotes = 0
+    first = True
+    while True:
+        chunk = stream.read(read_size)
+        if not chunk:
+            break
+        if first:
+            first = False
+            while len(chunk) < len(UTF8_BOM):  # BOM 판별을 위해 최소 3바이트 확보
+                more = stream.read(read_size)
+                if not more:
+                    break
+                chunk += more
+            if strip_bom and chunk.startswith(UTF8_BOM):
+                chunk = chunk[len(UTF8_BOM):]
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            line += b'\n'
+            record.append(line)
+            quotes += line.count(b'"')
+            if quotes % 2 == 0:
+                yield b''.join(record)
+                record = []
+                quotes = 0
+    if pending:
+        record.append(pending)
+    if record:
+        yield b''.join(record)
+
+
+def _pack_records(records, max_event_bytes: int):
+    """첫 레코드를 헤더로 보고, 나머지 레코드를 max_event_bytes 이하의 본문들로 묶습니다. (str / bytes 공용)"""
+    header = next(records, None)
+    if header is None:
+        return
+
+    def size_of(rec):
+        return len(rec) if isinstance(rec, bytes) else len(rec.encode('utf-8'))
+
+    header_size = size_of(header)
+    chunk, size = [], header_size
+    for rec in records:
+        rec_size = size_of(rec)
+        if chunk and size + rec_size > max_event_bytes:
+            yield header + header[:0].join(chunk)
+            chunk, size = [], header_size
+        chunk.append(rec)
+        size += rec_size
+    if chunk:
+        yield header + header[:0].join(chunk)
+
+
+def split_csv_events(text: str, max_event_bytes: int = EVENT_MAX_BYTES):
+    """CSV 를 행 경계에서 잘라 max_event_bytes 이하의 이벤트 본문들로 나눕니다. 각 본문 앞에는 헤더를 붙입니다."""
+    return _pack_records(iter_csv_records(text), max_event_bytes)
+
+
+def split_csv_stream_events(stream, max_event_bytes: int = EVENT_MAX_BYTES, strip_bom: bool = False):
+    """split_csv_events 의 스트림 버전. 파일 전체를 메모리에 올리지 않고 bytes 본문을 차례로 만듭니다."""
+    return _pack_records(iter_csv_records_from_stream(stream, strip_bom=strip_bom), max_event_bytes)
+
+
+# =========================================================================
+# === 본문 압축 / 해제 ===
+# =========================================================================
+def _zstd():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def resolve_encoding(encoding: str = None) -> str:
+    """사용할 압축 방식("none" | "gzip" | "zstd")을 정합니다. zstandard 가 없으면 zstd 대신 gzip."""
+    encoding = (encoding or EVENTHUB_COMPRESSION or "none").lower()
+    if encoding not in ("none", "gzip", "zstd"):
+        raise ValueError(f"알 수 없는 Event Hub 압축 방식: {encoding}")
+    if encoding == "zstd" and _zstd() is None:
+        logging.warning("⚠️ zstandard 패키지가 없어 gzip 으로 압축합니다.")
+        return "gzip"
+    return encoding
+
+
+def compress_body(data: bytes, encoding: str, level: int = None) -> bytes:
+    """본문을 gzip / zstd 로 압축합니다. (gzip 은 mtime=0 으로 같은 입력이면 같은 결과)"""
+    if level is None and EVENTHUB_COMPRESSION_LEVEL:
+        level = int(EVENTHUB_COMPRESSION_LEVEL)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    if encoding == "zstd":
+        return _zstd().ZstdCompressor(level=3 if level is None else level).compress(data)
+    raise ValueError(f"알 수 없는 Event Hub 압축 방식: {encoding}")
+
+
+def decompress_body(data: bytes, encoding: str = None) -> bytes:
+    """압축된 본문을 풉니다. encoding 이 없으면 매직 바이트로 판별하고, 압축이 아니면 그대로 반환합니다."""
+    if encoding in (None, "", "identity", "none"):
+        encoding = "gzip" if data[:2] == GZIP_MAGIC else "zstd" if data[:4] == ZSTD_MAGIC else "none"
+    if encoding == "none":
+        return data
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "zstd":
+        zstd = _zstd()
+        if zstd is None:
+            raise RuntimeError("zstd 이벤트를 풀려면 zstandard 패키지가 필요합니다.")
+        # 스트림 압축으로 만든 프레임은 원본 크기가 기록되지 않을 수 있어 stream_reader 로 읽음
+        return zstd.ZstdDecompressor().stream_reader(data).read()
+    raise ValueError(f"알 수 없는 Event Hub 압축 방식: {encoding}")
+
+
+def _property(properties: dict, name: str):
+    """받은 이벤트의 속성 키 / 값은 bytes 로 올 수 있어 str 로 맞춰 찾습니다."""
+    for key, value in (properties or {}).items():
+        if (key.decode("utf-8") if isinstance(key, bytes) else key) == name:
+            return value.decode("utf-8") if isinstance(value, bytes) else value
+    return None
+
+
+def decode_event(event) -> bytes:
+    """소비자용: EventData(또는 수신한 이벤트)의 본문을 압축을 푼 CSV bytes 로 반환합니다.
+
+    content-encoding 속성 → content_type → 매직 바이트 순으로 압축 방식을 판별합니다.
+    """
+    body = event.body
+    if not isinstance(body, (bytes, bytearray)):
+        body = b"".join(p if isinstance(p, (bytes, bytearray)) else str(p).encode("utf-8") for p in body)
+    encoding = _property(getattr(event, "properties", None), "content-encoding")
+    if encoding is None:
+        content_type = getattr(event, "content_type", None) or ""
+        encoding = next((e for e, t in CONTENT_TYPES.items() if content_type.startswith(t)), None)
+    return decompress_body(bytes(body), encoding)
+
+
+def _to_bytes(rec) -> bytes:
+    return rec if isinstance(rec, bytes) else rec.encode('utf-8')
+
+
+def _fit(header: bytes, chunk: list, max_event_bytes: int, encoding: str) -> tuple:
+    """chunk 앞에서부터 압축 후 max_event_bytes 에 들어가는 만큼 묶습니다. 반환: (압축 본문, 원본 크기, 사용한 레코드 수)
+
+    한 레코드만으로도 넘치면 그 레코드 하나를 그대로 반환합니다.
+    (배치에 들어가지 않으면 send_event_bodies 가 EventTooLarge 를 올려 실행이 실패함)
+    """
+    n = len(chunk)
+    while True:
+        raw = header + b''.join(chunk[:n])
+        payload = compress_body(raw, encoding)
+        if len(payload) <= max_event_bytes or n == 1:
+            return payload, len(raw), n
+        # 넘친 비율만큼 레코드를 덜어 다시 압축 (최소 1개씩은 줄임)
+        n = max(1, min(n - 1, int(n * max_event_bytes * COMPRESS_FILL / len(payload))))
+
+
+def _pack_compressed(records, max_event_bytes: int, encoding: str):
+    """_pack_records 의 압축 버전. 압축 후 크기가 max_event_bytes 이하가 되도록 묶어 (압축 본문, 원본 크기) 를 내보냅니다.
+
+    지금까지 관찰한 압축률로 원본 기준 목표 크기를 잡고, 목표에 닿으면 실제로 압축해 봅니다.
+    압축 결과가 목표보다 많이 작으면 압축률을 고쳐 더 모으고, 넘치면 넘친 만큼 덜어 냅니다.
+    """
+    header = next(records, None)
+    if header is None:
+        return
+    header = _to_bytes(header)
+    ratio = 1.0                         # 원본 / 압축 크기 (처음엔 압축 안 된다고 보고 시작)
+    chunk, size = [], len(header)
+    for rec in records:
+        rec = _to_bytes(rec)
+        chunk.append(rec)
+        size += len(rec)
+        if size < max_event_bytes * ratio * COMPRESS_FILL:
+            continue
+        payload, raw_size, n = _fit(header, chunk, max_event_bytes, encoding)
+        ratio = max(raw_size / len(payload), 1.0)
+        if n == len(chunk) and len(payload) < max_event_bytes * COMPRESS_FILL * 0.9:
+            continue                    # 아직 여유가 있으니 고친 압축률로 더 모음
+        yield payload, raw_size
+        chunk = chunk[n:]
+        size = len(header) + sum(len(r) for r in chunk)
+    while chunk:
+        payload, raw_size, n = _fit(header, chunk, max_event_bytes, encoding)
+        yield payload, raw_size
+        chunk = chunk[n:]
+
+
+def compression_summary(stats: dict) -> str:
+    """전송 통계의 압축 결과를 로그용 문자열로 만듭니다. (압축하지 않았으면 빈 문자열)"""
+    if stats.get('encoding', "none") == "none" or not stats['bytes']:
+        return ""
+    return (f" | {stats['encoding']} {stats['raw_bytes']} → {stats['bytes']} bytes"
+            f" ({stats['raw_bytes'] / stats['bytes']:.1f}배)")
+
+
+# =========================================================================
+# === 전송 ===
+# =========================================================================
+def _try_add(batch, event) -> bool:
+    try:
+        batch.add(event)
+        return True
+    except ValueError:  # 배치 최대 크기 초과
+        return False
+
+
+def _make_event(body, encoding: str):
+    from azure.eventhub import EventData
+
+    if encoding == "none":
+        return EventData(body), None
+    payload, raw_size = body
+    event = EventData(payload)
+    event.content_type = CONTENT_TYPES[encoding]
+    event.properties = {'content-encoding': encoding, 'content-type': CSV_CONTENT_TYPE,
+                        'uncompressed-bytes': raw_size}
+    return event, raw_size
+
+
+def send_event_bodies(producer, bodies, encoding: str = "none") -> dict:
+    """이벤트 본문들을 EventDataBatch 최대 크기까지 채워 가며 전송합니다.
+
+    encoding 이 "none" 이 아니면 bodies 는 (압축 본문, 원본 크기) 쌍이고, 압축 속성을 붙여 보냅니다.
+    빈 배치에도 들어가지 않는 이벤트가 있으면 EventTooLarge 를 올립니다. (direct 모드에서 커서가 넘어가지 않도록)
+    """
+    stats = {'events': 0, 'batches': 0, 'bytes': 0, 'raw_bytes': 0, 'encoding': encoding}
+    batch = producer.create_batch()
+    in_batch = 0
+    for body in bodies:
+        event, raw_size = _make_event(body, encoding)
+        if raw_size is not None:
+            body = body[0]
+        size = len(body.encode('utf-8')) if isinstance(body, str) else len(body)
+        if not _try_add(batch, event):
+            if in_batch:
+                producer.send_batch(batch)
+                stats['batches'] += 1
+                batch = producer.create_batch()
+                in_batch = 0
+            if not _try_add(batch, event):
+                raise EventTooLarge(f"이벤트 하나({size} bytes)가 배치 최대 크기를 넘습니다. "
+                                    f"EVENTHUB_SEND_MODE=split 이고 EVENT_MAX_BYTES 가 너무 크지 않은지 확인하세요.")
+        in_batch += 1
+        stats['events'] += 1
+        stats['bytes'] += size
+        stats['raw_bytes'] += size if raw_size is None else raw_size
+    if in_batch:
+        producer.send_batch(batch)
+        stats['batches'] += 1
+    return stats
+
+
+def _send_attributes(stats: dict) -> dict:
+    return {'events': stats['events'], 'batches': stats['batches'], 'payload.bytes': stats['bytes'],
+            'payload.raw_bytes': stats['raw_bytes'], 'compression': stats['encoding']}
+
+
+def _whole(body, encoding: str):
+    if encoding == "none":
+        return [body]
+    raw = _to_bytes(body)
+    return [(compress_body(raw, encoding), len(raw))]
+
+
+def _split(records, max_event_bytes: int, encoding: str):
+    if encoding == "none":
+        return _pack_records(records, max_event_bytes)
+    return _pack_compressed(records, max_event_bytes, encoding)
+
+
+@tracing.traced("eventhub.send_csv", on_result=_send_attributes)
+def send_csv(producer, text: str, mode: str = None, max_event_bytes: int = EVENT_MAX_BYTES,
+             encoding: str = None) -> dict:
+    """CSV 문자열을 Event Hub 로 전송합니다. mode="whole" 이면 기존처럼 파일 전체를 이벤트 하나로 보냅니다.
+    encoding 을 주지 않으면 EVENTHUB_COMPRESSION 을 따릅니다."""
+    mode = mode or EVENTHUB_SEND_MODE
+    encoding = resolve_encoding(encoding)
+    tracing.set_attributes(mode=mode)
+    if mode == "whole":
+        return send_event_bodies(producer, _whole(text, encoding), encoding)
+    if mode == "split":
+        return send_event_bodies(producer, _split(iter_csv_records(text), max_event_bytes, encoding), encoding)
+    raise ValueError(f"알 수 없는 Event Hub 전송 모드: {mode}")
+
+
+@tracing.traced("eventhub.send_csv_stream", on_result=_send_attributes)
+def send_csv_stream(producer, stream, strip_bom: bool = False, mode: str = None,
+                    max_event_bytes: int = EVENT_MAX_BYTES, encoding: str = None) -> dict:
+    """Blob 입력 스트림을 bytes 그대로 전송합니다.
+
+    mode="split" 이면 스트림을 조금씩 읽어 가며 보내므로 최대 메모리가 파일 크기가 아니라 배치 크기에 비례합니다.
+    mode="whole"(기본) 이면 기존처럼 파일 전체를 읽어 이벤트 하나(bytes)로 보냅니다. (메모리 = 파일 크기)
+    """
+    mode = mode or EVENTHUB_SEND_MODE
+    encoding = resolve_encoding(encoding)
+    tracing.set_attributes(mode=mode, blob=getattr(stream, "name", None))
+    if mode == "whole":
+        body = stream.read()
+        if strip_bom and body.startswith(UTF8_BOM):
+            body = body[len(UTF8_BOM):]
+        return send_event_bodies(producer, _whole(body, encoding), encoding)
+    if mode == "split":
+        records = iter_csv_records_from_stream(stream, strip_bom=strip_bom)
+        return send_event_bodies(producer, _split(records, max_event_bytes, encoding), encoding)
+    raise ValueError(f"알 수 없는 Event Hub 전송 모드: {mode}")
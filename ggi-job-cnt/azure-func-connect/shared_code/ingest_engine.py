@@ -0,0 +1,234 @@
+"""여러 지역 채용 API 를 한 번의 실행에서 함께 수집하는 통합 수집 엔진.
+
+소스마다 다른 부분(API 호출, 전처리, 파일 이름, 기존 상태 형식)은 SourceAdapter 로 감싸고,
+커서 저장 / 중복 제거 / CSV·Parquet 저장은 모든 소스가 같은 경로를 씁니다.
+클라이언트는 resource_pool 하나를 공유하고, 소스들은 스레드로 동시에 수집합니다.
+새 지역 API 는 SourceAdapter 를 상속해 fetch / transform / output_name 만 구현하면 됩니다.
+
+DELIVERY_MODE=direct 이고 어댑터가 eventhub_target 을 돌려주면, 결과를 Blob 트리거 대신 바로 Event Hub 로 보내고
+Blob 에는 archive_location 이 가리키는 곳에 보관본만 백그라운드로 남깁니다. (shared_code/delivery.py)
+
+커서는 cursor_store(ETag 조건부 쓰기 + lease)로 저장하므로, 같은 소스를 소스별 기존 타이머와
+통합 타이머가 함께 돌려도 한 번에 한 실행만 수집합니다. 기본 위치는 {INGEST_STATE_CONTAINER}/ingest/{name}.json 입니다.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from shared_code import resource_pool, dedupe_index, parquet_sink, cursor_store, tracing, delivery, eventhub_sink
+from shared_code import job_counts, raw_archive, blob_layout
+
+INGEST_STATE_CONTAINER = os.getenv("INGEST_STATE_CONTAINER", "function-state")   # 소스별 커서를 저장할 컨테이너
+CURSOR_PREFIX = "ingest/"
+
+
+class SourceAdapter:
+    """수집 소스 하나를 엔진에 연결하는 어댑터 기본 클래스."""
+
+    name = None                                         # 소스 이름 (커서 Blob 이름, 로그에 사용)
+    container = None                                    # 결과 파일을 저장할 컨테이너
+    dedupe_blob = None                                  # 중복 제거 인덱스 Blob 경로 (None 이면 중복 제거 안 함)
+    dedupe_container = dedupe_index.DEDUPE_CONTAINER    # 중복 제거 인덱스 컨테이너
+    dedupe_key_columns = None                           # 같은 공고로 볼 식별 컬럼 (transform 결과 기준)
+    initial_cursor = 1                                  # 처음 수집할 위치
+
+    def __init__(self, storage_conn: str = None):
+        # 결과 파일 / 중복 제거 인덱스를 저장할 스토리지 (None 이면 엔진의 스토리지)
+        self.storage_conn = storage_conn
+
+    def legacy_cursor(self, conn_str: str):
+        """커서 Blob 이 아직 없을 때 기존 상태에서 이어받을 커서를 반환합니다. (없으면 None)"""
+        return None
+
+    def cursor_store(self, conn_str: str) -> cursor_store.CursorStore:
+        """소스의 커서 저장소를 반환합니다. 기존 트리거와 커서를 공유하려면 이 메서드를 재정의합니다."""
+        return cursor_store.CursorStore(
+            conn_str, INGEST_STATE_CONTAINER, f"{CURSOR_PREFIX}{self.name}.json", default=self.initial_cursor,
+            legacy=lambda: self.legacy_cursor(self.storage_conn or conn_str),
+        )
+
+    def fetch(self, cursor, claim) -> tuple:
+        """cursor 부터 수집해 (records(list 또는 DataFrame), 다음 cursor) 를 반환합니다.
+        claim.state 로 저장된 상태를 읽고, claim.fields 에 넣은 값은 커서와 함께 저장됩니다."""
+        raise NotImplementedError
+
+    def transform(self, records) -> tuple:
+        """(정제된 DataFrame, CSV 헤더 또는 None) 을 반환합니다."""
+        raise NotImplementedError
+
+    def page_rows(self, body) -> list:
+        """보관한 API 응답 JSON 한 페이지에서 레코드 목록을 꺼냅니다. (RAW_ARCHIVE replay 용, shared_code/raw_archive.py)"""
+        raise NotImplementedError
+
+    def output_name(self, cursor, ext: str) -> str:
+        """cursor 부터 수집한 결과를 저장할 Blob 경로를 반환합니다. (ext: "csv" | "parquet")
+        BLOB_LAYOUT=partitioned 를 따르려면 blob_layout.place 로 이름을 만듭니다."""
+        raise NotImplementedError
+
+    def eventhub_target(self):
+        """DELIVERY_MODE=direct 일 때 결과를 바로 보낼 (Event Hub 연결 문자열, 이름). None 이면 기존처럼 Blob 트리거가 전송."""
+        return None
+
+    def archive_location(self, name: str) -> tuple:
+        """direct 모드에서 output_name 의 보관본을 쓸 (컨테이너, Blob 경로). Blob 트리거가 감시하지 않는 곳이어야 합니다."""
+        raise NotImplementedError
+
+
+# =========================================================================
+# === 공용 저장 경로 (중복 제거 → Parquet / CSV 업로드) ===
+# =========================================================================
+def _upload(conn_str: str, container: str, name: str, data: bytes, rows: int = None, cursor=None) -> None:
+    with tracing.span("blob.upload", container=container, blob=name, **{'payload.bytes': len(data)}):
+        resource_pool.with_blob_service(
+            conn_str, lambda svc: svc.get_blob_client(container, name).upload_blob(data, overwrite=True)
+        )
+    blob_layout.record(conn_str, container, name, rows, len(data), _int_cursor(cursor))   # 파티션 이름일 때만 manifest 에 기록
+
+
+def _int_cursor(cursor):
+    """manifest 의 커서 범위에는 정수 커서만 (replay 의 "replay{위치}" 같은 값은 뺌)"""
+    return cursor if isinstance(cursor, int) else None
+
+
+def _csv_bytes(df, header) -> bytes:
+    return df.to_csv(index=False, header=header if header is not None else True,
+                     encoding="utf-8-sig").encode("utf-8-sig")
+
+
+def _deliver_direct(store: str, adapter: SourceAdapter, target, df, header, cursor) -> str:
+    """Event Hub 로 바로 보내고, 보관본(OUTPUT_FORMAT 그대로)은 백그라운드 업로드에 맡깁니다. 반환: 보관 파일명
+    target 이 None 이면 (JOB_COUNTS_MODE=only) 원본 행은 보내지 않고 보관본만 남깁니다."""
+    if target is not None:
+        stats = delivery.send_frame(*target, df, header)
+        logging.info(f"📨 [{adapter.name}] Event Hub 직접 전송: {len(df)}건 | 이벤트 {stats['events']}개"
+                     f"{eventhub_sink.compression_summary(stats)}")
+    filename = None
+    outputs = []
+    if parquet_sink.writes_parquet():
+        outputs.append((adapter.output_name(cursor, "parquet"), lambda: parquet_sink.to_parquet_bytes(df, header)))
+    if parquet_sink.writes_csv():
+        outputs.append((adapter.output_name(cursor, "csv"), lambda: _csv_bytes(df, header)))
+    for name, encode in outputs:
+        container, filename = adapter.archive_location(name)
+        data = encode()
+        delivery.ARCHIVE.submit(store, container, filename, data, create_container=True,
+                                after=lambda c=container, n=filename, size=len(data): blob_layout.record(
+                                    store, c, n, len(df), size, _int_cursor(cursor)))
+    return filename
+
+
+def write_outputs(conn_str: str, adapter: SourceAdapter, df, header, cursor) -> tuple:
+    """정제된 df 를 OUTPUT_FORMAT 에 맞춰 저장합니다. 반환: (저장 건수, 파일명 또는 None)
+
+    DELIVERY_MODE=direct 이고 어댑터에 Event Hub 가 설정돼 있으면 바로 전송하고 보관본은 백그라운드로 올립니다.
+    JOB_COUNTS_MODE 가 켜져 있으면 직무 코드별 건수도 집계해 보냅니다. ("only" 면 원본 행은 보관본만)
+    """
+    store = adapter.storage_conn or conn_str
+
+    dedupe, pending = None, []
+    if dedupe_index.DEDUPE_ENABLED and adapter.dedupe_blob:
+        dedupe = dedupe_index.load_index(store, adapter.dedupe_blob, adapter.dedupe_container)
+        df, pending = dedupe.filter_new(df, adapter.dedupe_key_columns)
+        logging.info(f"🧬 [{adapter.name}] 중복 제거: 새/변경 {len(df)}건 | 누적 {dedupe.stats()}")
+        if df.empty:
+            return 0, None
+
+    filename = None
+    target = adapter.eventhub_target() if delivery.is_direct() and job_counts.streams_raw() else None
+    if target is not None or not job_counts.streams_raw():
+        filename = _deliver_direct(store, adapter, target, df, header, cursor)
+    else:
+        if parquet_sink.writes_parquet():
+            filename = adapter.output_name(cursor, "parquet")
+            _upload(store, adapter.container, filename, parquet_sink.to_parquet_bytes(df, header), len(df), cursor)
+        if parquet_sink.writes_csv():
+            filename = adapter.output_name(cursor, "csv")
+            _upload(store, adapter.container, filename, _csv_bytes(df, header), len(df), cursor)
+        logging.info(f"✅ [{adapter.name}] Blob 업로드 완료: {adapter.container}/{filename} ({len(df)}건)")
+    if parquet_sink.OUTPUT_FORMAT == "both":
+        logging.info(f"📦 [{adapter.name}] CSV vs Parquet 비교: {parquet_sink.compare_with_csv(df, header)}")
+
+    if job_counts.is_enabled():
+        counts = job_counts.JobCounts()
+        counts.add_frame(df, adapter.name, header)
+        job_counts.send(counts)
+
+    # 업로드(direct 모드는 Event Hub 전송)가 끝난 행만 인덱스에 반영
+    if dedupe is not None:
+        dedupe.commit(pending)
+        dedupe_index.save_index(dedupe)
+    return len(df), filename
+
+
+# =========================================================================
+# === 엔진 ===
+# =========================================================================
+class IngestEngine:
+    """등록된 소스들을 한 번의 실행에서 동시에 수집합니다. 한 소스의 실패는 다른 소스에 영향을 주지 않습니다."""
+
+    def __init__(self, adapters: list, storage_conn: str, max_workers: int = None):
+        self.adapters = list(adapters)
+        self.storage_conn = storage_conn
+        self.max_workers = max_workers or max(len(self.adapters), 1)
+
+    def run_source(self, adapter: SourceAdapter) -> dict:
+        """소스 하나를 커서 claim → 수집 → 전처리 → 저장 → 커서 commit 순으로 처리합니다."""
+        with tracing.span("ingest.source", source=adapter.name) as sp:
+            result = self._run_source(adapter)
+            sp.set_attributes({k: v for k, v in result.items() if v is not None})
+            if result['error']:
+                sp.set_status("ERROR", result['error'])
+            return result
+
+    def _run_source(self, adapter: SourceAdapter) -> dict:
+        started = time.perf_counter()
+        result = {'source': adapter.name, 'fetched': 0, 'saved': 0, 'file': None, 'cursor': None,
+                  'skipped': False, 'error': None}
+        store, claim, start = None, None, None
+        try:
+            store = adapter.cursor_store(self.storage_conn)
+            claim = store.claim()
+            if claim is None:
+                result['skipped'] = True    # 다른 실행이 이 소스를 수집 중
+                return result
+
+            records, next_cursor = adapter.fetch(claim.cursor, claim)
+            # fetch 가 커서 단위를 바꿨을 수 있음 (경기 페이지 크기 환산) - 파일 이름 / manifest 도 저장될 커서와 같은 단위로
+            start = claim.cursor
+            result['fetched'] = len(records)
+
+            if len(records):
+                df, header = adapter.transform(records)
+                result['saved'], result['file'] = write_outputs(self.storage_conn, adapter, df, header, start)
+
+            # 저장까지 끝난 뒤에만 커서를 옮김 (수집 실패면 그대로)
+            # 커서가 그대로여도 commit 으로 lease 를 해제하면서 fetch 가 claim.fields 에 넣은 값을 함께 저장
+            store.commit(claim, next_cursor)
+            result['cursor'] = next_cursor
+        except Exception as e:
+            logging.exception(f"❌ [{adapter.name}] 수집 실패")
+            result['error'] = str(e)
+        finally:
+            if claim is not None:
+                store.release(claim)    # commit 하지 않았으면 lease 만 해제
+            # RAW_ARCHIVE=1: 커서가 지나간 범위의 원본 응답만 보관
+            raw_archive.flush(adapter.storage_conn or self.storage_conn, adapter.name, start, claim)
+            result['seconds'] = round(time.perf_counter() - started, 3)
+        return result
+
+    def run_once(self) -> list:
+        """모든 소스를 동시에 한 번씩 수집하고 소스별 결과 목록을 반환합니다."""
+        if not self.adapters:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(tracing.bind(self.run_source), self.adapters))
+        delivery.drain_archive()    # direct 모드의 보관본 업로드가 끝날 때까지 (실행이 끝나기 전에)
+        for r in results:
+            if r['skipped']:
+                logging.info(f"🔒 [{r['source']}] 다른 실행이 수집 중이라 건너뜀")
+                continue
+            logging.info(f"📥 [{r['source']}] 수집 {r['fetched']}건 / 저장 {r['saved']}건 | "
+                         f"파일 {r['file']} | 다음 커서 {r['cursor']} | {r['seconds']}s"
+                         + (f" | 오류 {r['error']}" if r['error'] else ""))
+        return results
@@ -0,0 +1,325 @@
+"""OpenAPI 원본 응답(JSON 페이지) 보관과 API 호출 없는 고속 재처리(replay).
+
+clean_dataframe / preprocess_jobs 로직이 바뀌면 지금까지는 OpenAPI 를 tick 마다 한 청크씩 다시 긁는 수밖에 없었습니다.
+
+RAW_ARCHIVE=1 이면 (기본은 끔)
+- 서울 request_range / 경기 fetch_jobs 가 받은 JSON 응답 중 행이 있는 페이지를 커서 claim 별 버퍼에 모아 두고,
+- 실행이 끝날 때 flush 가 커서가 실제로 지나간(commit 된) 범위의 페이지만 골라
+  RAW_ARCHIVE_CONTAINER 의 시간 단위 Append Blob(raw/{소스}/YYYY/MM/DD/HH.jsonl.gz, KST)에 gzip 멤버 하나로 덧붙입니다.
+  실패 / lease 만 해제한 실행의 페이지는 버립니다. (커서가 그대로이므로 다음 실행에서 다시 받아 보관됨 → 중복 없음)
+  lease 를 얻지 못한 실행(claim 이 None)은 아무것도 건드리지 않으므로, 같은 워커에서 겹친 실행이 다른 실행의 페이지를 버리지 않습니다.
+- 한 줄 = 페이지 하나 {"source", "fetched_at", "position", "request", "body"} (body 는 API 응답 JSON 그대로)
+  gzip 멤버를 이어 붙인 파일이라 zcat / gzip.decompress 로 그대로 읽힙니다.
+- 보관에 실패해도 수집 결과와 커서는 되돌리지 않습니다. (경고만 남김)
+
+replay 는 보관 Blob 을 병렬로 미리 내려받으면서 페이지마다 어댑터의 transform(clean_records / preprocess_jobs)과
+저장 경로(ingest_engine.write_outputs 또는 로컬 CSV)에 넘깁니다. API 호출과 1분 간격 없이 CPU 가 허락하는 만큼 돌므로
+몇 주 분량도 몇 분 안에 끝납니다. 페이지(= 실시간 tick) 단위로 전처리하므로 작은 tick 은 pandas 없는 레코드 경로를 타고,
+큰 묶음으로 pandas 엔진을 돌릴 때보다 빠르며 실시간 수집과 같은 CSV 행이 나옵니다. (benchmarks/bench_replay.py)
+    cd ggi-job-cnt/azure-func-connect
+    python -m shared_code.raw_archive --source gg --since 2026-10-01 --until 2026-10-14 --sink dir --out ./replay
+--sink outputs 는 실시간 수집과 같은 경로(Blob 트리거 경로 또는 DELIVERY_MODE=direct)로 저장하므로 Event Hub 로 다시 나갑니다.
+"""
+import argparse
+import gzip
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from shared_code import resource_pool, tracing
+
+RAW_ARCHIVE = os.getenv("RAW_ARCHIVE", "0") == "1"                            # 1 이면 원본 응답 보관
+RAW_ARCHIVE_CONTAINER = os.getenv("RAW_ARCHIVE_CONTAINER", "raw-archive")     # Blob 트리거가 감시하지 않는 컨테이너
+RAW_PREFIX = "raw/"
+RAW_SUFFIX = ".jsonl.gz"
+APPEND_BLOCK_MAX = 4 * 1024 * 1024          # Append Blob 블록 하나의 최대 크기 - 압축 전 기준으로 나눔 (압축 후는 항상 더 작음)
+RAW_REPLAY_FILE_ROWS = int(os.getenv("RAW_REPLAY_FILE_ROWS", "100000"))     # replay --sink dir 출력 파일 하나의 최대 건수
+RAW_REPLAY_WORKERS = int(os.getenv("RAW_REPLAY_WORKERS", "8"))               # 보관 Blob 을 동시에 내려받을 스레드 수
+KST = ZoneInfo("Asia/Seoul")
+
+# replay 에 쓰는 소스 어댑터 (function_app.INGEST_ADAPTERS 와 같은 이름)
+ADAPTERS = {
+    "gg": ("shared_code.gg_jobs", "GyeonggiJobsAdapter"),
+    "seoul": ("shared_code.seoul_jobs", "SeoulJobsAdapter"),
+}
+
+# (소스, id(claim)) -> [(position, JSON 한 줄 bytes)] - 실행마다 자기 claim 의 버퍼만 채우고 flush 함
+_PENDING = {}
+_LOCK = threading.Lock()
+
+
+# =========================================================================
+# === 보관 (capture → flush) ===
+# =========================================================================
+def capture(source: str, claim, position: int, request: dict, body) -> None:
+    """API 응답 하나를 claim 의 보관 대기열에 넣습니다. position 은 커서와 같은 단위(서울 start_index, 경기 페이지).
+    claim 이 없으면(커서 없이 호출한 수집) 보관하지 않습니다."""
+    if not RAW_ARCHIVE or claim is None:
+        return
+    line = json.dumps({'source': source, 'fetched_at': datetime.now(KST).isoformat(timespec="seconds"),
+                       'position': position, 'request': request, 'body': body},
+                      ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+    with _LOCK:
+        _PENDING.setdefault((source, id(claim)), []).append((position, line))
+
+
+def _committed(position: int, start: int, end: int) -> bool:
+    """커서가 start → end 로 옮겨졌을 때 position 의 페이지가 그 안에 있는지. (end <= start 면 끝까지 받고 처음으로 돌아간 것)"""
+    if end > start:
+        return start <= position < end
+    return position >= start
+
+
+def blob_name(source: str, when: datetime) -> str:
+    return f"{RAW_PREFIX}{source}/{when.strftime('%Y/%m/%d/%H')}{RAW_SUFFIX}"
+
+
+def encode_blocks(lines: list) -> list:
+    """JSON 줄들을 APPEND_BLOCK_MAX 이하로 나눠 각각 gzip 멤버로 압축합니다."""
+    blocks, chunk, size = [], [], 0
+    for line in lines:
+        if chunk and size + len(line) > APPEND_BLOCK_MAX:
+            blocks.append(gzip.compress(b"".join(chunk), mtime=0))
+            chunk, size = [], 0
+        chunk.append(line)
+        size += len(line)
+    if chunk:
+        blocks.append(gzip.compress(b"".join(chunk), mtime=0))
+    return blocks
+
+
+def _append(conn_str: str, name: str, blocks: list) -> int:
+    """Append Blob 에 blocks 를 차례로 덧붙입니다. (Blob / 컨테이너가 없으면 한 번만 만듦) 반환: 쓴 바이트 수"""
+    from azure.core import MatchConditions
+    from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+    def create(blob):
+        try:
+            blob.create_append_blob(match_condition=MatchConditions.IfMissing)
+        except ResourceExistsError:
+            pass    # 같은 시간대에 이미 만들어 둔 Blob
+
+    def append(blob):
+        for data in blocks:
+            blob.append_block(data)
+
+    run = lambda fn: resource_pool.with_blob_service(
+        conn_str, lambda svc: fn(svc.get_blob_client(RAW_ARCHIVE_CONTAINER, name)))
+    with tracing.span("raw.append", container=RAW_ARCHIVE_CONTAINER, blob=name,
+                      **{'payload.bytes': sum(len(b) for b in blocks)}):
+        try:
+            run(append)
+        except ResourceNotFoundError:
+            try:
+                run(create)
+            except ResourceNotFoundError:
+                resource_pool.container_client(conn_str, RAW_ARCHIVE_CONTAINER, create=True)
+                run(create)
+            run(append)
+    return sum(len(b) for b in blocks)
+
+
+def flush(conn_str: str, source: str, start, claim) -> int:
+    """실행이 끝날 때(commit / release 뒤) 호출합니다. claim 이 모은 페이지 중 커서가 start 에서 옮겨 간 범위만 보관하고
+    나머지는 버립니다. claim 이 None(lease 를 얻지 못한 실행)이면 아무것도 하지 않습니다. 반환: 보관한 페이지 수"""
+    if claim is None:
+        return 0
+    with _LOCK:
+        pending = _PENDING.pop((source, id(claim)), [])
+    if not pending:
+        return 0
+
+    moved = claim.done and not claim.released and start is not None
+    kept = [(pos, line) for pos, line in pending if moved and _committed(pos, start, claim.cursor)]
+    if len(kept) < len(pending):
+        logging.info(f"🗃️ [{source}] 커서가 지나가지 않은 원본 페이지 {len(pending) - len(kept)}개는 보관하지 않음 "
+                     f"(다음 실행에서 다시 받음)")
+    if not kept:
+        return 0
+
+    kept.sort(key=lambda item: item[0])     # 병렬 요청은 끝난 순서로 들어오므로 커서 순서로
+    name = blob_name(source, datetime.now(KST))
+    try:
+        written = _append(conn_str, name, encode_blocks([line for _, line in kept]))
+    except Exception as e:
+        logging.warning(f"⚠️ [{source}] 원본 응답 보관 실패 (수집 결과와 커서는 그대로): {e}")
+        return 0
+    logging.info(f"🗃️ [{source}] 원본 응답 {len(kept)}페이지 보관: {RAW_ARCHIVE_CONTAINER}/{name} (+{written} bytes)")
+    return len(kept)
+
+
+# =========================================================================
+# === 읽기 ===
+# =========================================================================
+def _hour_key(value: str, end: bool = False) -> str:
+    """"2026-10-01" / "2026-10-01T09" → Blob 이름과 같은 "2026/10/01/09" (시간이 없으면 그날 00시 또는 23시)"""
+    day, _, hour = value.strip().replace("T", " ").partition(" ")
+    y, m, d = day.split("-")
+    hour = int(hour[:2]) if hour else (23 if end else 0)
+    return f"{y}/{m}/{d}/{hour:02d}"
+
+
+def list_archives(conn_str: str, source: str, since: str = None, until: str = None) -> list:
+    """source 의 보관 Blob 이름을 시간 순서로 반환합니다. since / until(포함)은 "YYYY-MM-DD[THH]" (KST)."""
+    prefix = f"{RAW_PREFIX}{source}/"
+    lo = _hour_key(since) if since else None
+    hi = _hour_key(until, end=True) if until else None
+    names = []
+    for blob in resource_pool.container_client(conn_str, RAW_ARCHIVE_CONTAINER).list_blobs(name_starts_with=prefix):
+        name = blob.name if hasattr(blob, "name") else blob
+        if not name.endswith(RAW_SUFFIX):
+            continue
+        key = name[len(prefix):-len(RAW_SUFFIX)]
+        if (lo is None or key >= lo) and (hi is None or key <= hi):
+            names.append(name)
+    return sorted(names)
+
+
+def parse_archive(data: bytes) -> list:
+    """보관 Blob(gzip 멤버를 이어 붙인 JSON Lines) 하나를 페이지 dict 목록으로 풉니다."""
+    return [json.loads(line) for line in gzip.decompress(data).splitlines() if line]
+
+
+def read_archive(conn_str: str, name: str) -> list:
+    data = resource_pool.with_blob_service(
+        conn_str, lambda svc: svc.get_blob_client(RAW_ARCHIVE_CONTAINER, name).download_blob().readall())
+    return parse_archive(data)
+
+
+def iter_pages(conn_str: str, names: list, workers: int = RAW_REPLAY_WORKERS):
+    """names 의 페이지를 순서대로 내놓습니다. 앞의 Blob 을 처리하는 동안 뒤의 Blob 을 workers 개까지 미리 내려받습니다."""
+    with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="raw-replay") as pool:
+        queue, names = deque(), iter(names)
+        for name in names:
+            queue.append(pool.submit(read_archive, conn_str, name))
+            if len(queue) >= workers * 2:
+                break
+        while queue:
+            pages = queue.popleft().result()
+            for name in names:
+                queue.append(pool.submit(read_archive, conn_str, name))
+                break
+            yield from pages
+
+
+# =========================================================================
+# === replay ===
+# =========================================================================
+def load_adapter(source: str):
+    module, cls = ADAPTERS[source]
+    return getattr(importlib.import_module(module), cls)()
+
+
+class DirWriter:
+    """replay 결과 CSV(UTF-8-SIG)를 out_dir/{소스}/replay_NNNNN.csv 에 이어 씁니다.
+    헤더는 파일마다 한 번, file_rows 건을 넘기면 새 파일로 넘어갑니다."""
+
+    def __init__(self, out_dir: str, source: str, file_rows: int = RAW_REPLAY_FILE_ROWS):
+        self.dir = os.path.join(out_dir, source)
+        self.file_rows = file_rows
+        self.files = 0
+        self.bytes = 0
+        self._f = None
+        self._rows = 0
+        os.makedirs(self.dir, exist_ok=True)
+
+    def write(self, df, header) -> None:
+        if self._f is None or self._rows >= self.file_rows:
+            self.close()
+            self._f = open(os.path.join(self.dir, f"replay_{self.files:05d}.csv"), "wb")
+            self.files += 1
+            data = df.to_csv(index=False, header=header if header is not None else True).encode("utf-8-sig")
+        else:
+            data = df.to_csv(index=False, header=False).encode("utf-8")
+        self._f.write(data)
+        self._rows += len(df)
+        self.bytes += len(data)
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f, self._rows = None, 0
+
+
+def replay(adapter, conn_str: str, since: str = None, until: str = None, sink: str = "none", out_dir: str = None,
+           file_rows: int = RAW_REPLAY_FILE_ROWS, workers: int = RAW_REPLAY_WORKERS) -> dict:
+    """보관한 원본 응답을 API 호출 없이 전처리 / 저장 경로로 다시 흘려 보냅니다.
+
+    페이지마다 실시간 tick 과 같은 크기로 adapter.transform 을 돌리므로 (작은 tick 은 pandas 없는 레코드 경로)
+    같은 페이지면 실시간 수집과 같은 CSV 행이 나옵니다.
+    sink: "none"(전처리만) | "dir"(out_dir/{소스}/replay_NNNNN.csv, file_rows 건마다 새 파일)
+          | "outputs"(ingest_engine.write_outputs - 실시간 수집과 같은 저장 경로, 페이지마다 파일 하나)
+    반환: {'source', 'blobs', 'pages', 'rows', 'saved', 'files', 'bytes', 'seconds', 'rows_per_sec'}
+    """
+    if sink not in ("none", "dir", "outputs"):
+        raise ValueError(f"알 수 없는 replay sink: {sink}")
+    if sink == "dir" and not out_dir:
+        raise ValueError("sink=dir 에는 out_dir 가 필요합니다.")
+    store = adapter.storage_conn or conn_str
+    names = list_archives(store, adapter.name, since, until)
+    stats = {'source': adapter.name, 'blobs': len(names), 'pages': 0, 'rows': 0, 'saved': 0, 'files': 0, 'bytes': 0}
+    writer = DirWriter(out_dir, adapter.name, file_rows) if sink == "dir" else None
+    if sink == "outputs":
+        from shared_code import delivery, ingest_engine
+    started = time.perf_counter()
+
+    try:
+        with tracing.span("raw.replay", source=adapter.name, blobs=len(names)):
+            for page in iter_pages(store, names, workers):
+                rows = adapter.page_rows(page['body'])
+                stats['pages'] += 1
+                stats['rows'] += len(rows)
+                if not rows:
+                    continue
+                df, header = adapter.transform(rows)
+                if writer is not None:
+                    writer.write(df, header)
+                    stats['saved'] += len(df)
+                elif sink == "outputs":
+                    saved, filename = ingest_engine.write_outputs(store, adapter, df, header,
+                                                                  f"replay{page['position']}")
+                    stats['saved'] += saved
+                    stats['files'] += filename is not None
+    finally:
+        if writer is not None:
+            writer.close()
+            stats['files'], stats['bytes'] = writer.files, writer.bytes
+    if sink == "outputs":
+        delivery.drain_archive()
+
+    stats['seconds'] = round(time.perf_counter() - started, 3)
+    stats['rows_per_sec'] = round(stats['rows'] / stats['seconds'], 1) if stats['seconds'] else None
+    logging.info(f"⏪ [{adapter.name}] replay 완료: {stats}")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=sorted(ADAPTERS), required=True)
+    parser.add_argument("--since", help="이 시간부터 (YYYY-MM-DD 또는 YYYY-MM-DDTHH, KST)")
+    parser.add_argument("--until", help="이 시간까지 포함 (YYYY-MM-DD 또는 YYYY-MM-DDTHH, KST)")
+    parser.add_argument("--sink", choices=["none", "dir", "outputs"], default="none",
+                        help="none: 전처리만 / dir: --out 에 CSV / outputs: 실시간 수집과 같은 저장 경로 (Event Hub 로 다시 나감)")
+    parser.add_argument("--out", help="--sink dir 의 출력 디렉터리")
+    parser.add_argument("--conn", default=os.getenv("AzureWebJobsStorage"), help="보관 Blob 이 있는 스토리지 연결 문자열")
+    parser.add_argument("--file-rows", type=int, default=RAW_REPLAY_FILE_ROWS, help="--sink dir 출력 파일 하나의 최대 건수")
+    parser.add_argument("--workers", type=int, default=RAW_REPLAY_WORKERS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    stats = replay(load_adapter(args.source), args.conn, args.since, args.until, args.sink, args.out,
+                   args.file_rows, args.workers)
+    print(json.dumps(stats, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""작은 tick 을 pandas 없이 처리하는 레코드 경로.
+
+1분 타이머 한 번에 들어오는 행은 보통 100 ~ 수백 건인데, 이 정도 크기에서는 DataFrame 생성 /
+정제 자체보다 pandas 의 고정 비용(컬럼별 객체 생성, dtype 추론, to_csv 준비)이 더 큽니다.
+RECORD_PATH_MAX_ROWS 이하의 tick 은 API 레코드(dict 목록)를 컬럼 배열로 바로 정제하고
+표준 라이브러리 csv 모듈로 씁니다.
+
+- 결과 CSV 는 clean_dataframe(서울) / preprocess_jobs + save_to_blob_csv(경기) 와 바이트 단위로 같습니다.
+  (pd.DataFrame(records) 의 dtype 추론 - 결측이 섞인 정수 컬럼은 float, 전부 결측이면 object - 과
+   to_csv 의 값 표기까지 그대로 따름. benchmarks/bench_record_path.py --check 로 확인)
+- RecordFrame 은 호출부가 쓰는 DataFrame 기능(len / empty / to_csv)만 제공합니다.
+  DataFrame 이 필요한 기능(중복 제거 / Parquet / 직무 코드 집계)이 켜져 있으면 applies() 가 False 라 쓰이지 않습니다.
+- 이 모듈은 pandas / numpy 를 import 하지 않습니다.
+"""
+import csv
+import io
+import os
+import re
+
+RECORD_PATH_MAX_ROWS = int(os.getenv("RECORD_PATH_MAX_ROWS", "1000"))   # 이 행 수 이하의 tick 은 레코드 경로 (0 이면 항상 pandas)
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def applies(rows: int) -> bool:
+    """rows 건짜리 tick 을 레코드 경로로 처리할지 여부."""
+    if not 0 < rows <= RECORD_PATH_MAX_ROWS:
+        return False
+    from shared_code import dedupe_index, parquet_sink, job_counts
+    return not dedupe_index.DEDUPE_ENABLED and parquet_sink.OUTPUT_FORMAT == "csv" and not job_counts.is_enabled()
+
+
+# =========================================================================
+# === 1. pandas dtype 추론 / to_csv 값 표기 ===
+# =========================================================================
+def _is_nan(v) -> bool:
+    return type(v) is float and v != v
+
+
+def _kind(values: list) -> str:
+    """pandas 가 이 값 목록으로 만들 컬럼 dtype. "int" | "float" | "object"
+
+    정수만 있으면 int64, 정수/실수에 결측(None / NaN)이 섞이면 float64,
+    문자열 / bool 이 섞이거나 전부 None 이면 object 입니다.
+    """
+    has_number = has_none = has_nan = has_float = False
+    for v in values:
+        if v is None:
+            has_none = True
+        elif type(v) is float:
+            if v != v:
+                has_nan = True
+            else:
+                has_float = has_number = True
+        elif type(v) is int and _INT64_MIN <= v <= _INT64_MAX:
+            has_number = True
+        else:
+            return "object"
+    if has_number:
+        return "float" if (has_float or has_none or has_nan) else "int"
+    return "float" if has_nan else "object"
+
+
+def _frame_column(values: list) -> list:
+    """pd.DataFrame(records) 가 만든 컬럼의 값. float64 컬럼이면 정수는 실수로, None 은 NaN 으로 바뀝니다."""
+    if _kind(values) != "float":
+        return values
+    return [float("nan") if v is None else float(v) for v in values]
+
+
+def _column(records: list, key: str) -> list:
+    """records 에서 key 컬럼을 꺼냅니다. 키가 없는 레코드는 NaN (pandas 와 같음)"""
+    nan = float("nan")
+    return _frame_column([r.get(key, nan) for r in records])
+
+
+def _has_column(records: list, key: str) -> bool:
+    return any(key in r for r in records)
+
+
+def _cell(v) -> str:
+    """to_csv 의 값 표기. 결측은 빈 문자열, 실수는 repr (3000000.0, 1e+16)"""
+    if v is None or _is_nan(v):
+        return ""
+    if type(v) is float:
+        return repr(v)
+    return str(v)
+
+
+def _formatted(values: list) -> list:
+    if _kind(values) == "float":
+        return [_cell(v if v is None else float(v)) for v in values]
+    return [_cell(v) for v in values]
+
+
+class RecordFrame:
+    """컬럼 배열로 된 정제 결과. DataFrame 대신 len / empty / to_csv 로 쓰입니다."""
+
+    __slots__ = ("columns", "data")
+
+    def __init__(self, columns: list, data: list):
+        self.columns = list(columns)
+        self.data = data            # 컬럼별 값 목록 (columns 와 같은 순서)
+
+    def __len__(self) -> int:
+        return len(self.data[0]) if self.data else 0
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def rows(self):
+        """to_csv 와 같은 표기로 바꾼 행(문자열 튜플)."""
+        return zip(*[_formatted(values) for values in self.data])
+
+    def to_csv(self, path_or_buf=None, index: bool = False, header=True, encoding: str = None):
+        """DataFrame.to_csv(index=False) 와 같은 CSV 를 만듭니다. (encoding 은 DataFrame 처럼 문자열 반환 시 무시)"""
+        if index:
+            raise ValueError("RecordFrame.to_csv 는 index=False 만 지원합니다.")
+        buf = path_or_buf if path_or_buf is not None else io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        if header is True:
+            writer.writerow(self.columns)
+        elif header:
+            if len(header) != len(self.columns):
+                raise ValueError(f"헤더 {len(header)}개와 컬럼 {len(self.columns)}개가 맞지 않습니다.")
+            writer.writerow(header)
+        writer.writerows(self.rows())
+        return buf.getvalue() if path_or_buf is None else None
+
+
+# =========================================================================
+# === 2. 서울 (clean_dataframe 과 같은 결과) ===
+# =========================================================================
+SEOUL_WAGE_PATTERN = re.compile(r'\(?(월급|시급)\)?\s*[/\\]?\s*([0-9,\.]+)\s*(만원|원)?')
+SEOUL_WAGE_FALLBACK_PATTERN = re.compile(r'([0-9,\.]+)\s*(만원|원)')
+SEOUL_OUTPUT_COLUMNS = [
+    'company', 'job_title', 'wage_type', 'wage_value_krw', 'region', 'career',
+    'RCRIT_JSSFC_CMMN_CODE_SE', 'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE',
+    'wage_value_monthly'
+]
+
+
+def _seoul_number(num: str):
+    try:
+        return int(float(num.replace(',', '')))
+    except ValueError:
+        return None
+
+
+def seoul_wage(text):
+    """parse_wage 와 같은 (wage_type, wage_value_krw). 문자열이 아니면 (None, None)"""
+    if not isinstance(text, str):
+        return None, None
+    s = text.strip()
+    m = SEOUL_WAGE_PATTERN.search(s)
+    if m:
+        wtype, num_val, unit = m.group(1), _seoul_number(m.group(2)), m.group(3) or '원'
+    else:
+        m = SEOUL_WAGE_FALLBACK_PATTERN.search(s)
+        if not m:
+            return None, None
+        num_val, unit = _seoul_number(m.group(1)), m.group(2)
+        wtype = '월급' if '월' in s else ('시급' if '시' in s else None)
+    if num_val is None:
+        return wtype, None
+    return wtype, num_val * 10000 if unit == '만원' else num_val
+
+
+def seoul_gui(gui):
+    """parse_gui_ln 과 같은 (region, career)."""
+    if not isinstance(gui, str):
+        return None, None
+    parts = [p.strip() for p in gui.split('/')]
+    return (parts[1] if len(parts) >= 2 else None), (parts[2] if len(parts) >= 3 else None)
+
+
+def seoul_rcrit_code(code):
+    """process_rcrit_code 와 같이 6자리로 맞춘 뒤 끝 두 자리를 잘라냅니다."""
+    if code is None or _is_nan(code) or code == '':
+        return None
+    s = str(code).strip()
+    if s.isdigit():
+        if len(s) == 5:
+            s = '0' + s
+        if len(s) > 2:
+            s = s[:-2]
+    return s
+
+
+def _memo(fn):
+    """같은 값이 반복되는 컬럼을 호출(tick) 안에서 한 번만 파싱합니다."""
+    cache = {}
+
+    def parse(v):
+        key = (type(v), v) if not _is_nan(v) else "nan"
+        hit = cache.get(key)
+        if hit is None:
+            hit = cache[key] = fn(v)
+        return hit
+    return parse
+
+
+def seoul_frame(records: list, convert_monthly: bool = True, hours_per_month: int = 209) -> RecordFrame:
+    """서울 API 레코드를 clean_dataframe 과 같은 컬럼/값으로 정제합니다."""
+    if not _has_column(records, 'HOPE_WAGE'):
+        raise KeyError('HOPE_WAGE')     # clean_dataframe 과 같이 급여 컬럼이 없으면 실패
+    n = len(records)
+    wage = _memo(seoul_wage)
+    gui = _memo(seoul_gui)
+
+    hope = _column(records, 'HOPE_WAGE')
+    parsed_wage = [wage(v) for v in hope]
+    wage_type = [t for t, _ in parsed_wage]
+    wage_value = [v for _, v in parsed_wage]
+    parsed_gui = [gui(v) for v in _column(records, 'GUI_LN')] if _has_column(records, 'GUI_LN') else [(None, None)] * n
+
+    def passthrough(key):
+        return _column(records, key) if _has_column(records, key) else [None] * n
+
+    columns = {
+        'company': passthrough('CMPNY_NM'),
+        'job_title': passthrough('JO_SJ'),
+        # 유형이 없으면 금액이 100만원 이상일 때 연봉, 아니면 공고 확인
+        'wage_type': [t if t is not None else ("공고 확인" if (v or 0) // 1000000 == 0 else "연봉")
+                      for t, v in parsed_wage],
+        'wage_value_krw': wage_value,
+        'region': [r for r, _ in parsed_gui],
+        'career': [c for _, c in parsed_gui],
+        'RCRIT_JSSFC_CMMN_CODE_SE': [seoul_rcrit_code(v) for v in passthrough('RCRIT_JSSFC_CMMN_CODE_SE')],
+        'JOBCODE_NM': passthrough('JOBCODE_NM'),
+        'CAREER_CND_CMMN_CODE_SE': passthrough('CAREER_CND_CMMN_CODE_SE'),
+        'ACDMCR_CMMN_CODE_SE': passthrough('ACDMCR_CMMN_CODE_SE'),
+        'wage_value_monthly': [None] * n,
+    }
+    if convert_monthly:
+        factors = {'시급': hours_per_month, '월급': 1}
+        columns['wage_value_monthly'] = [v * factors[t] if v and t in factors else None
+                                         for t, v in zip(wage_type, wage_value)]
+    return RecordFrame(SEOUL_OUTPUT_COLUMNS, [columns[c] for c in SEOUL_OUTPUT_COLUMNS])
+
+
+# =========================================================================
+# === 3. 경기 (preprocess_jobs 와 같은 결과, CSV 헤더는 INDEX_DF_FILTERED) ===
+# =========================================================================
+GG_HEADER = ['company', 'job_title', 'wage_type', 'wage_value_krw',
+             'region', 'career', 'RCRIT_JSSFC_CMMN_CODE_SE',
+             'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE', 'wage_value_monthly']
+GG_COLUMNS = ['ENTRPRS_NM', 'PBANC_CONT', 'SALARY_UNIT', 'SALARY_KRW',
+              'REGION1', 'CAREER_TYPE', 'RECRUT_FIELD_CD_NM_4',
+              'RECRUT_FIELD_NM', 'CAREER_CD_NM', 'ACDMCR_nonNULL', 'wage_value_monthly']
+GG_SOURCE_COLUMNS = ['ENTRPRS_NM', 'PBANC_CONT', 'SALARY_COND', 'ACDMCR_CD_NM', 'CAREER_CD_NM',
+                     'RECRUT_FIELD_CD_NM', 'RECRUT_FIELD_NM', 'WORK_REGION_CONT']
+GG_REGION_PREFIXES = ("전국", "서울", "인천", "경기", "강원", "충북", "충남", "대전", "세종"
+                      , "경북", "경남", "대구", "부산", "울산", "전북", "전남", "광주광", "제주")
+_DIGITS = re.compile(r"\d+")
+
+
+def _np_round(x: float, decimals: int) -> float:
+    """np.round 와 같은 반올림 (10**decimals 를 곱해 짝수 반올림 후 다시 나눔)."""
+    if x != x:
+        return x
+    scale = 10.0 ** decimals
+    return round(x * scale) / scale
+
+
+def gg_salary(text):
+    """parse_salary 와 같은 (SALARY_KRW, SALARY_UNIT). 결측이면 None, 숫자가 없으면 NaN"""
+    if text is None or _is_nan(text):
+        return None, "공고확인"
+    text = str(text).strip()
+    for unit in ("시급", "일급", "월급", "연봉", "내규"):
+        if unit in text:
+            break
+    else:
+        unit = "연봉"
+
+    nums = [int(n) for n in _DIGITS.findall(text)]
+    if not nums:
+        return float("nan"), unit
+
+    if "~" in text:
+        total = 0.0
+        for v in nums:          # np.mean 과 같은 순서로 더함
+            total += v
+        value = total / len(nums)
+    elif "이하" in text:
+        value = max(nums)
+    elif "이상" in text or "초과" in text:
+        value = min(nums)
+    else:
+        value = nums[0]
+
+    if "만원" in text:
+        value = value * 10000
+    return (_np_round(value, 1) if type(value) is float else value), unit
+
+
+def gg_region(text):
+    """split_region 의 REGION1 - 쉼표로 나눈 첫 지역, 경기 밖 접두어가 없으면 '경기 ' 를 붙임."""
+    if text is None or _is_nan(text) or str(text).strip().lower() == "none":
+        return None
+    for r in str(text).split(','):
+        r = r.strip()
+        if r:
+            return r if r.startswith(GG_REGION_PREFIXES) else f"경기 {r}"
+    return None
+
+
+def gg_career(text):
+    """career_NE 와 같이 경력 코드를 '경력' / '경력 무관' 으로 줄입니다."""
+    if text is None or _is_nan(text):
+        return None
+    codes = {str(int(t)) for t in _DIGITS.findall(str(text).strip())}
+    if '3' in codes:
+        return '경력'
+    if {'1', '2', '4'} & codes:
+        return '경력 무관'
+    return None
+
+
+def gg_recruit_code(code):
+    """recruit_na + career_4 - 직업코드 공란은 999999, 4자리로 자름."""
+    if code is None or _is_nan(code):
+        code = '999999'
+    return code[:4] if isinstance(code, str) else None
+
+
+def gg_monthly(value, unit: str, kind: str):
+    """cal_wage_value_monthly 와 같은 월급 환산 문자열. kind 는 SALARY_KRW 컬럼 dtype"""
+    if unit not in ("시급", "일급", "월급", "연봉"):
+        return None
+    if kind == "float":
+        value = float(value)
+    if unit == "시급":
+        return str(value * 209)
+    if unit == "일급":
+        return str(value * 20)
+    if unit == "월급":
+        return str(value)
+    # 정수 컬럼은 파이썬 round, 실수 컬럼은 np.round (참조 구현의 행 값 타입을 따름)
+    return str(round(value / 12, 2) if kind == "int" else _np_round(value / 12, 2))
+
+
+def gg_frame(raw_jobs: list) -> tuple:
+    """경기 API 레코드를 preprocess_jobs 와 같은 컬럼/값으로 전처리합니다. 반환: (RecordFrame, CSV 헤더)"""
+    for key in GG_SOURCE_COLUMNS:
+        if not _has_column(raw_jobs, key):
+            raise KeyError(key)     # preprocess_jobs 와 같이 필요한 컬럼이 없으면 실패
+    salary = _memo(gg_salary)
+    parsed = [salary(v) for v in _column(raw_jobs, "SALARY_COND")]
+    salary_krw = [v for v, _ in parsed]
+    salary_unit = [u for _, u in parsed]
+    kind = _kind(salary_krw)
+
+    acdmcr = [0 if v is None else v for v in _column(raw_jobs, "ACDMCR_CD_NM")]   # 학력조건 공백 -> 0(학력무관)
+    columns = {
+        'ENTRPRS_NM': _column(raw_jobs, 'ENTRPRS_NM'),
+        'PBANC_CONT': _column(raw_jobs, 'PBANC_CONT'),
+        'SALARY_UNIT': salary_unit,
+        'SALARY_KRW': salary_krw,
+        'REGION1': [gg_region(v) for v in _column(raw_jobs, "WORK_REGION_CONT")],
+        'CAREER_TYPE': [gg_career(v) for v in _column(raw_jobs, "CAREER_CD_NM")],
+        'RECRUT_FIELD_CD_NM_4': [gg_recruit_code(v) for v in _column(raw_jobs, "RECRUT_FIELD_CD_NM")],
+        'RECRUT_FIELD_NM': _column(raw_jobs, 'RECRUT_FIELD_NM'),
+        'CAREER_CD_NM': _column(raw_jobs, 'CAREER_CD_NM'),
+        'ACDMCR_nonNULL': _frame_column(acdmcr),
+        'wage_value_monthly': [None if kind == "object" else gg_monthly(v, u, kind)
+                               for v, u in zip(salary_krw, salary_unit)],
+    }
+    return RecordFrame(GG_COLUMNS, [columns[c] for c in GG_COLUMNS]), list(GG_HEADER)
@@ -2,9 +2,9 @@ import logging
 import azure.functions as func
 # BlobClient와 os, json은 더 이상 속성 조회에 필요하지 않으므로 주석 처리하거나 제거 가능하지만,
 # 여기서는 Event Hub 관련 모듈만 남기고 정리했습니다.
-from azure.eventhub import EventHubProducerClient, EventData
 import os
 import json # Event Hub 전송 시 JSON 직렬화에 사용될 수 있으므로 유지
+from shared_code import resource_pool, eventhub_sink
 
 # pandas 모듈이 필요하지 않은 경우 제거하면 좋습니다. (이전 질문들의 코드를 바탕으로)
 
@@ -16,19 +16,10 @@ def main(myblob: func.InputStream):
     """
     logging.info(f"Blob Trigger 실행됨: {myblob.name}, Size: {myblob.length} bytes")
 
-    # 1. Blob 파일 내용 읽기
-    try:
-        # func.InputStream을 사용하여 메모리에 있는 파일 내용을 바로 읽어옵니다.
-        # 텍스트 파일(CSV 등)이라고 가정하고 'utf-8'로 디코딩합니다.
-        # 파일이 매우 큰 경우, 이 방식은 메모리 문제를 일으킬 수 있으므로 주의해야 합니다.
-        file_content = myblob.read().decode('utf-8')
-        logging.info(f"✅ Blob 내용 {myblob.length} bytes 읽기 완료.")
-        
-    except Exception as e:
-        logging.error(f"❌ Blob 내용 읽기 실패: {e}")
-        # 읽기 실패 시 처리를 중단합니다.
-        return
-
+    # 1. Blob 파일 내용은 미리 읽지 않습니다.
+    # 전체를 read().decode() 하면 bytes + str 로 파일이 메모리에 두 번 올라가므로,
+    # 전송 단계에서 bytes 그대로 보냅니다. (EVENTHUB_SEND_MODE=split 이면 입력 스트림을 일정 크기씩 읽어 줄 단위로 자름,
+    # 기본 whole 은 파일 전체를 한 번 읽어 이벤트 하나로)
 
     # 2. Event Hub 전송 준비
     eventhub_conn = os.getenv("EVENTHUB_CONNECTION")
@@ -39,25 +30,22 @@ def main(myblob: func.InputStream):
         return
 
     try:
-        producer = EventHubProducerClient.from_connection_string(
-            eventhub_conn,
-            eventhub_name=eventhub_name
-        )
-
         # 3. Event Hub로 파일 내용 전송
-        # 파일 내용 전체를 하나의 EventData로 전송합니다.
-        # 파일 내용이 Event Hub 메시지 크기 제한(약 1MB)을 넘지 않는지 확인해야 합니다.
-        event_data = EventData(file_content)
-        
-        with producer:
-            # 단일 메시지를 배치로 묶어 전송합니다.
-            event_data_batch = producer.create_batch()
-            event_data_batch.add(event_data)
-            producer.send_batch(event_data_batch)
-
-        logging.info(f"✅ Event Hub로 Blob 내용 ({myblob.length} bytes) 전송 완료")
+        # EVENTHUB_SEND_MODE=whole(기본): 기존처럼 파일 내용 전체를 하나의 EventData로 전송합니다.
+        # EVENTHUB_SEND_MODE=split: 행 경계에서 잘라 헤더를 반복한 여러 이벤트로 나누고,
+        # EventDataBatch를 최대 크기까지 채워 전송합니다. (약 1MB 이벤트 제한 회피)
+        # EVENTHUB_COMPRESSION=gzip|zstd: 본문을 압축하고 압축 후 크기 기준으로 행을 묶습니다.
+        # (소비자는 eventhub_sink.decode_event 로 풀고, ASA 입력은 이벤트 압축 형식을 GZip 으로 설정)
+        # Producer는 웜 워커에서 재사용하므로 with 문으로 닫지 않습니다.
+        # (스트림은 한 번만 읽을 수 있으므로 재시도 없이 보내고, 실패하면 Producer를 버려 다음 실행에서 새로 만듭니다.)
+        producer = resource_pool.eventhub_producer(eventhub_conn, eventhub_name)
+        stats = eventhub_sink.send_csv_stream(producer, myblob)
+
+        logging.info(f"✅ Event Hub로 Blob 내용 ({myblob.length} bytes) 전송 완료: "
+                     f"이벤트 {stats['events']}개 / 배치 {stats['batches']}개{eventhub_sink.compression_summary(stats)}")
         
     except Exception as e:
         # Event Hub 전송 실패 시 로그 기록
         logging.error(f"❌ Event Hub 전송 실패: {e}")
-        # 파일 크기 제한 초과 오류가 자주 발생하는 경우, 파일을 레코드별로 분할하여 전송해야 합니다.
\ No newline at end of file
+        resource_pool.invalidate_eventhub_producer(eventhub_conn, eventhub_name)
+        # 파일 크기 제한 초과(EventTooLarge)가 나면 EVENTHUB_SEND_MODE=split 인지, EVENT_MAX_BYTES 가 너무 크지 않은지 확인합니다.
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""여러 함수가 함께 쓰는 공용 모듈 모음.
+
+seoul-job-cnt / ggi-job-cnt 두 Function App 은 따로 배포되므로
+이 폴더는 두 앱의 azure-func-connect/shared_code 에 같은 내용으로 들어 있습니다.
+한쪽을 수정하면 다른 쪽에도 그대로 복사해 주세요. (tests/test_shared_code_sync.py 가 두 폴더를 비교)
+"""
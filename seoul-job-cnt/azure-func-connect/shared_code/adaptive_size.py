@@ -0,0 +1,109 @@
+"""API 응답 속도에 맞춰 한 번에 요청할 레코드 수(청크/페이지 크기)를 조절하는 컨트롤러.
+
+- 요청이 ADAPTIVE_TARGET_SEC 안에 오류 없이 꽉 찬 결과로 GROW_AFTER 번 연속 돌아오면 한 단계 키움
+- 타임아웃 / 429 / 5xx 등 요청이 실패하거나 느리면 한 단계 줄임
+- 측정한 레코드당 시간으로 한 번의 요청이 실행 시간 예산(ADAPTIVE_TIME_BUDGET_SEC)을 넘지 않게 상한을 둠
+
+크기는 미리 정한 단계(sizes) 중에서만 고릅니다. (페이지 번호 기반 API 는 단계끼리 나누어 떨어지게 잡아 커서를 환산)
+학습한 크기와 최근 측정값은 to_state() 로 커서 상태 Blob 에 함께 저장해 콜드 스타트에서도 이어 씁니다.
+"""
+import logging
+import os
+import threading
+
+ADAPTIVE_SIZE = os.getenv("ADAPTIVE_SIZE", "0") == "1"                            # 1 이면 요청 크기 자동 조절
+ADAPTIVE_TARGET_SEC = float(os.getenv("ADAPTIVE_TARGET_SEC", "3"))               # 이보다 빠른 요청만 '빠름'으로 보고 키움
+ADAPTIVE_TIME_BUDGET_SEC = float(os.getenv("ADAPTIVE_TIME_BUDGET_SEC", "40"))    # 한 번의 요청이 넘지 말아야 할 시간(초)
+GROW_AFTER = 2          # 연속으로 빠른 요청이 이만큼 쌓이면 한 단계 키움
+EWMA_ALPHA = 0.3        # 레코드당 시간 이동평균 가중치
+HISTORY_LEN = 20        # 상태에 남길 최근 측정 수
+
+
+class AdaptiveSizer:
+    """요청 크기 단계(sizes) 사이를 오가며 현재 크기(size)를 정합니다. observe() 는 스레드 안전합니다."""
+
+    def __init__(self, sizes, size: int, target_sec: float = None, budget_sec: float = None):
+        self.sizes = sorted(sizes)
+        self.level = self._level_of(size)
+        self.target_sec = ADAPTIVE_TARGET_SEC if target_sec is None else target_sec
+        self.budget_sec = ADAPTIVE_TIME_BUDGET_SEC if budget_sec is None else budget_sec
+        self.streak = 0
+        self.sec_per_record = None
+        self.history = []       # [크기, 초, 건수, rows/sec, ok|error]
+        self._lock = threading.Lock()
+
+    def _level_of(self, size: int) -> int:
+        """size 이하인 가장 큰 단계 (없으면 가장 작은 단계)."""
+        below = [i for i, s in enumerate(self.sizes) if s <= size]
+        return below[-1] if below else 0
+
+    @property
+    def size(self) -> int:
+        return self.sizes[self.level]
+
+    @classmethod
+    def from_state(cls, state: dict, sizes, default_size: int, **kwargs) -> "AdaptiveSizer":
+        """커서 상태에 저장해 둔 값(to_state)으로 복원합니다. 없으면 default_size 에서 시작합니다."""
+        state = state or {}
+        sizer = cls(sizes, state.get('size', default_size), **kwargs)
+        sizer.streak = state.get('streak', 0)
+        sizer.sec_per_record = state.get('sec_per_record')
+        sizer.history = list(state.get('history', []))[-HISTORY_LEN:]
+        return sizer
+
+    def to_state(self) -> dict:
+        with self._lock:
+            return {
+                'size': self.size,
+                'streak': self.streak,
+                'sec_per_record': self.sec_per_record,
+                'history': self.history[-HISTORY_LEN:],
+            }
+
+    def _budget_cap(self, level: int) -> int:
+        """레코드당 시간으로 추정한 요청 시간이 예산을 넘지 않는 가장 큰 단계."""
+        if not self.sec_per_record:
+            return level
+        while level > 0 and self.sizes[level] * self.sec_per_record > self.budget_sec:
+            level -= 1
+        return level
+
+    def observe(self, size: int, elapsed_sec: float, records: int, error: Exception = None) -> None:
+        """size 로 요청한 결과(걸린 시간, 받은 건수, 실패 여부)를 반영해 다음 크기를 정합니다."""
+        with self._lock:
+            rate = records / elapsed_sec if elapsed_sec > 0 else 0.0
+            self.history.append([size, round(elapsed_sec, 3), records, round(rate, 1), 'error' if error else 'ok'])
+            del self.history[:-HISTORY_LEN]
+
+            before = self.level
+            if error is not None:
+                self.level, self.streak = max(self.level - 1, 0), 0
+            else:
+                if records:
+                    spr = elapsed_sec / records
+                    self.sec_per_record = spr if self.sec_per_record is None else \
+                        round((1 - EWMA_ALPHA) * self.sec_per_record + EWMA_ALPHA * spr, 6)
+                if elapsed_sec > self.target_sec:
+                    self.level, self.streak = max(self.level - 1, 0), 0
+                elif records >= size:
+                    # 꽉 찬 응답이 빠르게 왔을 때만 키움 (스트림 끝의 짧은 응답은 판단에서 제외)
+                    self.streak += 1
+                    if self.streak >= GROW_AFTER:
+                        self.level, self.streak = min(self.level + 1, len(self.sizes) - 1), 0
+            self.level = self._budget_cap(self.level)
+
+            if self.level != before:
+                reason = f"오류 {error}" if error is not None else f"{elapsed_sec:.2f}s / {records}건"
+                logging.info(f"📏 요청 크기 {self.sizes[before]} → {self.size} ({reason})")
+
+    def stats(self) -> dict:
+        """현재 크기, 레코드당 시간, 최근 측정의 평균 처리량 / 오류 수를 반환합니다."""
+        with self._lock:
+            ok = [h for h in self.history if h[4] == 'ok' and h[2]]
+            return {
+                'size': self.size,
+                'sec_per_record': self.sec_per_record,
+                'avg_rows_per_sec': round(sum(h[3] for h in ok) / len(ok), 1) if ok else None,
+                'recent_sizes': [h[0] for h in self.history[-5:]],
+                'recent_errors': sum(1 for h in self.history if h[4] == 'error'),
+            }
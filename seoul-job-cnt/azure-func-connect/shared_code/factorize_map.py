@@ -0,0 +1,208 @@
+"""반복되는 범주형 값에 행 단위 파서를 고유값 단위로만 적용하는 변환 계층.
+
+급여 문자열, 지역 문자열, 경력/직종 코드처럼 같은 값이 계속 반복되는 컬럼은
+- 컬럼을 factorize 해 (정수 코드, 고유값) 으로 나누고
+- 파서는 고유값마다 한 번만 실행한 뒤
+- 정수 코드로 결과를 행에 다시 펼칩니다.
+
+결과 dtype 은 Series.apply 와 같게 나오도록, 고유값마다 처음 나온 행을 그대로 골라 apply 합니다.
+(결측은 None / NaN 을 다르게 처리하는 파서가 있어 결측 종류별로 따로 한 번씩 실행)
+
+FACTORIZE_CACHE_SIZE > 0 이면 (컬럼 이름, 값) → 결과를 워커 단위 LRU 에 남겨 두어,
+웜 워커의 다음 실행에서는 이미 본 값의 파싱도 생략합니다. 파서 결과는 값에만 의존해야 합니다.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+FACTORIZE_CACHE_SIZE = int(os.getenv("FACTORIZE_CACHE_SIZE", "50000"))   # 워커 단위 LRU 최대 항목 수 (0 이면 사용 안 함)
+
+
+class ValueCache:
+    """(컬럼 이름, 값 타입, 값) → 파서 결과를 담는 크기 제한 LRU. 스레드 안전합니다."""
+
+    def __init__(self, max_items: int = FACTORIZE_CACHE_SIZE):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value) -> None:
+        if self.max_items <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+CACHE = ValueCache()
+_METRICS = {}           # 컬럼 이름 → {'calls', 'rows', 'unique', 'parsed', 'cache_hits'}
+_METRICS_LOCK = threading.Lock()
+_MISSING = object()
+
+
+def _record(name: str, rows: int, unique: int, parsed: int, hits: int) -> None:
+    with _METRICS_LOCK:
+        m = _METRICS.setdefault(name, {'calls': 0, 'rows': 0, 'unique': 0, 'parsed': 0, 'cache_hits': 0})
+        m['calls'] += 1
+        m['rows'] += rows
+        m['unique'] += unique
+        m['parsed'] += parsed
+        m['cache_hits'] += hits
+
+
+def _factorize(values: pd.Series):
+    """(행별 정수 코드, 코드 수) 를 반환합니다. 결측은 종류(None / NaN / NA 등)별로 다른 코드를 줍니다."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    codes = codes.astype(np.int64, copy=True)
+    n_codes = len(uniques)
+    missing = np.flatnonzero(codes == -1)
+    if len(missing):
+        kinds = {}
+        raw = values.to_numpy(dtype=object)
+        for pos in missing:
+            code = kinds.setdefault(type(raw[pos]), n_codes + len(kinds))
+            codes[pos] = code
+        n_codes += len(kinds)
+    return codes, n_codes
+
+
+def _first_positions(codes: np.ndarray, n_codes: int) -> np.ndarray:
+    """코드마다 처음 나온 행 위치. (뒤에서부터 덮어써 가장 앞의 위치가 남도록)"""
+    first = np.zeros(n_codes, dtype=np.int64)
+    first[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+    return first
+
+
+def _cache_key(name: str, values: tuple):
+    """문자열 / 숫자로만 된 값만 LRU 키로 씀 (결측은 종류별로 한 번씩만 실행되므로 담지 않음)."""
+    for v in values:
+        if not isinstance(v, (str, int, float)) or v != v:
+            return None
+    return (name,) + tuple((type(v), v) for v in values)
+
+
+def _cached(fn, name: str, use_cache: bool, counts: dict, key_of):
+    cache = CACHE if use_cache and CACHE.max_items > 0 else None
+
+    def parse(arg):
+        key = _cache_key(name, key_of(arg)) if cache is not None else None
+        if key is None:
+            counts['parsed'] += 1
+            return fn(arg)
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            counts['parsed'] += 1
+            result = fn(arg)
+            cache.put(key, result)
+        else:
+            counts['hits'] += 1
+        return result
+    return parse
+
+
+def map_unique(values: pd.Series, fn, name: str = None, use_cache: bool = True):
+    """values.apply(fn) 과 같은 결과를, fn 을 고유값마다 한 번만 실행해 만듭니다.
+
+    fn 이 Series 를 반환하면 apply 와 같이 DataFrame 을 반환합니다.
+    name 은 LRU / 통계에서 컬럼을 구분하는 이름입니다. (같은 name 에는 항상 같은 fn 을 써야 함)
+    """
+    name = name or getattr(fn, "__name__", "column")
+    if values.empty:
+        return values.apply(fn)
+
+    codes, n_codes = _factorize(values)
+    counts = {'parsed': 0, 'hits': 0}
+    parsed = values.iloc[_first_positions(codes, n_codes)].apply(
+        _cached(fn, name, use_cache, counts, lambda v: (v,)))
+    _record(name, len(values), n_codes, counts['parsed'], counts['hits'])
+
+    out = parsed.iloc[codes]
+    out.index = values.index
+    return out
+
+
+def map_unique_rows(df: pd.DataFrame, columns: list, fn, name: str, use_cache: bool = True) -> pd.Series:
+    """df.apply(fn, axis=1) 과 같은 결과를, columns 값의 조합마다 한 번만 실행해 만듭니다.
+    fn 은 columns 에 있는 값만 읽어야 합니다."""
+    if df.empty:
+        return df.apply(fn, axis=1)
+
+    codes, n_codes = np.zeros(len(df), dtype=np.int64), 1
+    for c in columns:
+        col_codes, col_n = _factorize(df[c])
+        codes, n_codes = codes * col_n + col_codes, n_codes * col_n
+        if n_codes > len(df):       # 조합 수가 커지면 다시 압축
+            codes, uniques = pd.factorize(codes)
+            n_codes = len(uniques)
+    codes, uniques = pd.factorize(codes)
+    n_codes = len(uniques)
+
+    counts = {'parsed': 0, 'hits': 0}
+    parsed = df.iloc[_first_positions(codes, n_codes)].apply(
+        _cached(fn, name, use_cache, counts, lambda row: tuple(row[c] for c in columns)), axis=1)
+    _record(name, len(df), n_codes, counts['parsed'], counts['hits'])
+
+    out = parsed.iloc[codes]
+    out.index = df.index
+    return out
+
+
+def apply_each(values: pd.Series, fn, name: str = None):
+    """map_unique 와 같은 호출 형태의 행 단위 apply (factorize 하지 않는 참조 경로)."""
+    return values.apply(fn)
+
+
+def apply_rows(df: pd.DataFrame, columns: list, fn, name: str = None) -> pd.Series:
+    """map_unique_rows 와 같은 호출 형태의 df.apply(fn, axis=1) (참조 경로)."""
+    return df.apply(fn, axis=1)
+
+
+def stats() -> dict:
+    """컬럼별 누적 행 수 / 고유값 비율 / LRU 적중률과 LRU 크기를 반환합니다."""
+    with _METRICS_LOCK:
+        columns = {}
+        for name, m in _METRICS.items():
+            looked_up = m['parsed'] + m['cache_hits']
+            columns[name] = dict(
+                m,
+                cardinality=round(m['unique'] / m['rows'], 4) if m['rows'] else None,
+                hit_rate=round(m['cache_hits'] / looked_up, 4) if looked_up else None,
+            )
+    return {'columns': columns, 'cache_items': len(CACHE), 'cache_evictions': CACHE.evictions}
+
+
+def log_stats() -> None:
+    """고유값 변환을 한 번이라도 썼으면 컬럼별 고유값 비율 / LRU 적중률을 로그로 남깁니다."""
+    snapshot = stats()
+    if not snapshot['columns']:
+        return
+    summary = {name: (m['cardinality'], m['hit_rate']) for name, m in snapshot['columns'].items()}
+    logging.info(f"🧮 고유값 변환 (고유값 비율, LRU 적중률): {summary} | "
+                 f"LRU {snapshot['cache_items']}개 / 제거 {snapshot['cache_evictions']}개")
+
+
+def reset_stats() -> None:
+    with _METRICS_LOCK:
+        _METRICS.clear()
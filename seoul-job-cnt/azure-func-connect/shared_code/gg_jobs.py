@@ -0,0 +1,685 @@
+"""경기도 일자리(GGJOBABARECRUSTM) OpenAPI 수집 / 전처리 로직.
+
+경기 타이머 트리거(function_app.trig_connect_ggjobs)와 통합 수집 엔진(ingest_engine)이 함께 씁니다.
+"""
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from shared_code import resource_pool, ingest_engine, cursor_store, adaptive_size, factorize_map, tracing, record_path
+from shared_code import raw_archive, blob_layout
+
+
+API_KEY = os.getenv("API_KEY")
+KST = ZoneInfo("Asia/Seoul")    # 파일명 타임스탬프
+BASE_URL = os.getenv("GG_API_BASE_URL", "https://openapi.gg.go.kr/GGJOBABARECRUSTM")   # 부하 테스트에서는 로컬 가짜 서버
+
+# 요청 당 호출할 공고 수
+size_per_req = 200
+# ADAPTIVE_SIZE=1 일 때 고를 수 있는 페이지 크기 - 서로 나누어 떨어지게 잡아 페이지 번호를 환산할 수 있게 함
+PAGE_SIZES = (50, 100, 200, 400, 800)
+
+# 병렬 페이지 수집 설정 - FETCH_WORKERS 가 1이면 기존처럼 한 번에 한 페이지만 수집
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "1"))                       # 동시에 요청할 페이지 수(동시성 한도)
+FETCH_TIME_BUDGET_SEC = float(os.getenv("FETCH_TIME_BUDGET_SEC", "40"))    # 한 번의 실행에서 수집에 쓸 최대 시간(초)
+REQUEST_TIMEOUT_SEC = 15                                                   # API 요청 타임아웃(초)
+
+# 전처리 엔진: "columnar"(컬럼 단위 배치) | "factorized"(원본 함수를 고유값마다 한 번) | "reference"(행 단위 원본)
+#   (RECORD_PATH_MAX_ROWS 이하의 tick 은 설정과 상관없이 "records" - pandas 없는 레코드 경로, shared_code/record_path.py)
+PREPROCESS_ENGINE = os.getenv("PREPROCESS_ENGINE", "columnar")
+
+# Blob 저장 / 상태 위치
+OUTPUT_CONTAINER = "ggjob-data"      # 결과 CSV 를 저장할 컨테이너 (blob_to_asa 가 감시)
+STATE_CONTAINER = "function-state"   # 페이지 상태 저장할 컨테이너 이름. 나중에 다른 함수와 합칠 때 조정 필요
+STATE_BLOB = "page_state.txt"        # (이전 형식) 마지막으로 수집한 페이지 또는 END. 처음 한 번 커서를 이어받을 때만 읽음
+STATE_CURSOR_BLOB = "page_cursor.json"   # 다음에 요청할 페이지 + lease (cursor_store)
+# DELIVERY_MODE=direct 일 때 보관본을 쓸 컨테이너 (ggjob-data 는 blob_to_asa 가 전부 감시하므로 따로 둠)
+ARCHIVE_CONTAINER = os.getenv("GG_ARCHIVE_CONTAINER", "ggjob-archive")
+
+# 중복 제거 (DEDUPE_ENABLED=1 일 때) - 처음부터 다시 도는 수집에서 이미 내보낸 공고는 제외
+DEDUPE_BLOB_NAME = "dedupe/ggjobs_index.bin"                                # function-state 컨테이너 안의 인덱스 경로
+DEDUPE_KEY_COLUMNS = ['ENTRPRS_NM', 'PBANC_CONT', 'REGION1', 'RECRUT_FIELD_CD_NM_4']   # 같은 공고로 볼 식별 컬럼
+
+
+# ================================================
+# 전처리 함수
+# ================================================
+
+# 급여조건 분리
+def parse_salary(salary_text: str):
+    # 아예 비어있는 경우 공고확인
+    if pd.isna(salary_text):
+        return pd.Series([None, "공고확인"])
+
+    text = str(salary_text).strip()
+
+    # 1️⃣ 단위 인식
+    if "시급" in text:
+        unit = "시급"
+    elif "일급" in text:
+        unit = "일급"
+    elif "월급" in text:
+        unit = "월급"
+    elif "연봉" in text:
+        unit = "연봉"
+    elif "내규" in text:
+        unit = "내규"
+    else:
+        unit = "연봉"
+        # 조건 추가해야할 수도?
+
+    # 2️⃣ 숫자 추출
+    nums = re.findall(r"\d+", text)
+    nums = [int(n) for n in nums]
+
+    if not nums:
+        # 숫자가 없는 경우 (회사내규 등)
+        return pd.Series([np.nan, unit])
+
+    # 3️⃣ 금액 계산 로직
+    if "~" in text:
+        # 범위인 경우 -> 평균값(중위값)
+        value = np.mean(nums)
+    elif "이하" in text:
+        # 이하 -> 최대값
+        value = max(nums)
+    elif "이상" in text or "초과" in text:
+        # 이상/초과 -> 최소값
+        value = min(nums)
+    else:
+        # 단일 금액
+        value = nums[0]
+
+    # # 4️⃣ 단위 변환 (원 -> 만원)
+    # if "원" in text and "만원" not in text:
+    #     value = value / 10000  # 원 -> 만원
+
+    # 4️⃣ 단위 변환 (만원 -> 원)
+    if "만원" in text:
+        value = value * 10000  # 원 -> 만원
+
+    return pd.Series([round(value, 1), unit])
+
+
+# 근무지역 분리, "경기" 삽입
+def split_region(region_text):
+    # None 또는 NaN 처리
+    if pd.isna(region_text) or str(region_text).strip().lower() == "none":
+        # region1~region5 모두 None으로 반환
+        return pd.Series([None]*5, index=[f"REGION{i+1}" for i in range(5)])
+
+    # 쉼표 기준 분리 -> 공백 제거
+    regions = [r.strip() for r in str(region_text).split(',') if r.strip()]
+
+    processed = []
+    for r in regions:
+        if r.startswith(("전국", "서울", "인천", "경기", "강원", "충북", "충남", "대전", "세종"
+                         , "경북", "경남", "대구", "부산", "울산", "전북", "전남", "광주광", "제주")) or r==None:
+            processed.append(r)
+        else:
+            processed.append(f"경기 {r}")
+
+    # 최대 5개까지 맞추기 (부족하면 None)
+    while len(processed) < 5:
+        processed.append(None)
+    return pd.Series(processed[:5], index=[f"REGION{i+1}" for i in range(5)])
+
+
+
+# 근무지역 분리 x, "경기" 삽입
+def add_gg_region(region_text):
+    # None 또는 NaN이면 그대로 반환
+    if pd.isna(region_text) or str(region_text).strip().lower() == "none":
+        return None
+
+    # 쉼표 기준 분리 후 공백 제거
+    regions = [r.strip() for r in str(region_text).split(',') if r.strip()]
+
+    # 각 지역 앞에 접두어 추가
+    processed = []
+    for r in regions:
+        if r.startswith(("전국", "서울", "인천", "경기", "강원", "충북", "충남", "대전", "세종"
+                         , "경북", "경남", "대구", "부산", "울산", "전북", "전남", "광주광", "제주")) or r==None:
+            processed.append(r)               # 서울, 인천 등은 그대로
+        else:
+            processed.append(f"경기 {r}")     # 나머지는 '경기 ' 붙이기
+
+    # 다시 쉼표로 묶어 하나의 문자열로 반환
+    return ", ".join(processed)
+
+
+#  학력 none일 경우 0으로 일괄 채움
+def acdmcr_nan(acdmcr_text):
+    if acdmcr_text == None:
+        return 0
+    else: return acdmcr_text
+    
+
+# 경력구분 단순화 - 1: 무관, 2: 신입, 3: 경력, 4: 신입/경력 -> 1, 2, 4: 신입, 3: 경력
+def career_NE(career_text):
+    if pd.isna(career_text):
+        return None
+
+    s = str(career_text).strip()
+
+    # 숫자토큰 모두 추출 (예: "03,04" -> ["03","04"])
+    tokens = re.findall(r'\d+', s)
+
+    # 앞의 0 제거하여 정규화 (예: "03" -> "3")
+    codes = {str(int(t)) for t in tokens}
+
+    if '3' in codes:
+        return '경력'
+    if {'1','2','4'} & codes:
+        return '경력 무관'
+    return None
+
+
+# 직업코드 공란 처리
+def recruit_na(recruit_text):
+    if pd.isna(recruit_text):
+        return '999999'
+    else:
+        return recruit_text
+
+
+# 경력코드 4자리로 자름
+def career_4(career_text):
+    return career_text[:4]
+
+
+# 각 유형(일급 월급 연봉)별 급여값을 월급으로 환산
+def cal_wage_value_monthly(value: int, unit: str):
+    if unit == "시급":
+        return str(value * 209)
+    elif unit == "일급":
+        return str(value * 20)
+    elif unit == "월급":
+        return str(value)
+    elif unit == "연봉":
+        return str(round(value/12, 2))
+    else:
+        return None
+
+
+
+# ================================================
+# 전처리 함수 (컬럼 단위 배치 엔진)
+# ================================================
+# 위 행 단위 함수들과 같은 값을 만들되, 컬럼 전체를 문자열 연산 + NumPy로 한 번에 처리
+
+REGION_PREFIXES = ("전국", "서울", "인천", "경기", "강원", "충북", "충남", "대전", "세종"
+                   , "경북", "경남", "대구", "부산", "울산", "전북", "전남", "광주광", "제주")
+REGION_PREFIX_PATTERN = "^(?:" + "|".join(map(re.escape, REGION_PREFIXES)) + ")"
+FIRST_REGION_PATTERN = r"^(?:\s*,)*\s*([^,]*[^,\s])"      # 쉼표 분리 후 첫 번째 비어있지 않은 지역
+
+INDEX_DF_FILTERED = ['company', 'job_title', 'wage_type', 'wage_value_krw',
+                     'region', 'career', 'RCRIT_JSSFC_CMMN_CODE_SE',
+                     'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE', 'wage_value_monthly']
+
+
+# 급여조건 분리 (parse_salary 컬럼 버전) -> SALARY_KRW Series, SALARY_UNIT 배열
+def parse_salary_column(salary: pd.Series):
+    n = len(salary)
+    missing = salary.isna().to_numpy()
+    text = pd.Series(salary.astype(str).to_numpy())        # 0..n-1 위치 인덱스로 계산
+
+    # 1️⃣ 단위 인식 (앞쪽 조건 우선)
+    keywords = ["시급", "일급", "월급", "연봉", "내규"]
+    unit = np.select([text.str.contains(k, regex=False).to_numpy() for k in keywords], keywords, default="연봉")
+    unit = np.where(missing, "공고확인", unit).astype(object)
+
+    # 2️⃣ 숫자 추출 -> 행별 첫 값 / 최소 / 최대 / 평균
+    nums = text.str.findall(r"\d+").explode().dropna().astype("int64")
+    grouped = nums.groupby(level=0)
+    first = grouped.first().reindex(range(n)).to_numpy(dtype=float)
+    low = grouped.min().reindex(range(n)).to_numpy(dtype=float)
+    high = grouped.max().reindex(range(n)).to_numpy(dtype=float)
+    mean = grouped.mean().reindex(range(n)).to_numpy(dtype=float)
+
+    # 3️⃣ 금액 계산 로직 (범위 -> 평균, 이하 -> 최대, 이상/초과 -> 최소, 그 외 -> 첫 값)
+    is_range = text.str.contains("~", regex=False).to_numpy()
+    below = text.str.contains("이하", regex=False).to_numpy()
+    above = text.str.contains("이상|초과").to_numpy()
+    value = np.select([is_range, below, above], [mean, high, low], default=first)
+
+    # 4️⃣ 단위 변환 (만원 -> 원), 평균값만 소수 첫째 자리 반올림
+    value = np.where(text.str.contains("만원", regex=False).to_numpy(), value * 10000, value)
+    value = np.where(is_range, np.round(value, 1), value)
+
+    # dtype은 행 단위 apply 결과와 동일하게: 전부 결측 -> object, 전부 정수 -> int64, 그 외 -> float64
+    is_float = (is_range | np.isnan(first)) & ~missing
+    if missing.all():
+        salary_krw = pd.Series([None] * n, index=salary.index, dtype=object)
+    elif not missing.any() and not is_float.any():
+        salary_krw = pd.Series(value.astype("int64"), index=salary.index)
+    else:
+        salary_krw = pd.Series(np.where(missing, np.nan, value), index=salary.index)
+    return salary_krw, unit
+
+
+# 각 유형별 급여값을 월급으로 환산 (cal_wage_value_monthly 컬럼 버전)
+def cal_wage_value_monthly_column(salary_krw: pd.Series, unit: np.ndarray):
+    out = np.full(len(salary_krw), None, dtype=object)
+    if salary_krw.dtype == object:      # 전부 공고확인
+        return pd.Series(out, index=salary_krw.index)
+
+    value = salary_krw.to_numpy()
+    for u, factor in (("시급", 209), ("일급", 20), ("월급", 1)):
+        m = unit == u
+        out[m] = pd.Series(value[m] * factor).astype(str).to_numpy()
+
+    m = unit == "연봉"
+    if salary_krw.dtype == "int64":
+        # 정수 값은 파이썬 round 결과와 맞추기 위해 고유값 단위로 계산
+        uniq = {v: str(round(v / 12, 2)) for v in set(value[m].tolist())}
+        out[m] = [uniq[v] for v in value[m].tolist()]
+    else:
+        out[m] = pd.Series(np.round(value[m] / 12, 2)).astype(str).to_numpy()
+    return pd.Series(out, index=salary_krw.index)
+
+
+# 학력 None -> 0 (acdmcr_nan 컬럼 버전)
+def acdmcr_nan_column(acdmcr: pd.Series):
+    values = acdmcr.to_numpy(dtype=object)
+    filled = np.where(np.equal(values, None), 0, values)
+    return pd.Series(filled, index=acdmcr.index, dtype=object).infer_objects()
+
+
+# 경력구분 단순화 (career_NE 컬럼 버전) - 숫자 토큰이 3이면 경력, 1/2/4면 경력 무관
+def career_NE_column(career: pd.Series):
+    text = career.astype(str)
+    out = np.select(
+        [text.str.contains(r"(?<!\d)0*3(?!\d)").to_numpy(),
+         text.str.contains(r"(?<!\d)0*[124](?!\d)").to_numpy()],
+        ["경력", "경력 무관"], default=None
+    )
+    out[career.isna().to_numpy()] = None
+    return pd.Series(out, index=career.index, dtype=object)
+
+
+# 직업코드 공란 -> 999999, 4자리로 자름 (recruit_na + career_4 컬럼 버전)
+def recruit_code_column(recruit: pd.Series):
+    return recruit.fillna('999999').str[:4]
+
+
+# 첫 번째 근무지역 + "경기" 삽입 (split_region 의 REGION1 컬럼 버전)
+def first_region_column(region: pd.Series):
+    text = region.astype(str)
+    missing = (region.isna() | text.str.strip().str.lower().eq("none")).to_numpy()
+    first = text.str.extract(FIRST_REGION_PATTERN, expand=False)
+    keep = first.str.match(REGION_PREFIX_PATTERN, na=False).to_numpy()
+    out = np.where(keep, first, "경기 " + first)
+    out = np.where(missing | first.isna().to_numpy(), None, out)
+    return pd.Series(out, index=region.index, dtype=object)
+
+
+# ================================================
+# 전처리 진행부
+# ================================================
+@tracing.traced("gg.preprocess_jobs", on_result=lambda out: {'rows.out': len(out[0])})
+def preprocess_jobs(raw_jobs, engine: str = None):
+    # RECORD_PATH_MAX_ROWS 이하의 작은 tick 은 pandas 없이 레코드 경로로 (같은 CSV 를 만드는 RecordFrame 반환)
+    if engine is None and record_path.applies(len(raw_jobs)):
+        engine = "records"
+    engine = engine or PREPROCESS_ENGINE
+    tracing.set_attributes(engine=engine, **{'rows.in': len(raw_jobs)})
+    if engine == "records":
+        # fetch_page 는 이미 DataFrame 을 돌려주므로 레코드로 되돌림 (dtype 추론 결과는 그대로 유지됨)
+        records = raw_jobs.to_dict("records") if isinstance(raw_jobs, pd.DataFrame) else list(raw_jobs)
+        return record_path.gg_frame(records)
+    if engine == "reference":
+        return preprocess_jobs_reference(raw_jobs)
+    if engine == "columnar":
+        return preprocess_jobs_columnar(raw_jobs)
+    if engine == "factorized":
+        return preprocess_jobs_reference(raw_jobs, factorize=True)
+    raise ValueError(f"알 수 없는 전처리 엔진: {engine}")
+
+
+# 행 단위 원본 구현 (참조용)
+#   - factorize=True 이면 컬럼 함수를 고유값마다 한 번만 실행하고 정수 코드로 펼침 (shared_code/factorize_map.py)
+def preprocess_jobs_reference(raw_jobs, factorize: bool = False):
+    apply = factorize_map.map_unique if factorize else factorize_map.apply_each
+    apply_rows = factorize_map.map_unique_rows if factorize else factorize_map.apply_rows
+    df = pd.DataFrame(raw_jobs)
+
+    df[["SALARY_KRW", "SALARY_UNIT"]] = apply(df["SALARY_COND"], parse_salary, "gg.SALARY_COND")                 # 급여조건 분리
+    df["ACDMCR_nonNULL"] = apply(df["ACDMCR_CD_NM"], acdmcr_nan, "gg.ACDMCR_CD_NM")                                # 학력조건 공백 -> 0(학력무관)
+    df["CAREER_TYPE"] = apply(df["CAREER_CD_NM"], career_NE, "gg.CAREER_CD_NM")                                    # 경력구분 단순화 - 1: 무관, 2: 신입, 3: 경력, 4: 신입/경력 -> 1, 2, 4: 신입, 3: 경력
+    df["RECRUT_FIELD_CD_NM_nonNA"] = apply(df["RECRUT_FIELD_CD_NM"], recruit_na, "gg.RECRUT_FIELD_CD_NM")          # 직업코드 공란 -> 999999
+    df["RECRUT_FIELD_CD_NM_4"] = apply(df["RECRUT_FIELD_CD_NM_nonNA"], career_4, "gg.RECRUT_FIELD_CD_NM_nonNA")    # 직업코드 4자리로 자름
+    df["REGION_GG"] = apply(df["WORK_REGION_CONT"], add_gg_region, "gg.WORK_REGION_CONT.add")                      # 근무지역 -> 분리x, 앞에 '경기'만 삽입
+    region_cols = apply(df["WORK_REGION_CONT"], split_region, "gg.WORK_REGION_CONT.split")                         # 근무지역 -> 분리, 앞에 '경기'만 삽입
+    df = pd.concat([df, region_cols], axis=1)
+    df["wage_value_monthly"]=apply_rows(df, ["SALARY_KRW", "SALARY_UNIT"],
+                                         lambda row: cal_wage_value_monthly(row["SALARY_KRW"], row["SALARY_UNIT"]),
+                                         "gg.wage_value_monthly")
+
+
+    df_filtered = df[['ENTRPRS_NM', 'PBANC_CONT', 'SALARY_UNIT', 'SALARY_KRW', 
+                      'REGION1', 'CAREER_TYPE', 'RECRUT_FIELD_CD_NM_4', 
+                      'RECRUT_FIELD_NM', 'CAREER_CD_NM', 'ACDMCR_nonNULL', 'wage_value_monthly']]
+
+    Index_df_filtered = ['company', 'job_title', 'wage_type', 'wage_value_krw', 
+                    'region', 'career', 'RCRIT_JSSFC_CMMN_CODE_SE', 
+                    'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE', 'wage_value_monthly']
+
+
+    return df_filtered, Index_df_filtered
+    # return df
+
+
+# 컬럼 단위 배치 구현 - preprocess_jobs_reference 와 같은 컬럼/값/헤더를 반환
+def preprocess_jobs_columnar(raw_jobs):
+    df = pd.DataFrame(raw_jobs)
+
+    salary_krw, salary_unit = parse_salary_column(df["SALARY_COND"])              # 급여조건 분리
+
+    df_filtered = pd.DataFrame({
+        'ENTRPRS_NM': df['ENTRPRS_NM'],
+        'PBANC_CONT': df['PBANC_CONT'],
+        'SALARY_UNIT': pd.Series(salary_unit, index=df.index),
+        'SALARY_KRW': salary_krw,
+        'REGION1': first_region_column(df["WORK_REGION_CONT"]),                   # 근무지역 -> 첫 지역, 앞에 '경기' 삽입
+        'CAREER_TYPE': career_NE_column(df["CAREER_CD_NM"]),                      # 경력구분 단순화
+        'RECRUT_FIELD_CD_NM_4': recruit_code_column(df["RECRUT_FIELD_CD_NM"]),   # 직업코드 공란 -> 999999, 4자리
+        'RECRUT_FIELD_NM': df['RECRUT_FIELD_NM'],
+        'CAREER_CD_NM': df['CAREER_CD_NM'],
+        'ACDMCR_nonNULL': acdmcr_nan_column(df["ACDMCR_CD_NM"]),                  # 학력조건 공백 -> 0(학력무관)
+        'wage_value_monthly': cal_wage_value_monthly_column(salary_krw, salary_unit),
+    }, index=df.index)
+
+    return df_filtered, list(INDEX_DF_FILTERED)
+
+
+# 원본과 engine 의 전처리 결과를 행 단위로 비교 -> [(행, 컬럼, 원본값, 비교값)] 불일치 목록
+def compare_preprocess_engines(raw_jobs, engine: str = "columnar"):
+    ref, ref_header = preprocess_jobs_reference(raw_jobs)
+    col, col_header = preprocess_jobs(raw_jobs, engine)
+    if ref_header != col_header or list(ref.columns) != list(col.columns) or len(ref) != len(col):
+        return [(None, 'shape', list(ref.columns), list(col.columns))]
+    mismatches = [(None, c, str(ref[c].dtype), str(col[c].dtype)) for c in ref.columns if ref[c].dtype != col[c].dtype]
+    for i, (r_row, c_row) in enumerate(zip(ref.itertuples(index=False), col.itertuples(index=False))):
+        for c, a, b in zip(ref.columns, r_row, c_row):
+            if not (a == b or (pd.isna(a) and pd.isna(b))):
+                mismatches.append((i, c, a, b))
+    return mismatches
+
+
+# ================================================
+# API 호출 함수(chunk size, )
+# ================================================
+# keep-alive 연결 재사용 + 429/5xx 재시도 세션
+def build_session(total_retries: int = 3, backoff: float = 1.0, pool_maxsize: int = 10) -> requests.Session:
+    s = requests.Session()
+    retries = Retry(total=total_retries, backoff_factor=backoff, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+    s.mount('https://', adapter)
+    s.mount('http://', adapter)
+    return s
+
+
+# 웜 워커에서는 이전 실행의 세션(연결 풀)을 그대로 재사용
+def get_api_session() -> requests.Session:
+    return resource_pool.http_session("gg-openapi", lambda: build_session(pool_maxsize=max(FETCH_WORKERS, 10)))
+
+
+@tracing.traced("gg.fetch_jobs", on_result=lambda r: {'rows': len(r[0]), 'is_last': r[1]})
+def fetch_jobs(size: int, pageIdx: int, session: requests.Session = None, api_key: str = None, claim=None):
+
+
+    page_idx = pageIdx
+    PAGE_SIZE = size
+
+    params = {
+        "KEY": api_key or API_KEY,
+        "Type": "json",
+        "pIndex": page_idx,
+        "pSize": PAGE_SIZE,
+    }
+    
+    if session is None:
+        response = requests.get(BASE_URL, params=params)
+    else:
+        response = session.get(BASE_URL, params=params, timeout=REQUEST_TIMEOUT_SEC)
+        response.raise_for_status()
+    response.encoding = 'utf-8'
+    tracing.set_attributes(**{'page': pageIdx, 'page_size': PAGE_SIZE, 'http.status_code': response.status_code,
+                              'http.retries': tracing.http_retries(response), 'payload.bytes': len(response.content)})
+
+    data = response.json()
+    ########### 수정 전
+    # rows = data["GGJOBABARECRUSTM"][1]["row"]  # 실제 데이터 위치
+
+    # df = pd.DataFrame(rows)
+    # print(f"총 수집 건수: {len(df)}")
+
+    # return df
+    ########### 수정 전
+
+    # 🚨 API가 비어 있는 페이지일 경우 방어
+    if "GGJOBABARECRUSTM" not in data or len(data["GGJOBABARECRUSTM"]) < 2:
+        logging.warning(f"[WARN] 페이지 {pageIdx}: 응답에 데이터가 없습니다. 수집 종료.")
+        return pd.DataFrame(), True   # df, is_last=True
+
+    try:
+        rows = data["GGJOBABARECRUSTM"][1].get("row", [])
+    except Exception:
+        logging.warning(f"[WARN] 페이지 {pageIdx}: row 키가 없어서 종료합니다.")
+        return pd.DataFrame(), True
+
+    if not rows:
+        logging.warning(f"[WARN] 페이지 {pageIdx}: row가 비었습니다. 종료합니다.")
+        return pd.DataFrame(), True
+
+    # RAW_ARCHIVE=1 이면 응답 JSON 을 그대로 보관 (커서를 저장한 뒤 claim 의 raw_archive.flush 가 씀, claim 이 없으면 보관 안 함)
+    raw_archive.capture("gg", claim, pageIdx, {'page': pageIdx, 'page_size': PAGE_SIZE}, data)
+
+    df = pd.DataFrame(rows)
+    logging.info(f"총 수집 건수: {len(df)}")
+
+    # 🔥 마지막 페이지: 요청한 PAGE_SIZE보다 적으면 끝
+    is_last = len(df) < PAGE_SIZE
+
+    return df, is_last
+
+
+# 보관한 API 응답 JSON 에서 공고 목록 (fetch_jobs 와 같은 위치, 없으면 빈 목록) - raw_archive replay 용
+def page_rows(data):
+    try:
+        return data["GGJOBABARECRUSTM"][1].get("row", []) or []
+    except Exception:
+        return []
+
+
+# fetch_jobs 와 같지만, sizer 가 있으면 걸린 시간 / 받은 건수 / 실패 여부를 기록
+def fetch_page(size: int, pageIdx: int, session: requests.Session = None, api_key: str = None, sizer=None,
+               claim=None):
+    if sizer is None:
+        return fetch_jobs(size, pageIdx, session, api_key, claim)
+    started = time.perf_counter()
+    try:
+        df, is_last = fetch_jobs(size, pageIdx, session, api_key, claim)
+    except Exception as e:
+        sizer.observe(size, time.perf_counter() - started, 0, error=e)
+        raise
+    sizer.observe(size, time.perf_counter() - started, len(df))
+    return df, is_last
+
+
+# 여러 페이지를 병렬로 수집 (동시성 한도 + 시간 예산)
+#   - start_page 부터 max_workers 개씩 묶어서 동시에 요청
+#   - 결과는 페이지 순서대로 확인하고, 마지막 페이지(is_last) 또는 실패한 페이지에서 멈춤
+#   - 남은 시간 예산이 요청 타임아웃(REQUEST_TIMEOUT_SEC)보다 짧으면 다음 묶음을 시작하지 않음 (첫 묶음은 항상 시작)
+#   - 멈출 때는 아직 시작하지 않은 요청을 취소하고, 진행 중인 요청은 기다리지 않음 (결과는 버림)
+#   -> 반환: [(page, df), ...] (연속으로 성공한 페이지만), is_last
+@tracing.traced("gg.fetch_jobs_parallel",
+                on_result=lambda r: {'pages': len(r[0]), 'rows': sum(len(df) for _, df in r[0]), 'is_last': r[1]})
+def fetch_jobs_parallel(size: int, start_page: int, max_workers: int = FETCH_WORKERS,
+                        time_budget_sec: float = FETCH_TIME_BUDGET_SEC, session: requests.Session = None,
+                        api_key: str = None, sizer=None, claim=None):
+    session = session or get_api_session()
+    started = time.monotonic()
+    pages = []
+    page = start_page
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while page == start_page or time.monotonic() - started + REQUEST_TIMEOUT_SEC <= time_budget_sec:
+            wave = list(range(page, page + max_workers))
+            fetch = tracing.bind(fetch_page)    # 페이지별 span 도 이 span 아래로
+            futures = [(p, pool.submit(fetch, size, p, session, api_key, sizer, claim)) for p in wave]
+
+            for p, fut in futures:
+                try:
+                    df, is_last = fut.result()
+                except Exception as e:
+                    # 실패한 페이지부터는 다음 실행에서 다시 수집 (뒤쪽 결과는 버림)
+                    logging.warning(f"[WARN] 페이지 {p} 요청 실패 → 이번 실행은 {p - 1} 페이지까지만 반영: {e}")
+                    return pages, False
+                if df.empty:
+                    return pages, True
+                pages.append((p, df))
+                if is_last:
+                    return pages, True
+
+            page += max_workers
+    finally:
+        # 마지막 페이지 / 실패에서 멈추면 뒤쪽 요청을 기다리지 않음 (시작 전인 요청은 취소)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    logging.info(f"[INFO] 시간 예산({time_budget_sec}s) 안에 다음 묶음을 끝낼 수 없어 {len(pages)} 페이지 수집 후 종료")
+    return pages, False
+
+
+# ================================================
+# 페이지 커서 (ETag 조건부 쓰기 + lease)
+# ================================================
+# 이전 형식(page_state.txt)에서 다음 페이지 계산: 숫자 -> +1, END -> 1
+def legacy_page_cursor(conn_str: str):
+    try:
+        blob_client = resource_pool.container_client(conn_str, STATE_CONTAINER).get_blob_client(STATE_BLOB)
+        data = blob_client.download_blob().readall().decode("utf-8").strip()
+        return 1 if data == "END" else int(data) + 1
+    except Exception:
+        return None
+
+
+# DELIVERY_MODE=direct 일 때 결과를 보낼 (연결 문자열, Event Hub 이름) - blob_to_asa 와 같은 설정. 없으면 None
+def eventhub_target():
+    conn_str, name = os.getenv("EVENTHUB_CONN_STR"), os.getenv("EVENTHUB_NAME")
+    return (conn_str, name) if conn_str and name else None
+
+
+# 다음에 요청할 페이지를 저장하는 커서 (trig_connect_ggjobs 와 통합 수집 엔진이 공유)
+def get_page_cursor_store(conn_str: str) -> cursor_store.CursorStore:
+    return cursor_store.CursorStore(conn_str, STATE_CONTAINER, STATE_CURSOR_BLOB, cursor_field="next_page",
+                                    default=1, legacy=lambda: legacy_page_cursor(conn_str))
+
+
+# ================================================
+# 페이지 크기 자동 조절 (ADAPTIVE_SIZE=1)
+# ================================================
+# 커서(next_page)는 상태에 함께 저장한 page_size 단위의 페이지 번호.
+# 크기를 바꿀 때는 지금까지 받은 건수(offset)가 새 크기로 나누어 떨어질 때만 페이지 번호를 환산하고,
+# 아니면 이번 실행은 기존 크기로 받음 (공고를 건너뛰거나 겹쳐 받지 않도록)
+def convert_page(page: int, old_size: int, new_size: int):
+    offset = (page - 1) * old_size
+    if offset % new_size:
+        return None
+    return offset // new_size + 1
+
+
+def load_sizer(claim):
+    """ADAPTIVE_SIZE=1 이면 커서 상태에 저장된 학습값으로 페이지 크기 컨트롤러를 만듭니다. (아니면 None)"""
+    if not adaptive_size.ADAPTIVE_SIZE:
+        return None
+    return adaptive_size.AdaptiveSizer.from_state(claim.state.get('sizer'), PAGE_SIZES, size_per_req)
+
+
+# 이번 실행에서 요청할 (페이지, 페이지 크기, sizer) - 페이지 크기는 claim.fields 에 넣어 커서와 함께 저장
+def plan_page(claim):
+    sizer = load_sizer(claim)
+    page, size = claim.cursor, claim.state.get('page_size', size_per_req)
+    wanted = sizer.size if sizer else size_per_req
+    if wanted != size:
+        converted = convert_page(page, size, wanted)
+        if converted is not None:
+            logging.info(f"📏 페이지 크기 {size} → {wanted} (페이지 {page} → {converted})")
+            page, size = converted, wanted
+    # 실패해서 lease 만 해제할 때도 페이지 번호와 크기가 함께 저장되도록 claim 의 커서도 환산
+    claim.cursor = page
+    claim.fields['page_size'] = size
+    return page, size, sizer
+
+
+# 학습한 크기를 커서와 함께 저장되도록 claim 에 기록
+def save_sizer(claim, sizer) -> None:
+    if sizer is not None:
+        claim.fields['sizer'] = sizer.to_state()
+        logging.info(f"📏 다음 페이지 크기 {sizer.size} | {sizer.stats()}")
+
+
+# ================================================
+# 통합 수집 엔진 어댑터
+# ================================================
+# 커서 = 다음에 요청할 페이지. 마지막 페이지(또는 빈 페이지)를 받으면 1 페이지로 돌아감
+#   - FETCH_WORKERS > 1 이면 시간 예산 안에서 여러 페이지를 병렬로 받아 하나의 파일로 저장
+class GyeonggiJobsAdapter(ingest_engine.SourceAdapter):
+    name = "gg"
+    container = OUTPUT_CONTAINER
+    dedupe_blob = DEDUPE_BLOB_NAME
+    dedupe_container = STATE_CONTAINER
+    dedupe_key_columns = DEDUPE_KEY_COLUMNS
+
+    def __init__(self, storage_conn: str = None, api_key: str = None):
+        super().__init__(storage_conn)
+        self.api_key = api_key or os.getenv("GG_API_KEY") or API_KEY
+
+    def cursor_store(self, conn_str: str):
+        return get_page_cursor_store(self.storage_conn or conn_str)
+
+    def fetch(self, cursor, claim):
+        session = get_api_session()
+        page, size, sizer = plan_page(claim)
+        try:
+            if FETCH_WORKERS > 1:
+                pages, is_last = fetch_jobs_parallel(size, page, session=session, api_key=self.api_key, sizer=sizer,
+                                                     claim=claim)
+                records = pd.concat([df for _, df in pages], ignore_index=True) if pages else pd.DataFrame()
+                last_page = pages[-1][0] if pages else page - 1
+            else:
+                records, is_last = fetch_page(size, page, session, self.api_key, sizer, claim)
+                last_page = page
+        finally:
+            save_sizer(claim, sizer)
+        return records, (self.initial_cursor if is_last else last_page + 1)
+
+    def transform(self, records):
+        return preprocess_jobs(records)
+
+    def page_rows(self, body):
+        return page_rows(body)
+
+    def output_name(self, cursor, ext: str) -> str:
+        stamp = datetime.now(KST).strftime('%Y%m%d_%H%M%S')
+        if ext == "parquet":
+            return blob_layout.place("parquet/", "gg", f"ggjobs_{stamp}_p{cursor}.parquet")
+        return blob_layout.place("", "gg", f"ggjobs_{stamp}_p{cursor}.csv")
+
+    def eventhub_target(self):
+        return eventhub_target()
+
+    def archive_location(self, name: str) -> tuple:
+        return ARCHIVE_CONTAINER, name
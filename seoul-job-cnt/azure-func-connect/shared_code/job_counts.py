@@ -0,0 +1,161 @@
+"""직무 코드별 공고 수를 함수 안에서 미리 집계해 보내는 추세(trend) 경로.
+
+jobinfo 테이블은 rcrit_jssfc_cmmn_code_se 별 이벤트 수를 담는데, 지금은 Stream Analytics 가
+스트리밍된 원본 행을 하나하나 세어 만듭니다. JOB_COUNTS_MODE 를 켜면 정제(clean_dataframe /
+preprocess_jobs)와 중복 제거가 끝난 행을 (집계 창, 소스, 직무 코드[, 지역][, 경력]) 별 건수로 줄여
+JOB_COUNTS_EVENTHUB_NAME 으로 보냅니다.
+
+- "off"(기본): 기존 동작
+- "both": 원본 행 경로는 그대로 두고 집계 레코드를 추가로 보냄
+- "only": 원본 행은 Event Hub 로 보내지 않고 Blob 보관본으로만 남김 (DELIVERY_MODE=direct 의 보관 경로 사용)
+
+건수는 더하기만 하면 합쳐지는 값이라, 청크 / 페이지 / tick / 소스마다 나눠 보낸 부분 집계를
+소비자 쪽에서 같은 키끼리 SUM(event_count) 하면 전체 집계와 같습니다. (merge_records 가 같은 합치기를 함)
+    SELECT window_start, rcrit_jssfc_cmmn_code_se, SUM(event_count) AS event_count
+    FROM counts GROUP BY window_start, rcrit_jssfc_cmmn_code_se, TumblingWindow(minute, 1)
+커서보다 먼저 보내므로 실패하면 다음 실행에서 같은 행을 다시 집계합니다. (원본 경로와 같은 at-least-once)
+"""
+import io
+import logging
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from shared_code import resource_pool, eventhub_sink, tracing
+
+JOB_COUNTS_MODE = os.getenv("JOB_COUNTS_MODE", "off").lower()                 # "off" | "both" | "only"
+JOB_COUNTS_EVENTHUB_NAME = os.getenv("JOB_COUNTS_EVENTHUB_NAME")              # 집계 레코드를 보낼 Event Hub
+JOB_COUNTS_WINDOW_SEC = int(os.getenv("JOB_COUNTS_WINDOW_SEC", "60"))         # 집계 창 크기(초). 창 시작은 UTC 기준
+JOB_COUNTS_DIMENSIONS = [d.strip() for d in os.getenv("JOB_COUNTS_DIMENSIONS", "").split(",") if d.strip()]
+
+CODE_COLUMN = 'RCRIT_JSSFC_CMMN_CODE_SE'         # 두 소스의 정제 결과(CSV 헤더 기준)에 공통인 직무 코드 컬럼
+DIMENSION_COLUMNS = {'region': 'region', 'career': 'career'}   # JOB_COUNTS_DIMENSIONS 에 쓸 수 있는 값 → 컬럼
+KEY_FIELDS = ['window_start', 'window_end', 'source', 'rcrit_jssfc_cmmn_code_se']
+
+
+def is_enabled() -> bool:
+    return JOB_COUNTS_MODE in ("both", "only") and bool(JOB_COUNTS_EVENTHUB_NAME)
+
+
+def streams_raw() -> bool:
+    """원본 행도 Event Hub 로 보내는지 여부. ("only" 이면 보관본만 남김)"""
+    return not (is_enabled() and JOB_COUNTS_MODE == "only")
+
+
+def target():
+    """집계 레코드를 보낼 (연결 문자열, Event Hub 이름). 연결 문자열은 원본 경로와 같은 네임스페이스를 씁니다."""
+    conn_str = (os.getenv("JOB_COUNTS_EVENTHUB_CONN_STR") or os.getenv("EVENTHUB_CONN_STR")
+                or os.getenv("EVENTHUB_CONNECTION"))
+    return (conn_str, JOB_COUNTS_EVENTHUB_NAME) if conn_str and JOB_COUNTS_EVENTHUB_NAME else None
+
+
+def window_of(at: datetime = None, window_sec: int = None) -> datetime:
+    """at(기본: 지금)이 속한 집계 창의 시작 시각 (UTC)."""
+    window_sec = window_sec or JOB_COUNTS_WINDOW_SEC
+    at = (at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    epoch = int(at.timestamp()) // window_sec * window_sec
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+def _key_values(series: pd.Series) -> pd.Series:
+    """결측은 빈 문자열, 나머지는 문자열로 맞춰 같은 값이 같은 키가 되게 합니다. (NaN 은 dict 키로 합쳐지지 않음)"""
+    return series.astype(object).where(series.notna(), "").astype(str)
+
+
+class JobCounts:
+    """(창 시작, 소스, 직무 코드[, 차원...]) → 건수. 합치기(merge)는 키별 덧셈이라 순서와 무관합니다."""
+
+    def __init__(self, dimensions: list = None, window_sec: int = None):
+        self.dimensions = list(JOB_COUNTS_DIMENSIONS if dimensions is None else dimensions)
+        unknown = [d for d in self.dimensions if d not in DIMENSION_COLUMNS]
+        if unknown:
+            raise ValueError(f"알 수 없는 집계 차원: {unknown} (가능: {list(DIMENSION_COLUMNS)})")
+        self.window_sec = window_sec or JOB_COUNTS_WINDOW_SEC
+        self.counts = Counter()
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def add_frame(self, df: pd.DataFrame, source: str, header=None, at: datetime = None) -> None:
+        """정제된 df 의 행을 집계합니다. header 가 있으면 CSV 헤더 이름으로 컬럼을 찾습니다. (경기 전처리 결과)"""
+        if df is None or df.empty:
+            return
+        frame = df.set_axis(list(header), axis=1) if header is not None else df
+        columns = [CODE_COLUMN] + [DIMENSION_COLUMNS[d] for d in self.dimensions]
+        keys = pd.DataFrame({c: _key_values(frame[c]) for c in columns})
+        grouped = keys.groupby(columns, sort=False).size()
+        window = window_of(at, self.window_sec)
+        with self._lock:
+            for key, n in grouped.items():
+                key = key if isinstance(key, tuple) else (key,)
+                self.counts[(window, source) + key] += int(n)
+            self.rows += len(df)
+
+    def merge(self, other: "JobCounts") -> "JobCounts":
+        if other.dimensions != self.dimensions or other.window_sec != self.window_sec:
+            raise ValueError("차원 / 창 크기가 다른 집계는 합칠 수 없습니다.")
+        with self._lock:
+            self.counts.update(other.counts)
+            self.rows += other.rows
+        return self
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def fields(self) -> list:
+        return KEY_FIELDS + self.dimensions + ['event_count']
+
+    def records(self) -> list:
+        """집계 레코드(dict) 목록. 창 시작 / 끝은 ISO 8601(UTC) 문자열입니다."""
+        step = timedelta(seconds=self.window_sec)
+        out = []
+        for (window, source, *key), n in sorted(self.counts.items()):
+            row = {'window_start': window.isoformat(), 'window_end': (window + step).isoformat(),
+                   'source': source, 'rcrit_jssfc_cmmn_code_se': key[0]}
+            row.update(zip(self.dimensions, key[1:]))
+            row['event_count'] = n
+            out.append(row)
+        return out
+
+    def to_csv(self) -> str:
+        return pd.DataFrame(self.records(), columns=self.fields()).to_csv(index=False)
+
+
+def merge_records(records, by_source: bool = True) -> list:
+    """여러 번 나눠 보낸 부분 집계 레코드를 같은 키끼리 더합니다. by_source=False 면 두 소스도 합칩니다."""
+    totals = Counter()
+    for r in records:
+        key = tuple((k, r[k]) for k in r if k != 'event_count' and (by_source or k != 'source'))
+        totals[key] += int(r['event_count'])
+    return [dict(key, event_count=n) for key, n in sorted(totals.items())]
+
+
+def read_csv(text: str) -> list:
+    """to_csv 로 만든(또는 decode_event 로 푼) 집계 CSV 를 레코드 목록으로 읽습니다. 코드의 앞자리 0 을 유지합니다."""
+    df = pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+    df['event_count'] = df['event_count'].astype(int)
+    return df.to_dict(orient='records')
+
+
+def _send_attributes(stats: dict) -> dict:
+    return {'events': stats['events'], 'payload.bytes': stats['bytes']}
+
+
+@tracing.traced("job_counts.send", on_result=_send_attributes)
+def send(counts: JobCounts) -> dict:
+    """집계 레코드를 JOB_COUNTS_EVENTHUB_NAME 으로 보냅니다. 보낼 것이 없거나 꺼져 있으면 빈 통계를 반환합니다."""
+    empty = {'events': 0, 'batches': 0, 'bytes': 0, 'raw_bytes': 0, 'encoding': "none"}
+    if not is_enabled() or not len(counts):
+        return empty
+    hub = target()
+    if hub is None:
+        logging.warning("⚠️ JOB_COUNTS_MODE 가 켜져 있지만 Event Hub 연결 문자열이 없어 집계를 보내지 않습니다.")
+        return empty
+    text = counts.to_csv()
+    tracing.set_attributes(rows=counts.rows, records=len(counts))
+    stats = resource_pool.with_eventhub_producer(*hub, lambda producer: eventhub_sink.send_csv(producer, text))
+    logging.info(f"📊 직무 코드 집계 전송: 원본 {counts.rows}건 → 집계 {len(counts)}건 | "
+                 f"이벤트 {stats['events']}개 / {stats['bytes']} bytes{eventhub_sink.compression_summary(stats)}")
+    return stats
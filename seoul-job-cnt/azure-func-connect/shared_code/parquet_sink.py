@@ -0,0 +1,89 @@
+"""정제된 DataFrame 을 Parquet(컬럼 기반) 으로 저장하는 공용 로직.
+
+CSV(UTF-8-SIG) / JSON 은 타입 정보가 없고 크며 나중에 읽을 때 전체를 스캔해야 하므로,
+저카디널리티 컬럼(wage_type, region, career, 직업 코드 등)은 dictionary 인코딩하고
+압축 코덱을 설정할 수 있는 Parquet 로도 쓸 수 있게 합니다.
+pyarrow 는 이 모듈을 실제로 쓸 때만 import 합니다.
+"""
+import io
+import os
+import time
+
+OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "csv")                   # "csv" | "parquet" | "both"
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")      # "zstd" | "snappy" | "gzip" | "none" ...
+
+# 두 파이프라인(서울/경기)의 출력 헤더 기준 저카디널리티 컬럼
+DICTIONARY_COLUMNS = [
+    'wage_type', 'region', 'career', 'RCRIT_JSSFC_CMMN_CODE_SE',
+    'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE'
+]
+
+
+def writes_csv(fmt: str = None) -> bool:
+    return (fmt or OUTPUT_FORMAT) in ("csv", "both")
+
+
+def writes_parquet(fmt: str = None) -> bool:
+    return (fmt or OUTPUT_FORMAT) in ("parquet", "both")
+
+
+def to_arrow_table(df, header: list = None):
+    """CSV 와 같은 컬럼 이름(header)으로 Arrow 테이블을 만듭니다.
+
+    여러 타입이 섞인 object 컬럼(예: 0 과 '대졸')은 결측을 제외하고 문자열로 맞춥니다.
+    """
+    import pyarrow as pa
+
+    out = df.copy()
+    if header is not None:
+        out.columns = header
+    for c in out.columns:
+        if out[c].dtype == object:
+            col = out[c]
+            out[c] = col.astype(str).where(col.notna(), None)
+    return pa.Table.from_pandas(out, preserve_index=False)
+
+
+def to_parquet_bytes(df, header: list = None, compression: str = None,
+                     dictionary_columns: list = DICTIONARY_COLUMNS) -> bytes:
+    """DataFrame 을 Parquet bytes 로 변환합니다. dictionary_columns 만 dictionary 인코딩합니다."""
+    import pyarrow.parquet as pq
+
+    table = to_arrow_table(df, header)
+    codec = compression or PARQUET_COMPRESSION
+    buf = io.BytesIO()
+    pq.write_table(
+        table, buf,
+        compression=None if codec == "none" else codec,
+        use_dictionary=[c for c in dictionary_columns if c in table.column_names],
+    )
+    return buf.getvalue()
+
+
+def read_parquet_columns(data: bytes, columns: list = None):
+    """Parquet bytes 에서 필요한 컬럼만 읽어 DataFrame 으로 반환합니다. (컬럼 projection)"""
+    import pyarrow.parquet as pq
+
+    return pq.read_table(io.BytesIO(data), columns=columns).to_pandas()
+
+
+def compare_with_csv(df, header: list = None, compression: str = None) -> dict:
+    """같은 DataFrame 을 CSV(UTF-8-SIG) 와 Parquet 로 썼을 때의 크기 / 쓰기 시간을 비교합니다."""
+    started = time.perf_counter()
+    csv_bytes = df.to_csv(index=False, header=header if header is not None else True,
+                          encoding="utf-8-sig").encode("utf-8-sig")
+    csv_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    parquet_bytes = to_parquet_bytes(df, header, compression)
+    parquet_sec = time.perf_counter() - started
+
+    return {
+        'rows': len(df),
+        'csv_bytes': len(csv_bytes),
+        'parquet_bytes': len(parquet_bytes),
+        'size_ratio': round(len(parquet_bytes) / len(csv_bytes), 4) if csv_bytes else None,
+        'csv_write_ms': round(csv_sec * 1000, 3),
+        'parquet_write_ms': round(parquet_sec * 1000, 3),
+        'compression': compression or PARQUET_COMPRESSION,
+    }
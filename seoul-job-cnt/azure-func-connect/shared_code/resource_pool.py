@@ -0,0 +1,184 @@
+"""웜 인스턴스 리소스 풀.
+
+Blob / Event Hub / HTTP 클라이언트를 워커 프로세스당 한 번만 만들고
+이후 호출에서 재사용합니다. 연결 오류가 나면 클라이언트를 버리고 새로 만든 뒤 한 번 더 시도합니다.
+"""
+import logging
+import threading
+import time
+
+from shared_code import tracing
+
+
+def _connection_errors() -> tuple:
+    """클라이언트를 다시 만들어야 하는 연결 계열 예외 목록을 반환합니다."""
+    errors = [ConnectionError, TimeoutError]
+    try:
+        from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+        errors += [ServiceRequestError, ServiceResponseError]
+    except ImportError:
+        pass
+    try:
+        from azure.eventhub.exceptions import ConnectionLostError
+        errors.append(ConnectionLostError)
+    except ImportError:
+        pass
+    try:
+        import requests
+        errors += [requests.ConnectionError, requests.Timeout]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+class ResourcePool:
+    """key 별로 클라이언트를 지연 생성하고 재사용하는 풀 (스레드 안전)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._created_containers = set()
+        self._stats = {}
+
+    def _stat(self, kind: str) -> dict:
+        return self._stats.setdefault(kind, {'hits': 0, 'misses': 0, 'rebuilds': 0, 'build_sec': 0.0})
+
+    def get(self, key: tuple, factory):
+        """key 에 해당하는 클라이언트를 반환합니다. 없으면 factory() 로 만들어 저장합니다."""
+        with self._lock:
+            stat = self._stat(key[0])
+            client = self._clients.get(key)
+            if client is not None:
+                stat['hits'] += 1
+                return client
+            started = time.perf_counter()
+            client = factory()
+            stat['misses'] += 1
+            stat['build_sec'] += time.perf_counter() - started
+            self._clients[key] = client
+            return client
+
+    def invalidate(self, key: tuple) -> None:
+        """key 의 클라이언트를 닫고 풀에서 제거합니다. 다음 get() 에서 새로 만듭니다."""
+        with self._lock:
+            client = self._clients.pop(key, None)
+            self._stat(key[0])['rebuilds'] += 1
+            self._created_containers = {c for c in self._created_containers if c[0] != key}
+        close = getattr(client, 'close', None)
+        if close:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def run(self, key: tuple, factory, fn):
+        """fn(client) 를 실행합니다. 연결 오류면 클라이언트를 다시 만들어 한 번 더 실행합니다."""
+        try:
+            return fn(self.get(key, factory))
+        except _connection_errors() as e:
+            logging.warning(f"♻️ 연결 오류로 클라이언트 재생성 ({key[0]}): {e}")
+            tracing.increment_attribute('retries')
+            self.invalidate(key)
+            return fn(self.get(key, factory))
+
+    def ensure_container(self, key: tuple, container_client) -> None:
+        """컨테이너 생성(create_container)을 워커당 한 번만 시도합니다."""
+        marker = (key, container_client.container_name)
+        if marker in self._created_containers:
+            return
+        try:
+            container_client.create_container()
+        except Exception:
+            pass  # 이미 존재하면 무시
+        with self._lock:
+            self._created_containers.add(marker)
+
+    def stats(self) -> dict:
+        """종류별 hits / misses / rebuilds 와 재사용으로 아낀 추정 시간(est_saved_sec)을 반환합니다."""
+        with self._lock:
+            out = {}
+            for kind, s in self._stats.items():
+                avg = s['build_sec'] / s['misses'] if s['misses'] else 0.0
+                out[kind] = dict(s, est_saved_sec=round(avg * s['hits'], 4))
+            return out
+
+    def clear(self) -> None:
+        """모든 클라이언트를 닫고 통계를 초기화합니다."""
+        for key in list(self._clients):
+            self.invalidate(key)
+        with self._lock:
+            self._stats.clear()
+
+
+# 워커 프로세스당 하나의 풀
+POOL = ResourcePool()
+
+
+def _blob_key(conn_str: str) -> tuple:
+    return ('blob', conn_str)
+
+
+def _blob_factory(conn_str: str):
+    def factory():
+        from azure.storage.blob import BlobServiceClient
+        return BlobServiceClient.from_connection_string(conn_str)
+    return factory
+
+
+def blob_service(conn_str: str):
+    """연결 문자열별 BlobServiceClient 를 반환합니다."""
+    return POOL.get(_blob_key(conn_str), _blob_factory(conn_str))
+
+
+def container_client(conn_str: str, container_name: str, create: bool = False):
+    """ContainerClient 를 반환합니다. create=True 면 컨테이너 생성을 워커당 한 번만 시도합니다."""
+    client = blob_service(conn_str).get_container_client(container_name)
+    if create:
+        POOL.ensure_container(_blob_key(conn_str), client)
+    return client
+
+
+def with_blob_service(conn_str: str, fn):
+    """fn(BlobServiceClient) 를 실행합니다. 연결 오류 시 클라이언트를 다시 만들어 재시도합니다."""
+    return POOL.run(_blob_key(conn_str), _blob_factory(conn_str), fn)
+
+
+def _eventhub_key(conn_str: str, eventhub_name: str) -> tuple:
+    return ('eventhub', conn_str, eventhub_name)
+
+
+def _eventhub_factory(conn_str: str, eventhub_name: str):
+    def factory():
+        from azure.eventhub import EventHubProducerClient
+        return EventHubProducerClient.from_connection_string(conn_str, eventhub_name=eventhub_name)
+    return factory
+
+
+def eventhub_producer(conn_str: str, eventhub_name: str):
+    """EventHubProducerClient 를 반환합니다. 재사용되므로 with 문으로 닫지 마세요."""
+    return POOL.get(_eventhub_key(conn_str, eventhub_name), _eventhub_factory(conn_str, eventhub_name))
+
+
+def with_eventhub_producer(conn_str: str, eventhub_name: str, fn):
+    """fn(EventHubProducerClient) 를 실행합니다. 연결 오류 시 클라이언트를 다시 만들어 재시도합니다."""
+    return POOL.run(_eventhub_key(conn_str, eventhub_name), _eventhub_factory(conn_str, eventhub_name), fn)
+
+
+def invalidate_eventhub_producer(conn_str: str, eventhub_name: str) -> None:
+    """전송 실패 후 Producer 를 버려 다음 호출에서 새로 만들게 합니다."""
+    POOL.invalidate(_eventhub_key(conn_str, eventhub_name))
+
+
+def http_session(name: str, factory):
+    """name 별 requests.Session 을 반환합니다. factory 는 처음 한 번만 호출됩니다."""
+    return POOL.get(('http', name), factory)
+
+
+def invalidate_http_session(name: str) -> None:
+    """연결 오류 등으로 세션을 버려야 할 때 호출합니다."""
+    POOL.invalidate(('http', name))
+
+
+def stats() -> dict:
+    """POOL.stats() 바로가기."""
+    return POOL.stats()
@@ -0,0 +1,603 @@
+"""서울시 일자리 OpenAPI(GetJobInfo) 수집 / 정제 로직.
+
+서울 타이머 트리거(trig_connect_seoul)와 통합 수집 엔진(ingest_engine)이 함께 씁니다.
+"""
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from shared_code import resource_pool, ingest_engine, cursor_store, adaptive_size, factorize_map, tracing, record_path
+from shared_code import raw_archive, blob_layout
+
+
+# === 환경 설정 상수 ===
+STATE_BLOB_NAME = "state/current_start_index.json" # 현재 인덱스를 저장할 Blob 파일 경로
+SEOUL_API_BASE_URL = os.getenv("SEOUL_API_BASE_URL", "http://openapi.seoul.go.kr:8088") # 서울 OpenAPI 주소 (부하 테스트에서는 로컬 가짜 서버)
+CHUNK_SIZE = 100 # 한 번의 함수 실행(1분) 시 가져올 레코드 수 <-- 수정됨 (100)
+CHUNK_SIZES = (50, 100, 200, 300, 500, 700, 1000) # ADAPTIVE_SIZE=1 일 때 고를 수 있는 청크 크기 (API 최대 1000건)
+DEFAULT_START_INDEX = 1 # 시작 인덱스 (API의 첫 페이지)
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "1")) # 한 번의 실행에서 병렬로 가져올 청크(범위) 수
+FETCH_RANGE_RETRIES = 2 # 실패한 범위를 다시 요청하는 최대 횟수
+CLEAN_ENGINE = os.getenv("CLEAN_ENGINE", "vectorized") # 정제 엔진 선택: "vectorized" | "factorized" | "reference"
+DEDUPE_BLOB_NAME = "state/dedupe_index.bin" # 중복 제거 인덱스 Blob 경로 (DEDUPE_ENABLED=1 일 때 사용)
+DEDUPE_KEY_COLUMNS = ['company', 'job_title', 'region', 'RCRIT_JSSFC_CMMN_CODE_SE'] # 같은 공고로 볼 식별 컬럼
+SEOUL_PROBE = os.getenv("SEOUL_PROBE", "0") == "1" # 1 이면 따라잡은 뒤에는 1건짜리 요청으로 전체 건수를 먼저 확인 (새 공고가 없으면 건너뜀)
+TOTAL_FIELD = "list_total_count" # 마지막으로 확인한 전체 건수 (커서 상태에 함께 저장)
+TRIGGER_PREFIX = "data/all_jobs/" # blob_to_eventhub 가 감시하는 경로
+ARCHIVE_PREFIX = "data/archive/" # DELIVERY_MODE=direct 일 때 CSV 보관본 경로 (Blob 트리거 경로 밖)
+PARQUET_PREFIX = "data/parquet/" # OUTPUT_FORMAT=parquet|both 일 때 Parquet 경로 (Blob 트리거 경로 밖)
+
+# =========================================================================
+# === 1. Session 생성 함수 (API 재시도 로직) ===
+# =========================================================================
+def build_session(total_retries: int = 3, backoff: float = 1.0, pool_maxsize: int = 10) -> requests.Session:
+    """HTTP 요청 세션을 설정하고 재시도 정책을 적용합니다."""
+    s = requests.Session()
+    # 429(Rate Limit), 5xx 서버 에러 발생 시 재시도하도록 설정
+    retries = Retry(total=total_retries, backoff_factor=backoff, status_forcelist=[429, 500, 502, 503, 504])
+    # 병렬 요청 시 스레드들이 keep-alive 연결을 공유하도록 풀 크기를 맞춥니다.
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+    s.mount('https://', adapter)
+    s.mount('http://', adapter)
+    return s
+
+
+def get_cursor_store(conn_str: str, container_name: str) -> cursor_store.CursorStore:
+    """다음 start_index 를 저장하는 커서 저장소 (trig_connect_seoul 과 통합 수집 엔진이 공유)."""
+    return cursor_store.CursorStore(conn_str, container_name, STATE_BLOB_NAME,
+                                    cursor_field='next_start_index', default=DEFAULT_START_INDEX)
+
+
+def get_api_session() -> requests.Session:
+    """웜 워커에서는 이전 실행의 세션(연결 풀)을 그대로 재사용합니다."""
+    return resource_pool.http_session(
+        "seoul-openapi", lambda: build_session(pool_maxsize=max(FETCH_CONCURRENCY, 10))
+    )
+
+
+def eventhub_target():
+    """DELIVERY_MODE=direct 일 때 서울 결과를 보낼 (연결 문자열, Event Hub 이름). 설정이 없으면 None.
+
+    서울 앱은 blob_to_eventhub 와 같은 EVENTHUB_CONNECTION / EVENTHUB_NAME 을,
+    다른 앱(통합 수집)에서는 SEOUL_EVENTHUB_CONN_STR / SEOUL_EVENTHUB_NAME 을 씁니다.
+    """
+    if os.getenv("SEOUL_EVENTHUB_CONN_STR"):
+        return os.getenv("SEOUL_EVENTHUB_CONN_STR"), os.getenv("SEOUL_EVENTHUB_NAME") or os.getenv("EVENTHUB_NAME")
+    if os.getenv("EVENTHUB_CONNECTION") and os.getenv("EVENTHUB_NAME"):
+        return os.getenv("EVENTHUB_CONNECTION"), os.getenv("EVENTHUB_NAME")
+    return None
+
+
+def archive_name(name: str) -> str:
+    """Blob 트리거 경로(data/all_jobs/)의 파일명을 보관본 경로(data/archive/)로 바꿉니다. 다른 경로는 그대로."""
+    if name.startswith(TRIGGER_PREFIX):
+        return ARCHIVE_PREFIX + name[len(TRIGGER_PREFIX):]
+    return name
+
+
+def load_sizer(claim):
+    """ADAPTIVE_SIZE=1 이면 커서 상태에 저장된 학습값으로 청크 크기 컨트롤러를 만듭니다. (아니면 None)"""
+    if not adaptive_size.ADAPTIVE_SIZE:
+        return None
+    return adaptive_size.AdaptiveSizer.from_state(claim.state.get('sizer'), CHUNK_SIZES, CHUNK_SIZE)
+
+
+# =========================================================================
+# === 2. JSON/텍스트 파싱 유틸 (기존 로직 유지) ===
+# =========================================================================
+def extract_by_path(obj, path: str):
+    """JSON 객체에서 '.' 경로를 이용해 값을 추출합니다."""
+    if not path:
+        return obj
+    cur = obj
+    for p in path.split('.'):
+        if isinstance(cur, dict) and p in cur:
+            cur = cur[p]
+        else:
+            return None
+    return cur
+
+def ensure_list(x):
+    """입력값을 리스트로 변환합니다."""
+    if x is None:
+        return []
+    if isinstance(x, list):
+        return x
+    return [x]
+
+def parse_wage(text):
+    """시급/월급 문자열을 파싱하여 금액(KRW)을 추출합니다."""
+    # (원래의 상세한 파싱 로직 유지)
+    if not isinstance(text, str):
+        return {'wage_type': None, 'wage_value_krw': None, 'wage_raw': text}
+    s = text.strip()
+    m = re.search(r'\(?(월급|시급)\)?\s*[/\\]?\s*([0-9,\.]+)\s*(만원|원)?', s)
+    if m:
+        wtype, num, unit = m.group(1), m.group(2), m.group(3) or '원'
+        try:
+            num_val = int(float(num.replace(',', '')))
+        except Exception:
+            num_val = None
+        value = num_val * 10000 if unit == '만원' else num_val
+        return {'wage_type': wtype, 'wage_value_krw': value, 'wage_raw': text}
+    m2 = re.search(r'([0-9,\.]+)\s*(만원|원)', s)
+    if m2:
+        try:
+            num_val = int(float(m2.group(1).replace(',', '')))
+        except Exception:
+            num_val = None
+        unit = m2.group(2)
+        value = num_val * 10000 if unit == '만원' else num_val
+        wtype = '월급' if '월' in s else ('시급' if '시' in s else None)
+        return {'wage_type': wtype, 'wage_value_krw': value, 'wage_raw': text}
+    return {'wage_type': None, 'wage_value_krw': None, 'wage_raw': text}
+
+def parse_gui_ln(gui):
+    """GUI_LN 문자열에서 지역(region)과 경력(career)을 추출합니다."""
+    # (원래의 상세한 파싱 로직 유지)
+    if not isinstance(gui, str):
+        return {'region': None, 'career': None, 'gui_raw': gui}
+    parts = [p.strip() for p in gui.split('/')]
+    region = parts[1] if len(parts) >= 2 else None
+    career = parts[2] if len(parts) >= 3 else None
+    return {'region': region, 'career': career, 'gui_raw': gui}
+
+
+# =========================================================================
+# === 3. 단일 청크 API 호출 (Industry 코드 제거) ===
+# =========================================================================
+@tracing.traced("seoul.request_range")
+def request_range(session: requests.Session, api_key: str, start_index: int, end_index: int,
+                  sizer: adaptive_size.AdaptiveSizer = None, claim=None) -> list:
+    """start_index~end_index 범위의 레코드를 요청합니다. 실패 시 예외를 그대로 올립니다.
+    sizer 가 있으면 걸린 시간 / 건수 / 실패 여부를 알려 다음 요청 크기를 조절합니다.
+    claim 은 응답을 보관 대기열에 넣을 때 쓰는 커서 claim 입니다. (RAW_ARCHIVE=1, 없으면 보관하지 않음)"""
+    # URL에서 // 다음에 있던 {industry} 부분을 제거했습니다.
+    url = f"{SEOUL_API_BASE_URL}/{api_key}/json/GetJobInfo/{start_index}/{end_index}/"
+    started = time.perf_counter()
+    try:
+        resp = session.get(url, timeout=15)
+        tracing.set_attributes(**{'start_index': start_index, 'end_index': end_index, 'http.status_code': resp.status_code,
+                                  'http.retries': tracing.http_retries(resp), 'payload.bytes': len(resp.content)})
+        resp.raise_for_status()
+        data = resp.json()
+        records = ensure_list(extract_by_path(data, "GetJobInfo.row"))
+        tracing.set_attributes(rows=len(records))
+        if records:
+            # RAW_ARCHIVE=1 이면 응답 JSON 을 그대로 보관 (커서를 저장한 뒤 claim 의 raw_archive.flush 가 씀, claim 이 없으면 보관 안 함)
+            raw_archive.capture("seoul", claim, start_index, {'start_index': start_index, 'end_index': end_index}, data)
+    except Exception as e:
+        if sizer is not None:
+            sizer.observe(end_index - start_index + 1, time.perf_counter() - started, 0, error=e)
+        raise
+    if sizer is not None:
+        sizer.observe(end_index - start_index + 1, time.perf_counter() - started, len(records))
+    return records
+
+
+# industry 파라미터 제거
+@tracing.traced("seoul.fetch_one_chunk_of_jobs",
+                on_result=lambda r: {'rows': len(r[0]), 'next_start_index': r[1]})
+def fetch_one_chunk_of_jobs(session: requests.Session, api_key: str, start_index: int, chunk_size: int = CHUNK_SIZE,
+                            sizer: adaptive_size.AdaptiveSizer = None, claim=None):
+    """지정된 start_index부터 chunk_size만큼의 레코드만 가져옵니다."""
+    
+    end_index = start_index + chunk_size - 1
+    
+    logging.info(f"🚀 API 요청 범위 (전체 산업): Start={start_index}, End={end_index}")
+
+    try:
+        records = request_range(session, api_key, start_index, end_index, sizer, claim)
+    except Exception as e:
+        logging.error(f"❌ API 요청 실패 (Start={start_index}): {e}")
+        return [], start_index # 실패 시 현재 인덱스를 유지하고 종료
+    
+    # 다음 시작 인덱스를 계산합니다.
+    next_start_index = start_index + len(records)
+    
+    if not records:
+        logging.info("⭐ API 응답에 데이터가 없습니다. 스트림의 끝일 수 있습니다.")
+    
+    return records, next_start_index
+
+
+@tracing.traced("seoul.fetch_chunks_concurrently",
+                on_result=lambda r: {'rows': len(r[0]), 'next_start_index': r[1]})
+def fetch_chunks_concurrently(session: requests.Session, api_key: str, start_index: int,
+                              chunk_size: int = CHUNK_SIZE, num_chunks: int = FETCH_CONCURRENCY,
+                              max_retries: int = FETCH_RANGE_RETRIES, sizer: adaptive_size.AdaptiveSizer = None,
+                              claim=None):
+    """start_index부터 겹치지 않는 num_chunks개의 범위를 병렬로 가져옵니다.
+
+    결과는 인덱스 순서로 이어 붙이며, 앞에서부터 연속으로 성공한 범위까지만 반환합니다.
+    중간 범위가 재시도 후에도 실패하면 그 뒤의 범위는 버려서(다음 실행에서 다시 요청) 누락이 생기지 않게 합니다.
+    """
+    starts = [start_index + i * chunk_size for i in range(num_chunks)]
+    results = {}  # start -> records
+
+    with ThreadPoolExecutor(max_workers=num_chunks) as pool:
+        pending = starts
+        for attempt in range(max_retries + 1):
+            tracing.set_attributes(attempts=attempt + 1)
+            fetch = tracing.bind(request_range)     # 병렬 요청 span 도 이 span 아래로
+            futures = {st: pool.submit(fetch, session, api_key, st, st + chunk_size - 1, sizer, claim) for st in pending}
+            failed = []
+            for st, fut in futures.items():
+                try:
+                    results[st] = fut.result()
+                except Exception as e:
+                    logging.warning(f"⚠️ 범위 요청 실패 (Start={st}, 시도 {attempt + 1}/{max_retries + 1}): {e}")
+                    failed.append(st)
+            # 실패한 범위만 다시 요청합니다. (이미 확인된 스트림 끝 뒤쪽 범위는 제외)
+            ends = [st for st, rows in results.items() if len(rows) < chunk_size]
+            pending = [st for st in failed if not ends or st < min(ends)]
+            if not pending:
+                break
+
+    # 인덱스 순서로 연속 성공 구간만 이어 붙입니다.
+    records = []
+    for st in starts:
+        if st not in results:
+            logging.error(f"❌ 범위 요청 최종 실패 (Start={st}). 이 지점부터는 다음 실행에서 다시 요청합니다.")
+            break
+        records.extend(results[st])
+        if len(results[st]) < chunk_size:
+            break  # 스트림의 끝: 뒤 범위는 비어 있음
+
+    next_start_index = start_index + len(records)
+    logging.info(f"🚀 병렬 요청 완료: {num_chunks}개 범위, {len(records)}건, 다음 시작 인덱스 = {next_start_index}")
+    return records, next_start_index
+
+
+@tracing.traced("seoul.probe_total", on_result=lambda total: {TOTAL_FIELD: total})
+def probe_total(session: requests.Session, api_key: str):
+    """1건짜리 요청(1~1)의 응답에서 전체 건수(list_total_count)만 읽습니다. 확인하지 못하면 None."""
+    url = f"{SEOUL_API_BASE_URL}/{api_key}/json/GetJobInfo/1/1/"
+    try:
+        resp = session.get(url, timeout=15)
+        tracing.set_attributes(**{'http.status_code': resp.status_code, 'payload.bytes': len(resp.content)})
+        resp.raise_for_status()
+        total = extract_by_path(resp.json(), f"GetJobInfo.{TOTAL_FIELD}")
+        return int(total) if total is not None else None
+    except Exception as e:
+        logging.warning(f"⚠️ 전체 건수 확인 실패 - 평소처럼 범위를 요청합니다: {e}")
+        return None
+
+
+def plan_window(session: requests.Session, api_key: str, start_index: int, claim=None):
+    """SEOUL_PROBE=1 일 때 이번 실행에서 요청할 수 있는 새 레코드 수를 정합니다. (None 이면 제한 없이 평소대로)
+
+    지난 확인 때보다 커서가 뒤처져 있으면(밀린 범위가 있음) 확인 요청 없이 평소대로 수집하고,
+    따라잡은 뒤에만 1건짜리 요청으로 전체 건수를 확인해 새로 붙은 범위(start_index ~ 전체 건수)만 요청합니다.
+    확인한 전체 건수는 claim.fields 에 넣어 커서와 함께 저장합니다.
+    """
+    last_total = claim.state.get(TOTAL_FIELD) if claim is not None else None
+    if not SEOUL_PROBE or (last_total is not None and start_index <= last_total):
+        return None
+    total = probe_total(session, api_key)
+    if total is None:
+        return None
+    if claim is not None and total != last_total:
+        claim.fields[TOTAL_FIELD] = total
+    if last_total is not None and total < last_total:
+        logging.warning(f"⚠️ 전체 건수가 줄었습니다: {last_total} → {total} (다음 시작 인덱스 {start_index})")
+    return max(total - start_index + 1, 0)
+
+
+def fetch_window(session: requests.Session, api_key: str, start_index: int, claim=None):
+    """이번 실행에서 가져올 범위를 수집합니다. (FETCH_CONCURRENCY > 1 이면 병렬, ADAPTIVE_SIZE=1 이면 학습한 청크 크기)
+    학습한 크기는 claim.fields 에 넣어 커서와 함께 저장합니다.
+    SEOUL_PROBE=1 이면 새로 붙은 건수만큼만 요청하고, 새 공고가 없으면 범위 요청 없이 ([], start_index) 를 반환합니다."""
+    sizer = load_sizer(claim) if claim is not None else None
+    chunk_size = sizer.size if sizer else CHUNK_SIZE
+    try:
+        available = plan_window(session, api_key, start_index, claim)
+        if available == 0:
+            logging.info(f"⏭️ 새 공고 없음 (다음 시작 인덱스 {start_index}) - 범위 요청을 건너뜁니다.")
+            return [], start_index
+        if FETCH_CONCURRENCY > 1:
+            num_chunks = FETCH_CONCURRENCY if available is None else min(FETCH_CONCURRENCY, -(-available // chunk_size))
+            if num_chunks > 1:
+                return fetch_chunks_concurrently(session, api_key, start_index, chunk_size, num_chunks, sizer=sizer, claim=claim)
+        size = chunk_size if available is None else min(chunk_size, available)
+        return fetch_one_chunk_of_jobs(session, api_key, start_index, size, sizer, claim)
+    finally:
+        if sizer is not None:
+            claim.fields['sizer'] = sizer.to_state()
+            logging.info(f"📏 청크 크기 {chunk_size} → 다음 {sizer.size} | {sizer.stats()}")
+
+
+# =========================================================================
+# === 4. 데이터 정제 (기존 로직 유지) ===
+# =========================================================================
+@tracing.traced("seoul.clean_dataframe", on_result=lambda out: {'rows.out': len(out)})
+def clean_dataframe(df: pd.DataFrame, convert_monthly: bool = True, hours_per_month: int = 209,
+                    engine: str = None) -> pd.DataFrame:
+    """데이터프레임을 정제합니다. engine에 따라 벡터화 / 고유값 단위 / 참조(행 단위) 구현을 선택합니다."""
+    engine = engine or CLEAN_ENGINE
+    tracing.set_attributes(engine=engine, **{'rows.in': len(df)})
+    if engine == "reference":
+        return clean_dataframe_reference(df, convert_monthly, hours_per_month)
+    if engine == "factorized":
+        # 참조 구현과 같은 파서를 고유값마다 한 번만 실행 (shared_code/factorize_map.py)
+        return clean_dataframe_reference(df, convert_monthly, hours_per_month, factorize=True)
+    if engine == "vectorized":
+        return clean_dataframe_vectorized(df, convert_monthly, hours_per_month)
+    raise ValueError(f"알 수 없는 정제 엔진: {engine}")
+
+
+def clean_records(records: list):
+    """API 레코드(dict 목록)를 정제합니다. RECORD_PATH_MAX_ROWS 이하의 작은 tick 은 pandas 없이
+    레코드 경로(shared_code/record_path.py)로 같은 CSV 를 만드는 RecordFrame 을, 그 외에는 DataFrame 을 반환합니다."""
+    if record_path.applies(len(records)):
+        with tracing.span("seoul.clean_records", engine="records", **{'rows.in': len(records)}):
+            return record_path.seoul_frame(records)
+    return clean_dataframe(pd.DataFrame(records))
+
+
+def clean_dataframe_reference(df: pd.DataFrame, convert_monthly: bool = True, hours_per_month: int = 209,
+                              factorize: bool = False) -> pd.DataFrame:
+    """데이터프레임을 정제하고 임금 정보 등을 파싱합니다. (행 단위 참조 구현)
+    factorize=True 이면 컬럼 파서(parse_wage 등)를 고유값마다 한 번만 실행합니다."""
+    apply = factorize_map.map_unique if factorize else factorize_map.apply_each
+    apply_rows = factorize_map.map_unique_rows if factorize else factorize_map.apply_rows
+    # (원래의 상세한 정제 로직 유지)
+    keep = [
+        'CMPNY_NM', 'JO_SJ', 'HOPE_WAGE', 'GUI_LN',
+        'RCRIT_JSSFC_CMMN_CODE_SE', 'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE'
+    ]
+    existing = [c for c in keep if c in df.columns]
+    out = df[existing].copy()
+    out = out.rename(columns={
+        'CMPNY_NM': 'company',
+        'JO_SJ': 'job_title',
+        'HOPE_WAGE': 'hope_wage',
+        'GUI_LN': 'gui_ln'
+    })
+
+    wage_df = pd.DataFrame(apply(out['hope_wage'].fillna(''), parse_wage, 'seoul.HOPE_WAGE').tolist(), index=out.index)
+    gui_df = pd.DataFrame(apply(out['gui_ln'].fillna(''), parse_gui_ln, 'seoul.GUI_LN').tolist(), index=out.index)
+
+    out = pd.concat([out, wage_df, gui_df], axis=1)
+
+    if convert_monthly:
+        def to_monthly(row):
+            if row.get('wage_type') == '시급' and row.get('wage_value_krw'):
+                return int(row['wage_value_krw'] * hours_per_month)
+            if row.get('wage_type') == '월급' and row.get('wage_value_krw'):
+                return int(row['wage_value_krw'])
+            return None
+        out['wage_value_monthly'] = apply_rows(out, ['wage_type', 'wage_value_krw'], to_monthly,
+                                               f'seoul.wage_value_monthly.{hours_per_month}')
+
+    # RCRIT_JSSFC_CMMN_CODE_SE 컬럼 처리
+    def process_rcrit_code(code):
+        if pd.isna(code) or code == '':
+            return None
+        code_str = str(code).strip()
+        if code_str.isdigit():
+            if len(code_str) == 5:
+                code_str = '0' + code_str
+            if len(code_str) > 2:
+                code_str = code_str[:-2]
+        return code_str
+
+    if 'RCRIT_JSSFC_CMMN_CODE_SE' in out.columns:
+        out['RCRIT_JSSFC_CMMN_CODE_SE'] = apply(out['RCRIT_JSSFC_CMMN_CODE_SE'], process_rcrit_code,
+                                                'seoul.RCRIT_JSSFC_CMMN_CODE_SE')
+
+    # wage_type 추론
+    def infer_wage_type(row):
+        wt = row.get('wage_type')
+        if wt is None or (isinstance(wt, float) and pd.isna(wt)) or (isinstance(wt, str) and wt.strip() == ''):
+            v = row.get('wage_value_krw')
+            try:
+                vnum = int(float(v)) if v is not None else 0
+            except Exception:
+                vnum = 0
+            if vnum // 1000000 == 0:
+                return "공고 확인"
+            else:
+                return "연봉"
+        return wt
+
+    out['wage_type'] = apply_rows(out, ['wage_type', 'wage_value_krw'], infer_wage_type, 'seoul.wage_type')
+
+    # 최종 필터링 컬럼만 남기기
+    filtered_cols = [
+        'company', 'job_title', 'wage_type', 'wage_value_krw', 'region', 'career',
+        'RCRIT_JSSFC_CMMN_CODE_SE', 'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE',
+        'wage_value_monthly'
+    ]
+    for c in filtered_cols:
+        if c not in out.columns:
+            out[c] = None
+    
+    return out[filtered_cols].copy()
+
+
+# =========================================================================
+# === 4-1. 데이터 정제 (벡터화 엔진) ===
+# =========================================================================
+# clean_dataframe_reference 와 동일한 컬럼/값을 만들되, 행 단위 apply 대신
+# str.extract / np.where / np.select 로 컬럼 전체를 한 번에 처리합니다.
+SOURCE_COLUMNS = [
+    'CMPNY_NM', 'JO_SJ', 'HOPE_WAGE', 'GUI_LN',
+    'RCRIT_JSSFC_CMMN_CODE_SE', 'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE'
+]
+OUTPUT_COLUMNS = [
+    'company', 'job_title', 'wage_type', 'wage_value_krw', 'region', 'career',
+    'RCRIT_JSSFC_CMMN_CODE_SE', 'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE',
+    'wage_value_monthly'
+]
+WAGE_PATTERN = r'\(?(월급|시급)\)?\s*[/\\]?\s*([0-9,\.]+)\s*(만원|원)?'   # parse_wage 1차 패턴
+WAGE_FALLBACK_PATTERN = r'([0-9,\.]+)\s*(만원|원)'                      # parse_wage 2차 패턴
+
+
+def _as_record_column(values: np.ndarray, index) -> pd.Series:
+    """정수/None 값을 dict 리스트로 DataFrame을 만들 때와 같은 dtype의 Series로 변환합니다.
+    (전부 결측 → object(None), 일부 결측 → float64(NaN), 결측 없음 → int64)"""
+    missing = np.isnan(values)
+    if missing.all():
+        return pd.Series([None] * len(values), index=index, dtype=object)
+    if missing.any():
+        return pd.Series(values, index=index)
+    return pd.Series(values.astype('int64'), index=index)
+
+
+def _none_if_missing(s: pd.Series) -> pd.Series:
+    """NaN을 None으로 바꾼 object Series를 반환합니다."""
+    s = s.astype(object)
+    return s.where(s.notna(), None)
+
+
+def parse_wage_columns(text: pd.Series):
+    """parse_wage 를 컬럼 단위로 수행하여 (wage_type, wage_value_krw) 를 반환합니다."""
+    first = text.str.extract(WAGE_PATTERN)
+    hit = first[0].notna().to_numpy()
+
+    fallback = text[~hit].str.extract(WAGE_FALLBACK_PATTERN).reindex(text.index)
+    hit2 = ~hit & fallback[0].notna().to_numpy()
+
+    num = first[1].where(hit, fallback[0])
+    unit = np.where(hit, first[2].fillna('원'), fallback[1])
+    num_val = np.trunc(pd.to_numeric(num.str.replace(',', '', regex=False), errors='coerce').to_numpy(dtype=float))
+    value = np.where(unit == '만원', num_val * 10000, num_val)
+
+    fallback_type = np.select(
+        [text.str.contains('월', regex=False, na=False).to_numpy(),
+         text.str.contains('시', regex=False, na=False).to_numpy()],
+        ['월급', '시급'], default=None
+    )
+    wage_type = np.where(hit, first[0].to_numpy(dtype=object), np.where(hit2, fallback_type, None))
+    return pd.Series(wage_type, index=text.index, dtype=object), value
+
+
+def parse_gui_ln_columns(gui: pd.Series):
+    """parse_gui_ln 을 컬럼 단위로 수행하여 (region, career) 를 반환합니다."""
+    parts = gui.str.split('/', n=3, expand=True)
+    none = pd.Series([None] * len(gui), index=gui.index, dtype=object)
+    region = _none_if_missing(parts[1].str.strip()) if 1 in parts.columns else none
+    career = _none_if_missing(parts[2].str.strip()) if 2 in parts.columns else none
+    return region, career
+
+
+def process_rcrit_code_column(code: pd.Series) -> pd.Series:
+    """RCRIT_JSSFC_CMMN_CODE_SE 를 6자리로 맞춘 뒤 끝 두 자리를 잘라냅니다. (컬럼 단위)"""
+    missing = (code.isna() | (code == '')).to_numpy()
+    s = code.astype(str).str.strip()
+    digit = s.str.isdigit().to_numpy()
+    s = pd.Series(np.where(digit & (s.str.len() == 5).to_numpy(), '0' + s, s), index=code.index)
+    s = pd.Series(np.where(digit & (s.str.len() > 2).to_numpy(), s.str[:-2], s), index=code.index)
+    return pd.Series(np.where(missing, None, s), index=code.index, dtype=object)
+
+
+def clean_dataframe_vectorized(df: pd.DataFrame, convert_monthly: bool = True, hours_per_month: int = 209) -> pd.DataFrame:
+    """clean_dataframe_reference 와 같은 결과를 컬럼 단위 연산으로 만듭니다."""
+    existing = [c for c in SOURCE_COLUMNS if c in df.columns]
+    out = df[existing].rename(columns={
+        'CMPNY_NM': 'company',
+        'JO_SJ': 'job_title',
+        'HOPE_WAGE': 'hope_wage',
+        'GUI_LN': 'gui_ln'
+    })
+
+    wage_type, wage_value = parse_wage_columns(out['hope_wage'].fillna(''))
+    out['wage_value_krw'] = _as_record_column(wage_value, out.index)
+    out['region'], out['career'] = parse_gui_ln_columns(out['gui_ln'].fillna(''))
+
+    if convert_monthly:
+        valid = ~np.isnan(wage_value) & (wage_value != 0)
+        monthly = np.select(
+            [valid & (wage_type == '시급').to_numpy(), valid & (wage_type == '월급').to_numpy()],
+            [np.trunc(wage_value * hours_per_month), np.trunc(wage_value)],
+            default=np.nan
+        )
+        out['wage_value_monthly'] = _as_record_column(monthly, out.index)
+
+    if 'RCRIT_JSSFC_CMMN_CODE_SE' in out.columns:
+        out['RCRIT_JSSFC_CMMN_CODE_SE'] = process_rcrit_code_column(out['RCRIT_JSSFC_CMMN_CODE_SE'])
+
+    # wage_type 추론: 유형이 없으면 금액이 100만원 이상일 때 연봉, 아니면 공고 확인
+    vnum = np.nan_to_num(np.trunc(wage_value), nan=0.0)
+    inferred = np.where(np.floor_divide(vnum, 1000000) == 0, "공고 확인", "연봉")
+    out['wage_type'] = pd.Series(np.where(wage_type.isna(), inferred, wage_type), index=out.index, dtype=object)
+
+    for c in OUTPUT_COLUMNS:
+        if c not in out.columns:
+            out[c] = None
+
+    return out[OUTPUT_COLUMNS].copy()
+
+
+def compare_clean_engines(df: pd.DataFrame, engine: str = "vectorized", **kwargs) -> list:
+    """참조 구현과 engine 의 결과를 행 단위로 비교하여 불일치 목록 [(행, 컬럼, 참조값, 비교값)]을 반환합니다."""
+    ref = clean_dataframe_reference(df, **kwargs)
+    vec = clean_dataframe(df, engine=engine, **kwargs)
+    mismatches = []
+    if list(ref.columns) != list(vec.columns) or len(ref) != len(vec):
+        return [(None, 'shape', list(ref.columns), list(vec.columns))]
+    for c in ref.columns:
+        if ref[c].dtype != vec[c].dtype:
+            mismatches.append((None, c, str(ref[c].dtype), str(vec[c].dtype)))
+    for i, (r_row, v_row) in enumerate(zip(ref.itertuples(index=False), vec.itertuples(index=False))):
+        for c, a, b in zip(ref.columns, r_row, v_row):
+            if not (a == b or (pd.isna(a) and pd.isna(b))):
+                mismatches.append((i, c, a, b))
+    return mismatches
+
+
+# =========================================================================
+# === 5. 통합 수집 엔진 어댑터 ===
+# =========================================================================
+class SeoulJobsAdapter(ingest_engine.SourceAdapter):
+    """서울 GetJobInfo 소스 어댑터. 커서 = 다음 start_index, 스트림 끝에서는 같은 위치를 계속 확인합니다.
+
+    다른 앱(경기)에서 돌릴 때는 SEOUL_API_KEY / SEOUL_STORAGE_CONN_STR 로 서울 쪽 키와 스토리지를 지정합니다.
+    결과는 기존과 같은 컨테이너/경로(data/all_jobs/)에 저장되므로 blob_to_eventhub 가 그대로 전송합니다.
+    """
+
+    name = "seoul"
+    dedupe_blob = DEDUPE_BLOB_NAME
+    dedupe_key_columns = DEDUPE_KEY_COLUMNS
+    initial_cursor = DEFAULT_START_INDEX
+
+    def __init__(self, storage_conn: str = None, api_key: str = None):
+        super().__init__(storage_conn or os.getenv("SEOUL_STORAGE_CONN_STR"))
+        self.api_key = api_key or os.getenv("SEOUL_API_KEY") or os.getenv("API_KEY", "인증키")
+        self.container = os.getenv("SEOUL_BLOB_CONTAINER_NAME") or os.getenv("BLOB_CONTAINER_NAME", "seoul-job-ct")
+        self.dedupe_container = self.container
+
+    def cursor_store(self, conn_str: str) -> cursor_store.CursorStore:
+        # trig_connect_seoul 과 같은 state/current_start_index.json 을 씀
+        return get_cursor_store(self.storage_conn or conn_str, self.container)
+
+    def fetch(self, cursor, claim) -> tuple:
+        return fetch_window(get_api_session(), self.api_key, cursor, claim)
+
+    def transform(self, records) -> tuple:
+        return clean_records(records), None
+
+    def page_rows(self, body) -> list:
+        return ensure_list(extract_by_path(body, "GetJobInfo.row"))
+
+    def output_name(self, cursor, ext: str) -> str:
+        file_stamp = f"{cursor}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        if ext == "parquet":
+            return blob_layout.place(PARQUET_PREFIX, "seoul", f"seoul_jobs_{file_stamp}.parquet")
+        return blob_layout.place(TRIGGER_PREFIX, "seoul", f"seoul_jobs_{file_stamp}.csv")
+
+    def eventhub_target(self):
+        return eventhub_target()
+
+    def archive_location(self, name: str) -> tuple:
+        return self.container, archive_name(name)
@@ -0,0 +1,355 @@
+"""수집 / 정제 / 업로드 / 전송 단계별 소요 시간을 남기는 span API (OpenTelemetry 호환 형태).
+
+한 번의 실행이 API 응답, 정제, Blob 업로드, Event Hub 전송 중 어디에서 느려졌는지 보기 위해
+단계마다 span 을 열고 행 수 / 바이트 수 / 재시도 횟수를 속성으로 남깁니다.
+
+TRACE_EXPORTER (쉼표로 여러 개 가능)
+- none  (기본): 아무것도 기록하지 않음. span 은 미리 만든 no-op 객체라 비용이 거의 없음
+- jsonl : 끝난 span 을 TRACE_JSONL_PATH 에 한 줄씩 JSON 으로 추가 (오프라인 분석용)
+- otel  : opentelemetry-api 의 전역 TracerProvider 로도 전달 (azure-monitor-opentelemetry 등을 켰을 때)
+          패키지가 없으면 경고만 남기고 무시합니다.
+
+사용법
+    with tracing.span("gg.fetch_jobs", page=3) as sp:
+        ...
+        sp.set_attribute("rows", len(df))
+
+    @tracing.traced("seoul.clean_dataframe", on_result=lambda out: {"rows.out": len(out)})
+    def clean_dataframe(...): ...
+
+JSON lines 요약: python -m shared_code.tracing <spans.jsonl>
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")
+TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH", os.path.join(tempfile.gettempdir(), "job-cnt-spans.jsonl"))
+
+_CURRENT = contextvars.ContextVar("current_span", default=None)
+
+
+# =========================================================================
+# === Span ===
+# =========================================================================
+class NoopSpan:
+    """TRACE_EXPORTER=none 일 때 쓰는 span. 모든 호출을 무시합니다."""
+
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key, value) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: dict = None) -> None:
+        pass
+
+    def set_status(self, status, description: str = None) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NOOP_SPAN = NoopSpan()
+
+
+def _otel_value(value):
+    """OpenTelemetry 속성은 str / bool / int / float 만 받으므로 나머지는 문자열로 바꿉니다."""
+    return value if isinstance(value, (str, bool, int, float)) else str(value)
+
+
+class Span(NoopSpan):
+    """이름 / 시작 시각 / 소요 시간 / 속성 / 이벤트 / 상태를 기록하는 span."""
+
+    def __init__(self, name: str, parent: "Span" = None, attributes: dict = None, exporters=(), otel_span=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent is not None else None
+        self.attributes = {}
+        self.events = []
+        self.status = "UNSET"
+        self.status_description = None
+        self.start_time = time.time()
+        self.duration_ms = None
+        self._started = time.perf_counter()
+        self._exporters = exporters
+        self._otel = otel_span
+        if attributes:
+            self.set_attributes(attributes)
+
+    def is_recording(self) -> bool:
+        return self.duration_ms is None
+
+    def set_attribute(self, key, value) -> None:
+        self.attributes[key] = value
+        if self._otel is not None:
+            self._otel.set_attribute(key, _otel_value(value))
+
+    def set_attributes(self, attributes: dict) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def add_event(self, name: str, attributes: dict = None) -> None:
+        self.events.append({'name': name, 'time': time.time(), 'attributes': attributes or {}})
+        if self._otel is not None:
+            self._otel.add_event(name, {k: _otel_value(v) for k, v in (attributes or {}).items()})
+
+    def set_status(self, status, description: str = None) -> None:
+        """status: "OK" | "ERROR" | "UNSET" (opentelemetry 의 StatusCode 도 받음)"""
+        self.status = getattr(status, "name", status)
+        self.status_description = description
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.set_status("ERROR", f"{type(exception).__name__}: {exception}")
+        self.add_event("exception", {'exception.type': type(exception).__name__,
+                                     'exception.message': str(exception)})
+
+    def end(self) -> None:
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        for exporter in self._exporters:
+            try:
+                exporter.export(self)
+            except Exception as e:
+                logging.warning(f"⚠️ span 내보내기 실패 ({self.name}): {e}")
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_span_id': self.parent_span_id,
+            'start_time': datetime.fromtimestamp(self.start_time, timezone.utc).isoformat(),
+            'duration_ms': self.duration_ms,
+            'status': self.status,
+            'status_description': self.status_description,
+            'attributes': self.attributes,
+            'events': self.events,
+        }
+
+
+# =========================================================================
+# === Exporter ===
+# =========================================================================
+class JsonLinesExporter:
+    """끝난 span 을 파일에 JSON 한 줄씩 추가합니다. (여러 스레드에서 호출해도 줄이 섞이지 않음)"""
+
+    def __init__(self, path: str = TRACE_JSONL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class MemoryExporter:
+    """끝난 span 을 리스트에 모읍니다. (로컬 확인 / 부하 테스트용)"""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+
+# =========================================================================
+# === Tracer ===
+# =========================================================================
+class Tracer:
+    """exporters 가 비어 있고 OpenTelemetry 전달도 없으면 항상 NOOP_SPAN 을 돌려줍니다."""
+
+    def __init__(self, exporters=(), otel_tracer=None):
+        self.exporters = tuple(exporters)
+        self.otel_tracer = otel_tracer
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters) or self.otel_tracer is not None
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: dict = None, record_exception: bool = True):
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        otel_cm = self.otel_tracer.start_as_current_span(name) if self.otel_tracer is not None else None
+        span = Span(name, _CURRENT.get(), attributes, self.exporters,
+                    otel_cm.__enter__() if otel_cm is not None else None)
+        token = _CURRENT.set(span)
+        exc_info = (None, None, None)
+        try:
+            yield span
+        except BaseException as e:
+            exc_info = sys.exc_info()
+            if record_exception:
+                span.record_exception(e)
+            raise
+        finally:
+            _CURRENT.reset(token)
+            span.end()
+            if otel_cm is not None:
+                otel_cm.__exit__(*exc_info)
+
+
+def _build_tracer(spec: str) -> Tracer:
+    names = {s.strip().lower() for s in (spec or "").split(",") if s.strip()} - {"none"}
+    exporters, otel_tracer = [], None
+    if "jsonl" in names:
+        exporters.append(JsonLinesExporter())
+    if "otel" in names:
+        try:
+            from opentelemetry import trace as otel_trace
+            otel_tracer = otel_trace.get_tracer("job-cnt")
+        except ImportError:
+            logging.warning("⚠️ TRACE_EXPORTER=otel 이지만 opentelemetry-api 가 설치되어 있지 않아 무시합니다.")
+    unknown = names - {"jsonl", "otel"}
+    if unknown:
+        logging.warning(f"⚠️ 알 수 없는 TRACE_EXPORTER 무시: {sorted(unknown)}")
+    return Tracer(exporters, otel_tracer)
+
+
+_TRACER = _build_tracer(TRACE_EXPORTER)
+
+
+def get_tracer() -> Tracer:
+    return _TRACER
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """전역 tracer 를 바꾸고 이전 tracer 를 반환합니다. (로컬 확인 / 부하 테스트에서 MemoryExporter 등을 끼울 때)"""
+    global _TRACER
+    previous, _TRACER = _TRACER, tracer
+    return previous
+
+
+# =========================================================================
+# === 편의 함수 ===
+# =========================================================================
+def span(name: str, **attributes):
+    """with tracing.span("stage", key=value) as sp: ... (tracer 를 끈 상태에서는 no-op)"""
+    return _TRACER.start_as_current_span(name, attributes or None)
+
+
+def traced(name: str, on_result=None):
+    """함수 실행 전체를 span 으로 감싸는 데코레이터. on_result(반환값) -> dict 를 주면 결과 속성도 남깁니다."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _TRACER.enabled:
+                return fn(*args, **kwargs)
+            with _TRACER.start_as_current_span(name) as sp:
+                result = fn(*args, **kwargs)
+                if on_result is not None:
+                    sp.set_attributes(on_result(result))
+                return result
+        return wrapper
+    return decorator
+
+
+def get_current_span():
+    """지금 열려 있는 span (없으면 NOOP_SPAN)."""
+    return _CURRENT.get() or NOOP_SPAN
+
+
+def set_attributes(**attributes) -> None:
+    """지금 열려 있는 span 에 속성을 남깁니다."""
+    current = _CURRENT.get()
+    if current is not None:
+        current.set_attributes(attributes)
+
+
+def increment_attribute(key: str, amount: int = 1) -> None:
+    """지금 열려 있는 span 의 숫자 속성을 amount 만큼 늘립니다. (재시도 횟수 등)"""
+    current = _CURRENT.get()
+    if current is not None:
+        current.set_attribute(key, current.attributes.get(key, 0) + amount)
+
+
+def bind(fn):
+    """지금의 span 을 부모로 이어받도록 fn 을 감쌉니다. (ThreadPoolExecutor.submit 으로 넘길 때)"""
+    if not _TRACER.enabled:
+        return fn
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
+
+
+def http_retries(response) -> int:
+    """requests 응답이 urllib3 Retry 로 몇 번 재시도됐는지 반환합니다."""
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    return len(getattr(retries, "history", ()) or ())
+
+
+# =========================================================================
+# === JSON lines 요약 (오프라인 분석) ===
+# =========================================================================
+def _percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[k]
+
+
+def summarize(path: str) -> dict:
+    """span 이름별 건수 / 오류 수 / p50 / p95 / 최대 / 합계(ms) 를 반환합니다."""
+    durations, errors = {}, {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            durations.setdefault(rec['name'], []).append(rec['duration_ms'])
+            if rec.get('status') == "ERROR":
+                errors[rec['name']] = errors.get(rec['name'], 0) + 1
+    out = {}
+    for name, values in durations.items():
+        values.sort()
+        out[name] = {
+            'count': len(values),
+            'errors': errors.get(name, 0),
+            'p50_ms': _percentile(values, 0.5),
+            'p95_ms': _percentile(values, 0.95),
+            'max_ms': values[-1],
+            'total_ms': round(sum(values), 3),
+        }
+    return out
+
+
+if __name__ == "__main__":
+    summary = summarize(sys.argv[1] if len(sys.argv) > 1 else TRACE_JSONL_PATH)
+    print(f"{'span':<40} {'count':>7} {'errors':>7} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'total ms':>12}")
+    for name, s in sorted(summary.items(), key=lambda kv: -kv[1]['total_ms']):
+        print(f"{name:<40} {s['count']:>7} {s['errors']:>7} {s['p50_ms']:>10.1f} {s['p95_ms']:>10.1f} "
+              f"{s['max_ms']:>10.1f} {s['total_ms']:>12.1f}")
@@ -0,0 +1,24 @@
+import logging
+import azure.functions as func
+import os
+from shared_code import compaction
+
+
+# =========================================================================
+# === tick CSV 압축 (Timer Trigger, 매시 15분) ===
+# =========================================================================
+# COMPACTION=1 일 때만 동작. data/all_jobs/ (+ data/archive/) 의 tick CSV 를 닫힌 시간(COMPACT_GRAIN=day 면 일) 단위로
+# COMPACT_CONTAINER 에 합치고 manifest 를 남깁니다. 결과는 blob_to_eventhub 가 감시하지 않는 곳에만 씀 (shared_code/compaction.py)
+def main(mytimer: func.TimerRequest) -> None:
+    if not compaction.COMPACTION:
+        return
+
+    blob_conn_str = os.getenv("AzureWebJobsStorage")
+    if not blob_conn_str:
+        logging.error("❌ AzureWebJobsStorage 연결 문자열이 설정되지 않았습니다.")
+        return
+
+    try:
+        compaction.run(blob_conn_str, "seoul")
+    except Exception:
+        logging.exception("❌ tick CSV 압축 실패 (다음 실행에서 같은 구간부터 다시 합침)")
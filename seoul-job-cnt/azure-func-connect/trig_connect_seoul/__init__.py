@@ -1,243 +1,19 @@
 import logging
 import azure.functions as func
-import requests
-import pandas as pd
 from datetime import datetime
-from azure.storage.blob import BlobServiceClient
 import os
-import re
 import tempfile
-import json
-from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
-
-
-# === 환경 설정 상수 ===
-STATE_BLOB_NAME = "state/current_start_index.json" # 현재 인덱스를 저장할 Blob 파일 경로
-CHUNK_SIZE = 100 # 한 번의 함수 실행(1분) 시 가져올 레코드 수 <-- 수정됨 (100)
-DEFAULT_START_INDEX = 1 # 시작 인덱스 (API의 첫 페이지)
-
-# =========================================================================
-# === 1. Session 생성 함수 (API 재시도 로직) ===
-# =========================================================================
-def build_session(total_retries: int = 3, backoff: float = 1.0) -> requests.Session:
-    """HTTP 요청 세션을 설정하고 재시도 정책을 적용합니다."""
-    s = requests.Session()
-    # 429(Rate Limit), 5xx 서버 에러 발생 시 재시도하도록 설정
-    retries = Retry(total=total_retries, backoff_factor=backoff, status_forcelist=[429, 500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retries)
-    s.mount('https://', adapter)
-    s.mount('http://', adapter)
-    return s
-
-
-# =========================================================================
-# === 2. JSON/텍스트 파싱 유틸 (기존 로직 유지) ===
-# =========================================================================
-def extract_by_path(obj, path: str):
-    """JSON 객체에서 '.' 경로를 이용해 값을 추출합니다."""
-    if not path:
-        return obj
-    cur = obj
-    for p in path.split('.'):
-        if isinstance(cur, dict) and p in cur:
-            cur = cur[p]
-        else:
-            return None
-    return cur
-
-def ensure_list(x):
-    """입력값을 리스트로 변환합니다."""
-    if x is None:
-        return []
-    if isinstance(x, list):
-        return x
-    return [x]
-
-def parse_wage(text):
-    """시급/월급 문자열을 파싱하여 금액(KRW)을 추출합니다."""
-    # (원래의 상세한 파싱 로직 유지)
-    if not isinstance(text, str):
-        return {'wage_type': None, 'wage_value_krw': None, 'wage_raw': text}
-    s = text.strip()
-    m = re.search(r'\(?(월급|시급)\)?\s*[/\\]?\s*([0-9,\.]+)\s*(만원|원)?', s)
-    if m:
-        wtype, num, unit = m.group(1), m.group(2), m.group(3) or '원'
-        try:
-            num_val = int(float(num.replace(',', '')))
-        except Exception:
-            num_val = None
-        value = num_val * 10000 if unit == '만원' else num_val
-        return {'wage_type': wtype, 'wage_value_krw': value, 'wage_raw': text}
-    m2 = re.search(r'([0-9,\.]+)\s*(만원|원)', s)
-    if m2:
-        try:
-            num_val = int(float(m2.group(1).replace(',', '')))
-        except Exception:
-            num_val = None
-        unit = m2.group(2)
-        value = num_val * 10000 if unit == '만원' else num_val
-        wtype = '월급' if '월' in s else ('시급' if '시' in s else None)
-        return {'wage_type': wtype, 'wage_value_krw': value, 'wage_raw': text}
-    return {'wage_type': None, 'wage_value_krw': None, 'wage_raw': text}
-
-def parse_gui_ln(gui):
-    """GUI_LN 문자열에서 지역(region)과 경력(career)을 추출합니다."""
-    # (원래의 상세한 파싱 로직 유지)
-    if not isinstance(gui, str):
-        return {'region': None, 'career': None, 'gui_raw': gui}
-    parts = [p.strip() for p in gui.split('/')]
-    region = parts[1] if len(parts) >= 2 else None
-    career = parts[2] if len(parts) >= 3 else None
-    return {'region': region, 'career': career, 'gui_raw': gui}
+from shared_code import resource_pool, dedupe_index, parquet_sink, factorize_map, tracing, delivery, eventhub_sink
+from shared_code import job_counts, raw_archive, blob_layout
+# API 호출 / 정제 로직과 환경 설정 상수는 shared_code/seoul_jobs.py 에 있습니다. (통합 수집 엔진과 공유)
+from shared_code.seoul_jobs import (
+    DEDUPE_BLOB_NAME, DEDUPE_KEY_COLUMNS, TRIGGER_PREFIX, PARQUET_PREFIX,
+    get_api_session, get_cursor_store, clean_records, fetch_window, eventhub_target, archive_name,
+)
 
 
 # =========================================================================
-# === 3. 상태 관리 (Load/Save Start Index) ===
-# =========================================================================
-def get_blob_client(conn_str: str, container_name: str, blob_name: str):
-    """Blob Client 객체를 반환합니다."""
-    blob_service_client = BlobServiceClient.from_connection_string(conn_str)
-    container_client = blob_service_client.get_container_client(container_name)
-    try:
-        container_client.create_container() # 컨테이너가 없으면 생성
-    except Exception:
-        pass
-    return container_client.get_blob_client(blob_name)
-
-def load_start_index(blob_client):
-    """Blob Storage에서 마지막으로 성공한 start_index를 로드합니다."""
-    try:
-        download_stream = blob_client.download_blob()
-        data = json.loads(download_stream.readall())
-        start_index = data.get('next_start_index', DEFAULT_START_INDEX)
-        logging.info(f"💾 상태 로드 성공: 다음 시작 인덱스 = {start_index}")
-        return start_index
-    except Exception as e:
-        # 파일이 없거나(404) 파싱 오류 발생 시 기본값 반환
-        logging.warning(f"⚠️ 상태 로드 실패 또는 파일 없음: {e}. 기본값 ({DEFAULT_START_INDEX})으로 시작합니다.")
-        return DEFAULT_START_INDEX
-
-def save_start_index(blob_client, next_start_index: int):
-    """다음 호출을 위한 start_index를 Blob Storage에 저장합니다."""
-    state_data = {'next_start_index': next_start_index, 'last_updated': datetime.now().isoformat()}
-    blob_client.upload_blob(json.dumps(state_data), overwrite=True)
-    logging.info(f"💾 상태 저장 성공: 다음 시작 인덱스 = {next_start_index}")
-
-
-# =========================================================================
-# === 4. 단일 청크 API 호출 (Industry 코드 제거) ===
-# =========================================================================
-# industry 파라미터 제거
-def fetch_one_chunk_of_jobs(session: requests.Session, api_key: str, start_index: int, chunk_size: int = CHUNK_SIZE):
-    """지정된 start_index부터 chunk_size만큼의 레코드만 가져옵니다."""
-    
-    end_index = start_index + chunk_size - 1
-    # URL에서 // 다음에 있던 {industry} 부분을 제거했습니다.
-    url = f"http://openapi.seoul.go.kr:8088/{api_key}/json/GetJobInfo/{start_index}/{end_index}/" 
-    
-    logging.info(f"🚀 API 요청 범위 (전체 산업): Start={start_index}, End={end_index}")
-
-    try:
-        resp = session.get(url, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception as e:
-        logging.error(f"❌ API 요청 실패 (Start={start_index}): {e}")
-        return [], start_index # 실패 시 현재 인덱스를 유지하고 종료
-    
-    records = extract_by_path(data, "GetJobInfo.row")
-    records = ensure_list(records)
-    
-    # 다음 시작 인덱스를 계산합니다.
-    next_start_index = start_index + len(records)
-    
-    if not records:
-        logging.info("⭐ API 응답에 데이터가 없습니다. 스트림의 끝일 수 있습니다.")
-    
-    return records, next_start_index
-
-
-# =========================================================================
-# === 5. 데이터 정제 (기존 로직 유지) ===
-# =========================================================================
-def clean_dataframe(df: pd.DataFrame, convert_monthly: bool = True, hours_per_month: int = 209) -> pd.DataFrame:
-    """데이터프레임을 정제하고 임금 정보 등을 파싱합니다."""
-    # (원래의 상세한 정제 로직 유지)
-    keep = [
-        'CMPNY_NM', 'JO_SJ', 'HOPE_WAGE', 'GUI_LN',
-        'RCRIT_JSSFC_CMMN_CODE_SE', 'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE'
-    ]
-    existing = [c for c in keep if c in df.columns]
-    out = df[existing].copy()
-    out = out.rename(columns={
-        'CMPNY_NM': 'company',
-        'JO_SJ': 'job_title',
-        'HOPE_WAGE': 'hope_wage',
-        'GUI_LN': 'gui_ln'
-    })
-
-    wage_df = pd.DataFrame(out['hope_wage'].fillna('').apply(parse_wage).tolist(), index=out.index)
-    gui_df = pd.DataFrame(out['gui_ln'].fillna('').apply(parse_gui_ln).tolist(), index=out.index)
-
-    out = pd.concat([out, wage_df, gui_df], axis=1)
-
-    if convert_monthly:
-        def to_monthly(row):
-            if row.get('wage_type') == '시급' and row.get('wage_value_krw'):
-                return int(row['wage_value_krw'] * hours_per_month)
-            if row.get('wage_type') == '월급' and row.get('wage_value_krw'):
-                return int(row['wage_value_krw'])
-            return None
-        out['wage_value_monthly'] = out.apply(to_monthly, axis=1)
-
-    # RCRIT_JSSFC_CMMN_CODE_SE 컬럼 처리
-    def process_rcrit_code(code):
-        if pd.isna(code) or code == '':
-            return None
-        code_str = str(code).strip()
-        if code_str.isdigit():
-            if len(code_str) == 5:
-                code_str = '0' + code_str
-            if len(code_str) > 2:
-                code_str = code_str[:-2]
-        return code_str
-
-    if 'RCRIT_JSSFC_CMMN_CODE_SE' in out.columns:
-        out['RCRIT_JSSFC_CMMN_CODE_SE'] = out['RCRIT_JSSFC_CMMN_CODE_SE'].apply(process_rcrit_code)
-
-    # wage_type 추론
-    def infer_wage_type(row):
-        wt = row.get('wage_type')
-        if wt is None or (isinstance(wt, float) and pd.isna(wt)) or (isinstance(wt, str) and wt.strip() == ''):
-            v = row.get('wage_value_krw')
-            try:
-                vnum = int(float(v)) if v is not None else 0
-            except Exception:
-                vnum = 0
-            if vnum // 1000000 == 0:
-                return "공고 확인"
-            else:
-                return "연봉"
-        return wt
-
-    out['wage_type'] = out.apply(infer_wage_type, axis=1)
-
-    # 최종 필터링 컬럼만 남기기
-    filtered_cols = [
-        'company', 'job_title', 'wage_type', 'wage_value_krw', 'region', 'career',
-        'RCRIT_JSSFC_CMMN_CODE_SE', 'JOBCODE_NM', 'CAREER_CND_CMMN_CODE_SE', 'ACDMCR_CMMN_CODE_SE',
-        'wage_value_monthly'
-    ]
-    for c in filtered_cols:
-        if c not in out.columns:
-            out[c] = None
-    
-    return out[filtered_cols].copy()
-
-
-# =========================================================================
-# === 6. Azure Function Main (Timer Trigger) (Industry 코드 제거) ===
+# === 1. Azure Function Main (Timer Trigger) (Industry 코드 제거) ===
 # =========================================================================
 def main(mytimer: func.TimerRequest) -> None:
     """1분마다 실행되는 타이머 트리거 메인 함수입니다."""
@@ -246,6 +22,7 @@ def main(mytimer: func.TimerRequest) -> None:
     
     # API 요청 URL 구성에 필요하지 않은 industry 변수 선언/검증 로직 삭제
 
+    state_store, claim, current_start_index = None, None, None
     try:
         # (1) 환경 변수 및 설정 로드
         # industry 변수 삭제
@@ -257,18 +34,23 @@ def main(mytimer: func.TimerRequest) -> None:
             logging.error("❌ AzureWebJobsStorage 연결 문자열이 설정되지 않았습니다.")
             return
 
-        # (2) 상태 관리 클라이언트 생성 및 현재 시작 인덱스 로드
-        state_blob_client = get_blob_client(blob_conn_str, container_name, STATE_BLOB_NAME)
-        current_start_index = load_start_index(state_blob_client)
+        # (2) 현재 시작 인덱스 claim
+        # state/current_start_index.json 을 ETag 조건부 쓰기 + lease 로 관리 (shared_code/cursor_store.py)
+        # 실행이 겹치거나 인스턴스가 늘어나면 lease 를 잡은 실행만 수집하고 나머지는 건너뜀
+        state_store = get_cursor_store(blob_conn_str, container_name)
+        claim = state_store.claim()
+        if claim is None:
+            return
+        current_start_index = claim.cursor
+        logging.info(f"💾 상태 로드 성공: 다음 시작 인덱스 = {current_start_index}")
         
-        # (3) API 호출 세션 생성
-        session = build_session()
+        # (3) API 호출 세션 (웜 워커에서는 이전 실행의 세션을 재사용)
+        session = get_api_session()
         
-        # (4) 단일 청크 데이터 가져오기 (100건)
+        # (4) 청크 데이터 가져오기 (기본 100건, FETCH_CONCURRENCY > 1 이면 여러 범위를 병렬로)
+        # ADAPTIVE_SIZE=1 이면 API 응답 속도에 맞춰 학습한 청크 크기를 쓰고, 학습값은 커서와 함께 저장
         # fetch_one_chunk_of_jobs 호출 시 industry 인수를 제거했습니다.
-        records, next_start_index = fetch_one_chunk_of_jobs(
-            session, api_key, current_start_index, CHUNK_SIZE
-        )
+        records, next_start_index = fetch_window(session, api_key, current_start_index, claim)
 
         if not records:
             # 데이터가 없으면 현재 인덱스를 유지하고 (다음 실행을 위해) 종료
@@ -276,26 +58,102 @@ def main(mytimer: func.TimerRequest) -> None:
             return
 
         # (5) 데이터프레임 생성 및 정제
-        df = pd.DataFrame(records)
-        filtered_df = clean_dataframe(df)
+        # RECORD_PATH_MAX_ROWS 이하의 작은 tick 은 pandas 없이 같은 CSV 를 만드는 레코드 경로 (shared_code/record_path.py)
+        filtered_df = clean_records(records)
+
+        # (5-1) 이미 내보낸 공고(내용까지 동일)는 제외하고 새/변경 행만 남깁니다.
+        dedupe, pending = None, []
+        if dedupe_index.DEDUPE_ENABLED:
+            dedupe = dedupe_index.load_index(blob_conn_str, DEDUPE_BLOB_NAME, container_name)
+            filtered_df, pending = dedupe.filter_new(filtered_df, DEDUPE_KEY_COLUMNS)
+            logging.info(f"🧬 중복 제거: 새/변경 {len(filtered_df)}건 | 누적 {dedupe.stats()}")
+            if filtered_df.empty:
+                logging.info("⭐ 새/변경된 공고가 없어 업로드를 건너뜁니다.")
+                state_store.commit(claim, next_start_index)
+                return
         
         # (6) CSV 생성 및 Blob 업로드 (새 파일로 저장)
         # 파일 경로에서 industry 폴더명 대신 'all' 또는 현재는 빈 문자열을 사용합니다.
         # 데이터가 필터링되지 않았으므로 'all'을 사용하거나, 파일 구조에 맞게 조정해야 합니다.
         # 여기서는 파일명 충돌을 피하기 위해 임시로 'all_jobs' 폴더를 가정합니다.
-        file_name = f"data/all_jobs/seoul_jobs_{current_start_index}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        output_blob_client = get_blob_client(blob_conn_str, container_name, file_name)
-        
-        # CSV 데이터를 메모리에서 바로 Blob으로 업로드
-        csv_bytes = filtered_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
-        output_blob_client.upload_blob(csv_bytes, overwrite=True)
-        logging.info(f"✅ Blob 업로드 완료: {file_name} ({len(filtered_df)}건)")
+        # BLOB_LAYOUT=partitioned 이면 data/all_jobs/source=seoul/date=.../hour=.../ 아래에 쓰고 파티션 manifest 에 기록
+        file_stamp = f"{current_start_index}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        file_name = blob_layout.place(TRIGGER_PREFIX, "seoul", f"seoul_jobs_{file_stamp}.csv")
+        parquet_name = blob_layout.place(PARQUET_PREFIX, "seoul", f"seoul_jobs_{file_stamp}.parquet")
+        record = lambda name, size: blob_layout.record(blob_conn_str, container_name, name, len(filtered_df), size,
+                                                       current_start_index)
+
+        # DELIVERY_MODE=direct: Blob 트리거를 거치지 않고 바로 Event Hub 로 보낸 뒤,
+        # Blob 에는 보관본(CSV 는 data/archive/)만 백그라운드로 올림 (실행이 끝나기 전에 drain 으로 기다림)
+        # JOB_COUNTS_MODE=only 이면 원본 행은 보내지 않고 보관본만 남김 (추세 경로는 아래 집계 레코드)
+        target = eventhub_target() if delivery.is_direct() and job_counts.streams_raw() else None
+        if delivery.is_direct() and job_counts.streams_raw() and target is None:
+            logging.warning("⚠️ DELIVERY_MODE=direct 이지만 EVENTHUB_CONNECTION / EVENTHUB_NAME 이 없어 Blob 경로로 전송합니다.")
+        if target is not None or not job_counts.streams_raw():
+            if target is not None:
+                stats = delivery.send_frame(*target, filtered_df)
+                logging.info(f"📨 Event Hub 직접 전송: {len(filtered_df)}건 | 이벤트 {stats['events']}개"
+                             f"{eventhub_sink.compression_summary(stats)}")
+            if parquet_sink.writes_parquet():
+                parquet_bytes = parquet_sink.to_parquet_bytes(filtered_df)
+                delivery.ARCHIVE.submit(blob_conn_str, container_name, parquet_name, parquet_bytes,
+                                        after=lambda size=len(parquet_bytes): record(parquet_name, size))
+            if parquet_sink.writes_csv():
+                csv_bytes = filtered_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
+                delivery.ARCHIVE.submit(blob_conn_str, container_name, archive_name(file_name), csv_bytes,
+                                        after=lambda size=len(csv_bytes): record(archive_name(file_name), size))
+        else:
+            # OUTPUT_FORMAT=parquet|both: 컬럼 기반 Parquet 도 저장 (blob 트리거 경로 밖인 data/parquet/ 에 저장)
+            if parquet_sink.writes_parquet():
+                parquet_bytes = parquet_sink.to_parquet_bytes(filtered_df)
+                with tracing.span("seoul.upload_parquet", blob=parquet_name, rows=len(filtered_df),
+                                  **{'payload.bytes': len(parquet_bytes)}):
+                    resource_pool.with_blob_service(
+                        blob_conn_str,
+                        lambda svc: svc.get_blob_client(container_name, parquet_name).upload_blob(parquet_bytes, overwrite=True)
+                    )
+                record(parquet_name, len(parquet_bytes))
+                logging.info(f"✅ Parquet 업로드 완료: {parquet_name} ({len(parquet_bytes)} bytes)")
+
+            # CSV 데이터를 메모리에서 바로 Blob으로 업로드 (연결 오류 시 클라이언트 재생성 후 재시도)
+            if parquet_sink.writes_csv():
+                csv_bytes = filtered_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
+                with tracing.span("seoul.upload_csv", blob=file_name, rows=len(filtered_df),
+                                  **{'payload.bytes': len(csv_bytes)}):
+                    resource_pool.with_blob_service(
+                        blob_conn_str,
+                        lambda svc: svc.get_blob_client(container_name, file_name).upload_blob(csv_bytes, overwrite=True)
+                    )
+                record(file_name, len(csv_bytes))
+                logging.info(f"✅ Blob 업로드 완료: {file_name} ({len(filtered_df)}건)")
+
+        if parquet_sink.OUTPUT_FORMAT == "both":
+            logging.info(f"📦 CSV vs Parquet 비교: {parquet_sink.compare_with_csv(filtered_df)}")
+
+        # (6-1) JOB_COUNTS_MODE=both|only: 직무 코드별 건수를 미리 집계해 보냄 (커서 저장 전에)
+        if job_counts.is_enabled():
+            counts = job_counts.JobCounts()
+            counts.add_frame(filtered_df, "seoul")
+            job_counts.send(counts)
+
+        # 업로드(direct 모드는 Event Hub 전송)가 끝난 행만 인덱스에 반영
+        if dedupe is not None:
+            dedupe.commit(pending)
+            dedupe_index.save_index(dedupe)
 
         # (7) 다음 시작 인덱스 저장 (성공적으로 데이터를 가져오고 저장한 경우에만 업데이트)
-        save_start_index(state_blob_client, next_start_index)
+        state_store.commit(claim, next_start_index)
         
     except Exception as e:
         logging.error(f"❌ 전체 프로세스 오류 발생: {e}")
-
+    finally:
+        # 인덱스를 저장하지 않고 끝난 경우(새 레코드 없음 / 오류) lease 만 해제
+        if state_store is not None:
+            state_store.release(claim)
+            # RAW_ARCHIVE=1 이면 커서가 지나간 범위의 원본 응답(JSON)만 보관 (shared_code/raw_archive.py)
+            raw_archive.flush(blob_conn_str, "seoul", current_start_index, claim)
+        delivery.drain_archive()    # direct 모드의 보관본 업로드가 끝날 때까지
+
+    logging.info(f"♻️ 리소스 풀 재사용 통계: {resource_pool.stats()}")
+    factorize_map.log_stats()   # CLEAN_ENGINE=factorized 일 때만 출력
     logging.info('Python Timer Trigger 완료.')
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""테스트 공통 설정: 서울 Function App(shared_code) 과 benchmarks(합성 코퍼스, 가짜 Blob)를 import 경로에 넣습니다.
+
+shared_code 는 두 Function App 에 같은 파일로 복사되어 있으므로 서울 쪽 하나로 확인합니다.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "seoul-job-cnt", "azure-func-connect"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+@pytest.fixture
+def blob_store(monkeypatch):
+    """resource_pool 이 load_harness 의 가짜 Blob 저장소(ETag 조건부 쓰기 지원)를 쓰게 합니다.
+    워커 단위 캐시(커서 / dedupe 인덱스)는 테스트마다 비웁니다."""
+    from load_harness import BlobStore, FakeBlobServiceClient
+    from shared_code import cursor_store, dedupe_index, resource_pool
+
+    store = BlobStore()
+    resource_pool.POOL.clear()
+    monkeypatch.setattr(resource_pool, "_blob_factory", lambda conn_str: (lambda: FakeBlobServiceClient(store)))
+    monkeypatch.setattr(cursor_store, "_LAST_WRITTEN", {})
+    monkeypatch.setattr(dedupe_index, "_INDEXES", {})
+    yield store
+    resource_pool.POOL.clear()
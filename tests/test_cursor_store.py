@@ -0,0 +1,93 @@
+"""cursor_store 의 lease / ETag 경합 처리 - 두 실행이 같은 범위를 수집하지 않는지 확인합니다.
+
+load_harness 의 가짜 Blob 저장소(conftest.blob_store)를 씁니다.
+"""
+import json
+
+import pytest
+
+from shared_code import cursor_store
+from shared_code.cursor_store import CursorConflict, CursorStore
+
+CONN = "test-cursor"
+CONTAINER = "function-state"
+BLOB = "state/cursor.json"
+
+
+def _store(**kwargs) -> CursorStore:
+    return CursorStore(CONN, CONTAINER, BLOB, cursor_field="page", default=1, **kwargs)
+
+
+def _saved(blob_store) -> dict:
+    data, _ = blob_store.get(CONTAINER, BLOB)
+    return json.loads(data)
+
+
+def _advance(monkeypatch, seconds: float) -> None:
+    now = cursor_store.time.time() + seconds
+    monkeypatch.setattr(cursor_store.time, "time", lambda: now)
+
+
+def test_claim_starts_from_default_and_commit_moves_cursor(blob_store):
+    store = _store()
+    claim = store.claim()
+    assert claim.cursor == 1
+    store.commit(claim, 5)
+
+    saved = _saved(blob_store)
+    assert saved['page'] == 5 and 'lease' not in saved
+    assert store.claim().cursor == 5
+
+
+def test_second_claim_during_live_lease_returns_none(blob_store):
+    first = _store().claim()
+    assert first is not None
+    assert _store().claim() is None
+
+    cursor_store._LAST_WRITTEN.clear()      # 다른 워커 (기억한 상태 없이 Blob 을 읽음)
+    assert _store().claim() is None
+
+
+def test_expired_lease_can_be_taken_over(blob_store, monkeypatch):
+    _store(lease_sec=30).claim()
+    _advance(monkeypatch, 31)
+
+    claim = _store(lease_sec=30).claim()
+    assert claim is not None and claim.cursor == 1
+    assert _saved(blob_store)['lease']['owner'] == claim.owner
+
+
+def test_commit_after_another_writer_raises_conflict(blob_store):
+    store = _store()
+    claim = store.claim()
+    blob_store.put(CONTAINER, BLOB, json.dumps({'page': 9}).encode(), overwrite=True)   # 다른 실행이 씀
+
+    with pytest.raises(CursorConflict):
+        store.commit(claim, 2)
+    assert _saved(blob_store) == {'page': 9}
+
+
+def test_commit_after_lease_taken_over_raises_conflict(blob_store, monkeypatch):
+    stale = _store(lease_sec=30).claim()
+    _advance(monkeypatch, 31)
+    fresh = _store(lease_sec=30).claim()
+
+    with pytest.raises(CursorConflict):
+        _store().commit(stale, 2)
+    _store().commit(fresh, 3)
+    assert _saved(blob_store)['page'] == 3
+
+
+def test_release_keeps_cursor_and_saves_fields(blob_store):
+    store = _store()
+    claim = store.claim()
+    store.commit(claim, 4)
+
+    claim = store.claim()
+    claim.fields['page_size'] = 200
+    store.release(claim)
+
+    saved = _saved(blob_store)
+    assert saved['page'] == 4 and saved['page_size'] == 200 and 'lease' not in saved
+    assert claim.done and claim.released
+    assert store.claim() is not None        # lease 가 풀려 바로 다시 잡힘
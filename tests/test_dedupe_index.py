@@ -0,0 +1,100 @@
+"""dedupe_index 의 저장 / 로드 / 정규화 - 인덱스가 덮어써져 같은 공고가 다시 나가지 않는지 확인합니다.
+
+load_harness 의 가짜 Blob 저장소(conftest.blob_store)를 씁니다.
+"""
+import pandas as pd
+import pytest
+from azure.core.exceptions import ServiceRequestError
+
+from shared_code import dedupe_index
+from shared_code.dedupe_index import fingerprints
+
+CONN = "test-dedupe"
+CONTAINER = "function-state"
+BLOB = "state/dedupe_index.bin"
+KEYS = ['id']
+
+
+def _jobs(*ids) -> pd.DataFrame:
+    return pd.DataFrame({'id': [str(i) for i in ids], 'title': [f"공고 {i}" for i in ids]})
+
+
+def _load() -> dedupe_index.DedupeIndex:
+    return dedupe_index.load_index(CONN, BLOB, CONTAINER)
+
+
+def _emit(index, df) -> pd.DataFrame:
+    """filter_new → commit → save (수집 타이머와 같은 순서)"""
+    new, pending = index.filter_new(df, KEYS)
+    index.commit(pending)
+    dedupe_index.save_index(index)
+    return new
+
+
+def _other_worker():
+    dedupe_index._INDEXES.clear()       # 워커 캐시 없이 Blob 에서 다시 읽음
+
+
+def _stored(blob_store) -> dedupe_index.DedupeIndex:
+    data, _ = blob_store.get(CONTAINER, BLOB)
+    return dedupe_index.DedupeIndex.from_bytes(data)
+
+
+def test_concurrent_saves_end_with_merged_index(blob_store):
+    a = _load()
+    _other_worker()
+    b = _load()                         # 둘 다 빈 인덱스(ETag 없음)에서 시작
+
+    assert len(_emit(a, _jobs(1, 2))) == 2
+    assert len(_emit(b, _jobs(3))) == 1     # a 가 먼저 저장 → 경합 → 다시 읽어 합친 뒤 저장
+
+    assert len(_stored(blob_store)) == 3
+    assert _emit(b, _jobs(1, 2, 3)).empty   # 합친 뒤에는 a 가 보낸 공고도 중복으로 봄
+    _other_worker()
+    assert _emit(_load(), _jobs(1, 2, 3)).empty
+
+
+def test_save_retries_after_stale_etag(blob_store):
+    a = _load()
+    _emit(a, _jobs(1))
+    _other_worker()
+    b = _load()
+    _emit(b, _jobs(2))                  # b 가 저장해 a 의 ETag 가 오래됨
+
+    _emit(a, _jobs(3))
+    assert len(_stored(blob_store)) == 3
+
+
+def test_failed_load_never_overwrites_stored_index(blob_store, monkeypatch):
+    _emit(_load(), _jobs(1, 2, 3))
+    before = blob_store.get(CONTAINER, BLOB)
+    _other_worker()
+
+    def unavailable(container, name):
+        raise ServiceRequestError("timeout")
+    monkeypatch.setattr(blob_store, "get", unavailable)
+    with pytest.raises(ServiceRequestError):
+        _load()
+    assert dedupe_index._INDEXES == {}      # 실패한 로드는 캐시하지 않음 (다음 실행에서 다시 읽음)
+
+    monkeypatch.undo()
+    assert blob_store.get(CONTAINER, BLOB) == before
+    assert _emit(_load(), _jobs(1, 2, 3)).empty
+
+
+def test_missing_blob_starts_empty(blob_store):
+    index = _load()
+    assert len(index) == 0 and index.etag is None
+    assert len(_emit(index, _jobs(1))) == 1
+
+
+@pytest.mark.parametrize("a,b,same", [
+    ("1.0", "1", True),
+    (2500000.0, "2500000", True),
+    ("1.5", "1", False),
+    ("버전 1.0", "버전 1", False),
+])
+def test_normalize_strips_only_whole_number_floats(a, b, same):
+    _, ca = fingerprints(pd.DataFrame({'v': [a]}))
+    _, cb = fingerprints(pd.DataFrame({'v': [b]}))
+    assert bool(ca[0] == cb[0]) is same
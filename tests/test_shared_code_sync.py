@@ -0,0 +1,29 @@
+"""두 Function App 의 shared_code 가 같은 내용인지 확인합니다.
+
+seoul-job-cnt / ggi-job-cnt 는 따로 배포되므로 shared_code 를 각각 가지고 있습니다.
+한쪽만 고치면 이 테스트가 실패합니다. (고친 쪽을 다른 쪽에 그대로 복사)
+"""
+import filecmp
+import os
+
+from conftest import ROOT
+
+SEOUL = os.path.join(ROOT, "seoul-job-cnt", "azure-func-connect", "shared_code")
+GG = os.path.join(ROOT, "ggi-job-cnt", "azure-func-connect", "shared_code")
+IGNORE = ["__pycache__"]
+
+
+def _differences(cmp: filecmp.dircmp, path: str = "") -> list:
+    """dircmp 를 하위 폴더까지 따라가며 한쪽에만 있거나 내용이 다른 파일 목록을 만듭니다."""
+    # dircmp 는 크기 / 수정 시각만 보므로 같아 보이는 파일도 내용까지 비교
+    _, mismatch, errors = filecmp.cmpfiles(cmp.left, cmp.right, cmp.common_files, shallow=False)
+    out = [f"seoul 에만 있음: {os.path.join(path, n)}" for n in cmp.left_only]
+    out += [f"gg 에만 있음: {os.path.join(path, n)}" for n in cmp.right_only]
+    out += [f"내용 다름: {os.path.join(path, n)}" for n in mismatch + errors + cmp.common_funny]
+    for name, sub in sorted(cmp.subdirs.items()):
+        out += _differences(sub, os.path.join(path, name))
+    return out
+
+
+def test_shared_code_trees_are_identical():
+    assert _differences(filecmp.dircmp(SEOUL, GG, ignore=IGNORE)) == []